@@ -0,0 +1,54 @@
+"""
+Benchmark of the bulk_update strategies of CreateUpdateTimestampManager.
+
+Runs against a throwaway test database, see benchmarks:
+
+    python -m benchmarks.bulk_update --rows 10000 --batch-size 1000
+"""
+
+import argparse
+import time
+
+from benchmarks import add_database_argument, test_database
+
+
+def run(rows: int, batch_size: int, repeat: int) -> None:
+    from django.db import connection
+
+    from tests.testapp.models import Publication
+
+    Publication.objects.bulk_create(
+        [Publication(name=f"name {i}") for i in range(rows)], batch_size=batch_size
+    )
+    objs = list(Publication.objects.all())
+    print(f"{connection.vendor}: {rows} rows, batch size {batch_size}")
+    for strategy in ("case", "values"):
+        timings = []
+        for run_number in range(repeat):
+            for obj in objs:
+                obj.name = f"{strategy} {run_number} {obj.pk}"
+            start = time.perf_counter()
+            Publication.objects.bulk_update(
+                objs, ["name"], batch_size=batch_size, strategy=strategy
+            )
+            timings.append(time.perf_counter() - start)
+        best = min(timings)
+        print(
+            f"  {strategy:>6}: {best:.3f}s best of {repeat}, {rows / best:,.0f} rows/s"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    add_database_argument(parser)
+    args = parser.parse_args()
+
+    with test_database(args.database_url):
+        run(args.rows, args.batch_size, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
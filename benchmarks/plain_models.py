@@ -0,0 +1,70 @@
+"""
+Plain Django counterparts of the tests.testapp models, with auto_now and
+auto_now_add DateTimeFields and the same indexes, used as a baseline. Their
+tables are created by create_tables(), outside of migrations.
+"""
+
+from django.db import connection, models
+
+
+class PlainPublication(models.Model):
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_updated_at = models.DateTimeField(auto_now=True)
+    name = models.CharField(max_length=255)
+
+    class Meta:
+        app_label = "benchmarks"
+
+
+class PlainMediumType(models.Model):
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_updated_at = models.DateTimeField(auto_now=True)
+    name = models.CharField(max_length=255)
+
+    class Meta:
+        app_label = "benchmarks"
+
+
+class PlainBook(models.Model):
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_updated_at = models.DateTimeField(auto_now=True)
+    title = models.CharField(max_length=255)
+    publication = models.ForeignKey(PlainPublication, on_delete=models.CASCADE)
+    mediums = models.ManyToManyField(PlainMediumType, through="PlainPrice")
+
+    class Meta:
+        app_label = "benchmarks"
+        indexes = [
+            models.Index(fields=["created_at"]),
+            models.Index(fields=["last_updated_at", "id"]),
+        ]
+
+
+class PlainPrice(models.Model):
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_updated_at = models.DateTimeField(auto_now=True)
+    medium = models.ForeignKey(PlainMediumType, on_delete=models.CASCADE)
+    book = models.ForeignKey(PlainBook, on_delete=models.CASCADE)
+    price = models.DecimalField(max_digits=6, decimal_places=2)
+
+    class Meta:
+        app_label = "benchmarks"
+
+
+class PlainAuthor(models.Model):
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_updated_at = models.DateTimeField(auto_now=True)
+    name = models.CharField(max_length=255, blank=True)
+    books = models.ManyToManyField(PlainBook)
+
+    class Meta:
+        app_label = "benchmarks"
+
+
+PLAIN_MODELS = [PlainPublication, PlainMediumType, PlainBook, PlainPrice, PlainAuthor]
+
+
+def create_tables() -> None:
+    with connection.schema_editor() as schema_editor:
+        for model in PLAIN_MODELS:
+            schema_editor.create_model(model)
@@ -0,0 +1,266 @@
+"""
+Benchmark of the write paths and timestamp ordered reads of
+CreatedUpdatedTimestampModel, compared with plain Django models.
+
+Measures save(), bulk_create(), M2M add(), bulk_update(), update() and reads
+ordered by last_updated_at over Book, Price and Author, reporting rows/s,
+queries and peak Python memory (tracemalloc) for each row count:
+
+    python -m benchmarks.write_paths --rows 1000 10000 100000 1000000
+
+--max-slowdown makes the run fail when an operation of the timestamped
+models is that many times slower than with the plain models.
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from benchmarks import add_database_argument, test_database
+
+
+class Result(NamedTuple):
+    suite: str
+    operation: str
+    rows: int
+    seconds: float
+    queries: int
+    peak_memory: int
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else float("inf")
+
+
+class QueryCounter:
+    """Database execute wrapper counting queries without recording them."""
+
+    def __init__(self) -> None:
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def measure(suite: str, operation: str, rows: int, func: Callable[[], Any]) -> Result:
+    from django.db import connection
+
+    counter = QueryCounter()
+    tracemalloc.start()
+    try:
+        with connection.execute_wrapper(counter):
+            start = time.perf_counter()
+            func()
+            seconds = time.perf_counter() - start
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return Result(suite, operation, rows, seconds, counter.count, peak_memory)
+
+
+def run_suite(
+    suite: str, models: Dict[str, Any], rows: int, save_rows: int, batch_size: int
+) -> List[Result]:
+    """
+    Run every operation on models, a dict of the Publication, MediumType,
+    Book, Price and Author classes of one suite, starting from empty tables.
+    """
+    Publication, MediumType = models["Publication"], models["MediumType"]
+    Book, Price, Author = models["Book"], models["Price"], models["Author"]
+    publication = Publication.objects.create(name="publication")
+    medium = MediumType.objects.create(name="paperback")
+    results = []
+
+    def save():
+        for i in range(save_rows):
+            Book(title=f"saved {i}", publication=publication).save()
+
+    results.append(measure(suite, "save", save_rows, save))
+
+    books = [Book(title=f"book {i}", publication=publication) for i in range(rows)]
+    results.append(
+        measure(
+            suite,
+            "bulk_create",
+            rows,
+            lambda: Book.objects.bulk_create(books, batch_size=batch_size),
+        )
+    )
+    books = list(Book.objects.order_by("pk")[save_rows:])
+
+    prices = [Price(medium=medium, book=book, price=Decimal("9.99")) for book in books]
+    results.append(
+        measure(
+            suite,
+            "bulk_create Price",
+            rows,
+            lambda: Price.objects.bulk_create(prices, batch_size=batch_size),
+        )
+    )
+
+    authors = Author.objects.bulk_create(
+        [Author(name=f"author {i}") for i in range(max(rows // 100, 1))]
+    )
+
+    def add_books():
+        for i, author in enumerate(authors):
+            author.books.add(*books[i * 100 : (i + 1) * 100])
+
+    results.append(measure(suite, "Author.books.add", rows, add_books))
+
+    for book in books:
+        book.title = f"updated {book.pk}"
+    results.append(
+        measure(
+            suite,
+            "bulk_update",
+            rows,
+            lambda: Book.objects.bulk_update(books, ["title"], batch_size=batch_size),
+        )
+    )
+    results.append(
+        measure(
+            suite,
+            "update",
+            rows + save_rows,
+            lambda: Book.objects.update(title="updated"),
+        )
+    )
+    results.append(
+        measure(
+            suite,
+            "read by last_updated_at",
+            rows + save_rows,
+            lambda: sum(
+                1
+                for _ in Book.objects.order_by("-last_updated_at", "-pk").iterator(
+                    chunk_size=2000
+                )
+            ),
+        )
+    )
+    return results
+
+
+def clear_tables(models: Dict[str, Any]) -> None:
+    for name in ("Author", "Price", "Book", "MediumType", "Publication"):
+        model = models[name]
+        for field in model._meta.local_many_to_many:
+            field.remote_field.through._base_manager.all()._raw_delete("default")
+        model._base_manager.all()._raw_delete("default")
+
+
+def format_memory(size: int) -> str:
+    return f"{size / 1024 / 1024:,.1f} MiB"
+
+
+def report(results: List[Result]) -> float:
+    """
+    Print the timestamped results next to the plain ones, and return the
+    largest slowdown of the timestamped models.
+    """
+    plain = {(r.operation, r.rows): r for r in results if r.suite == "plain"}
+    max_slowdown = 0.0
+    print(
+        f"  {'operation':<24} {'rows':>9} {'rows/s':>12} {'plain rows/s':>12} "
+        f"{'ratio':>6} {'queries':>8} {'plain':>6} {'peak memory':>12}"
+    )
+    for result in results:
+        if result.suite != "timestamped":
+            continue
+        baseline = plain[(result.operation, result.rows)]
+        slowdown = baseline.rows_per_second / result.rows_per_second
+        max_slowdown = max(max_slowdown, slowdown)
+        print(
+            f"  {result.operation:<24} {result.rows:>9,} "
+            f"{result.rows_per_second:>12,.0f} {baseline.rows_per_second:>12,.0f} "
+            f"{slowdown:>6.2f} {result.queries:>8,} {baseline.queries:>6,} "
+            f"{format_memory(result.peak_memory):>12}"
+        )
+    return max_slowdown
+
+
+def run(
+    row_counts: List[int],
+    save_rows: int,
+    batch_size: int,
+    max_slowdown: Optional[float],
+    json_path: Optional[str],
+) -> int:
+    from django.db import connection
+
+    from benchmarks import plain_models
+    from tests.testapp import models as testapp_models
+
+    plain_models.create_tables()
+    suites = {
+        "timestamped": {
+            name: getattr(testapp_models, name)
+            for name in ("Publication", "MediumType", "Book", "Price", "Author")
+        },
+        "plain": {
+            name: getattr(plain_models, "Plain" + name)
+            for name in ("Publication", "MediumType", "Book", "Price", "Author")
+        },
+    }
+    all_results = []
+    exit_code = 0
+    for rows in row_counts:
+        print(f"{connection.vendor}: {rows:,} rows, batch size {batch_size}")
+        results = []
+        for suite, models in suites.items():
+            results.extend(
+                run_suite(suite, models, rows, min(save_rows, rows), batch_size)
+            )
+            clear_tables(models)
+        slowdown = report(results)
+        if max_slowdown is not None and slowdown > max_slowdown:
+            print(f"  slowdown {slowdown:.2f} exceeds {max_slowdown:.2f}")
+            exit_code = 1
+        all_results.extend(results)
+    if json_path:
+        with open(json_path, "w") as file:
+            json.dump(
+                [
+                    dict(result._asdict(), vendor=connection.vendor)
+                    for result in all_results
+                ],
+                file,
+                indent=2,
+            )
+    return exit_code
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument(
+        "--save-rows",
+        type=int,
+        default=10000,
+        help="Upper bound of objects created one by one with save().",
+    )
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument(
+        "--max-slowdown",
+        type=float,
+        help="Fail if the timestamped models are this many times slower.",
+    )
+    parser.add_argument("--json", help="Write the results to this file.")
+    add_database_argument(parser)
+    args = parser.parse_args()
+
+    with test_database(args.database_url):
+        exit_code = run(
+            args.rows, args.save_rows, args.batch_size, args.max_slowdown, args.json
+        )
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
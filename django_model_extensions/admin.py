@@ -1,3 +1,149 @@
-from django.contrib import admin  # noqa
+from typing import Any, Optional, Sequence
 
-# Register your models here.
+from django.contrib import admin
+from django.contrib.admin.views.main import ORDER_VAR, ChangeList
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.http import HttpRequest
+from django.utils.functional import cached_property
+
+from .paginator import KeysetPaginator
+
+CURSOR_VAR = "cursor"
+
+
+def get_estimated_count(queryset: QuerySet, threshold: int) -> int:
+    """
+    Number of rows of queryset. For an unfiltered queryset on PostgreSQL, the
+    planner's estimate (pg_class.reltuples) is returned instead of running
+    COUNT(*) when it is at least threshold.
+    """
+    connection = connections[queryset.db]
+    if not queryset.query.where and connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+                [connection.ops.quote_name(queryset.model._meta.db_table)],
+            )
+            row = cursor.fetchone()
+        # reltuples is -1 for tables which were never analyzed.
+        if row is not None and row[0] >= threshold:
+            return int(row[0])
+    return queryset.count()
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator using get_estimated_count for large, unfiltered tables.
+    """
+
+    def __init__(self, *args: Any, threshold: int, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.threshold = threshold
+
+    @cached_property
+    def count(self) -> int:
+        return get_estimated_count(self.object_list, self.threshold)
+
+
+class TimestampedChangeList(ChangeList):
+    """
+    ChangeList paginating with a KeysetPaginator on last_updated_at unless the
+    user sorts by another column.
+    """
+
+    keyset_page = None
+
+    def get_filters_params(self, params: Optional[dict] = None) -> dict:
+        lookup_params = super().get_filters_params(params)
+        lookup_params.pop(CURSOR_VAR, None)
+        return lookup_params
+
+    def get_results(self, request: HttpRequest) -> None:
+        cursor = self.params.pop(CURSOR_VAR, None)
+        if not self.model_admin.keyset_pagination or ORDER_VAR in self.params:
+            return super().get_results(request)
+
+        result_count = self.model_admin.get_paginator(
+            request, self.queryset, self.list_per_page
+        ).count
+        paginator = KeysetPaginator(self.queryset, self.list_per_page)
+        page = paginator.get_page(cursor)
+
+        self.result_count = result_count
+        self.show_full_result_count = self.model_admin.show_full_result_count
+        self.full_result_count = (
+            self.root_queryset.count() if self.show_full_result_count else None
+        )
+        self.show_admin_actions = not self.show_full_result_count or bool(
+            self.full_result_count
+        )
+        self.result_list = page.object_list
+        self.can_show_all = False
+        self.multi_page = page.has_other_pages()
+        self.paginator = paginator
+        self.keyset_page = page
+
+    @property
+    def next_page_url(self) -> Optional[str]:
+        if self.keyset_page is None or not self.keyset_page.has_next():
+            return None
+        return self.get_query_string({CURSOR_VAR: self.keyset_page.next_page_number()})
+
+    @property
+    def previous_page_url(self) -> Optional[str]:
+        if self.keyset_page is None or not self.keyset_page.has_previous():
+            return None
+        return self.get_query_string(
+            {CURSOR_VAR: self.keyset_page.previous_page_number()}
+        )
+
+
+class TimestampedModelAdmin(admin.ModelAdmin):
+    """
+    ModelAdmin for CreatedUpdatedTimestampModel subclasses on large tables.
+
+    - Lists newest changes first, paginating with a keyset on last_updated_at
+      instead of OFFSET (set keyset_pagination = False to disable).
+    - Uses the PostgreSQL row estimate instead of COUNT(*) for unfiltered
+      tables with at least estimated_count_threshold rows.
+    - Filters on created_at/last_updated_at with range lookups, which can use
+      the timestamp indexes.
+    - Shows the timestamps as readonly fields.
+    """
+
+    change_list_template = "admin/django_model_extensions/timestamped_change_list.html"
+    ordering = ("-last_updated_at", "-pk")
+    list_filter = ("last_updated_at", "created_at")
+    show_full_result_count = False
+    keyset_pagination = True
+    estimated_count_threshold = 100_000
+    timestamp_fields = ("created_at", "last_updated_at")
+
+    def get_changelist(self, request: HttpRequest, **kwargs: Any) -> type:
+        return TimestampedChangeList
+
+    def get_paginator(
+        self,
+        request: HttpRequest,
+        queryset: QuerySet,
+        per_page: int,
+        orphans: int = 0,
+        allow_empty_first_page: bool = True,
+    ) -> Paginator:
+        return EstimatedCountPaginator(
+            queryset,
+            per_page,
+            orphans,
+            allow_empty_first_page,
+            threshold=self.estimated_count_threshold,
+        )
+
+    def get_readonly_fields(
+        self, request: HttpRequest, obj: Optional[Any] = None
+    ) -> Sequence[str]:
+        readonly_fields = tuple(super().get_readonly_fields(request, obj))
+        return readonly_fields + tuple(
+            field for field in self.timestamp_fields if field not in readonly_fields
+        )
@@ -0,0 +1,91 @@
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from django.core.cache import caches
+from django.db import transaction
+
+KEY_PREFIX = "django_model_extensions"
+
+
+def _get_cache(model: type) -> Any:
+    return caches[model.cache_alias]
+
+
+def _model_key(model: type) -> str:
+    return "%s:%s" % (KEY_PREFIX, model._meta.label_lower)
+
+
+def get_generation(model: type) -> int:
+    """
+    Current generation of model. Bumping it invalidates every cached instance
+    of model at once.
+    """
+    cache = _get_cache(model)
+    key = "%s:generation" % _model_key(model)
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, 1, timeout=None)
+        generation = cache.get(key, 1)
+    return generation
+
+
+def bump_generation(model: type) -> None:
+    cache = _get_cache(model)
+    key = "%s:generation" % _model_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # The key is missing, e.g. it was evicted.
+        cache.add(key, 1, timeout=None)
+        cache.incr(key)
+
+
+def make_key(model: type, pk: Any, generation: int) -> str:
+    return "%s:%s:%s" % (_model_key(model), generation, pk)
+
+
+def get_instances(model: type, pks: Iterable[Any]) -> Tuple[int, Dict[Any, Any]]:
+    """
+    Current generation of model, and the cached instances of model for pks,
+    keyed by pk. Missing instances are left out. Pass the generation to
+    set_instances() when caching the missing instances read afterwards.
+    """
+    generation = get_generation(model)
+    keys = {make_key(model, pk, generation): pk for pk in pks}
+    cached = _get_cache(model).get_many(keys)
+    return generation, {keys[key]: obj for key, obj in cached.items()}
+
+
+def set_instances(model: type, objs: Iterable[Any], generation: int) -> None:
+    """
+    Cache objs under generation, read before the objects were loaded. If a
+    bulk write bumped the generation since, they are cached under the old
+    generation and never read.
+    """
+    _get_cache(model).set_many(
+        {make_key(model, obj.pk, generation): obj for obj in objs},
+        timeout=model.cache_timeout,
+    )
+
+
+def _on_commit(func: Any, using: Optional[str]) -> None:
+    """
+    Run func now and again once the current transaction commits, so that
+    instances cached from not yet committed data are discarded as well.
+    """
+    func()
+    transaction.on_commit(func, using=using)
+
+
+def invalidate_model(model: type, using: Optional[str] = None) -> None:
+    """Invalidate every cached instance of model."""
+    _on_commit(lambda: bump_generation(model), using)
+
+
+def invalidate_instance(obj: Any, using: Optional[str] = None) -> None:
+    """Invalidate the cached copy of obj."""
+    model = obj.__class__
+    pk = obj.pk
+    _on_commit(
+        lambda: _get_cache(model).delete(make_key(model, pk, get_generation(model))),
+        using,
+    )
@@ -0,0 +1,51 @@
+import time
+from functools import wraps
+from typing import Any, Callable, Iterable, Optional, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class ConcurrentUpdateError(Exception):
+    """
+    Raised when saving an object of a model with optimistic_locking whose row
+    was changed or deleted since it was loaded.
+    """
+
+    def __init__(self, message: str, pks: Iterable[Any] = ()) -> None:
+        super().__init__(message)
+        self.pks = list(pks)
+
+
+def retry_on_conflict(
+    func: Optional[F] = None, *, attempts: int = 3, delay: float = 0
+) -> Any:
+    """
+    Decorator calling func again when it raises ConcurrentUpdateError, up to
+    attempts times in total, waiting delay seconds (doubled every time) between
+    calls. func must load the objects it saves, so that a new call works on
+    their current version:
+
+        @retry_on_conflict(attempts=5)
+        def add_view(pk):
+            book = Book.objects.get(pk=pk)
+            book.views += 1
+            book.save()
+    """
+
+    def decorator(func: F) -> F:
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            for attempt in range(attempts):
+                try:
+                    return func(*args, **kwargs)
+                except ConcurrentUpdateError:
+                    if attempt == attempts - 1:
+                        raise
+                    if delay:
+                        time.sleep(delay * 2**attempt)
+
+        return wrapper
+
+    if func is not None:
+        return decorator(func)
+    return decorator
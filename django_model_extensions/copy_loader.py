@@ -0,0 +1,112 @@
+import io
+import json
+from datetime import date, datetime, time
+from typing import Any, Iterable, Iterator, Mapping, Sequence, Union
+
+from django.db import models
+
+Row = Union[models.Model, Mapping[str, Any]]
+
+
+class IteratorFile(io.TextIOBase):
+    """
+    Read-only file object over an iterator of strings, used to stream data to
+    copy_expert() without building the whole payload in memory.
+    """
+
+    def __init__(self, lines: Iterator[str]) -> None:
+        self._lines = lines
+        self._buffer = ""
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> str:
+        while size is None or size < 0 or len(self._buffer) < size:
+            try:
+                self._buffer += next(self._lines)
+            except StopIteration:
+                break
+        if size is None or size < 0:
+            data, self._buffer = self._buffer, ""
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+def get_row_value(row: Row, field: models.Field) -> Any:
+    """
+    Value of field in a model instance or a mapping keyed by field name or
+    attname. Missing values fall back to the field's default.
+    """
+    if isinstance(row, models.Model):
+        return getattr(row, field.attname)
+    if field.name in row:
+        value = row[field.name]
+    elif field.attname in row:
+        value = row[field.attname]
+    else:
+        return field.get_default()
+    if field.is_relation and isinstance(value, models.Model):
+        return value.pk
+    return value
+
+
+def format_csv_value(field: models.Field, value: Any, connection: Any) -> str:
+    """
+    Format value for COPY ... (FORMAT csv). NULL is written unquoted and
+    every other value quoted, so empty strings are kept.
+    """
+    if isinstance(field, models.JSONField) and value is not None:
+        value = json.dumps(value, cls=field.encoder)
+    else:
+        value = field.get_db_prep_save(value, connection)
+    if value is None:
+        return ""
+    if isinstance(value, (datetime, date, time)):
+        value = value.isoformat()
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        value = "\\x" + bytes(value).hex()
+    return '"%s"' % str(value).replace('"', '""')
+
+
+def iter_csv_lines(
+    rows: Iterable[Row],
+    fields: Sequence[models.Field],
+    timestamp: datetime,
+    connection: Any,
+) -> Iterator[str]:
+    """
+    CSV lines for rows, with timestamp as created_at and last_updated_at.
+    """
+    timestamp_fields = {"created_at", "last_updated_at"}
+    for row in rows:
+        yield ",".join(
+            format_csv_value(
+                field,
+                (
+                    timestamp
+                    if field.name in timestamp_fields
+                    else get_row_value(row, field)
+                ),
+                connection,
+            )
+            for field in fields
+        ) + "\n"
+
+
+def copy_from(
+    cursor: Any, table: str, columns: Sequence[str], lines: Iterator[str]
+) -> None:
+    """
+    Run "COPY table (columns) FROM STDIN" with lines of CSV data, with either
+    psycopg2 or psycopg 3.
+    """
+    sql = "COPY %s (%s) FROM STDIN WITH (FORMAT csv)" % (table, ", ".join(columns))
+    raw_cursor = cursor.cursor
+    if hasattr(raw_cursor, "copy_expert"):
+        raw_cursor.copy_expert(sql, IteratorFile(lines))
+    else:
+        with raw_cursor.copy(sql) as copy:
+            for line in lines:
+                copy.write(line)
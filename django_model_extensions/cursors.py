@@ -0,0 +1,53 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+from django.db.models import Q, QuerySet
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor token cannot be decoded."""
+
+
+def encode_cursor(timestamp: datetime, pk: Any) -> str:
+    """
+    Encode a (timestamp, pk) keyset position as an opaque, URL safe token.
+    """
+    if not isinstance(pk, (int, str)):
+        pk = str(pk)
+    payload = json.dumps([timestamp.isoformat(), pk], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Tuple[datetime, Optional[Any]]:
+    """
+    Decode a token created by encode_cursor back to a (timestamp, pk) tuple.
+    """
+    try:
+        payload = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        timestamp, pk = json.loads(payload)
+        return datetime.fromisoformat(timestamp), pk
+    except (TypeError, ValueError) as e:
+        raise InvalidCursor("Invalid cursor %r." % token) from e
+
+
+def seek(
+    queryset: QuerySet,
+    field: str,
+    timestamp: datetime,
+    pk: Optional[Any] = None,
+    descending: bool = False,
+) -> QuerySet:
+    """
+    Filter queryset to the rows after the (timestamp, pk) position when
+    ordered by (field, pk), ascending or descending. Without pk, rows sharing
+    the timestamp are excluded. The redundant range condition on field keeps
+    the lookup an index range scan.
+    """
+    after, after_or_equal = ("lt", "lte") if descending else ("gt", "gte")
+    if pk is None:
+        return queryset.filter(**{f"{field}__{after}": timestamp})
+    return queryset.filter(**{f"{field}__{after_or_equal}": timestamp}).filter(
+        Q(**{f"{field}__{after}": timestamp}) | Q(**{f"pk__{after}": pk})
+    )
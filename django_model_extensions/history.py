@@ -0,0 +1,101 @@
+from contextlib import contextmanager
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from django.apps import apps
+from django.db import models, transaction
+
+# Rows read, and FieldChange objects created, per query.
+BATCH_SIZE = 1000
+
+# Prefix of the annotations holding historical values in as_of() querysets.
+AS_OF_PREFIX = "_as_of_"
+
+
+def get_history_fields(model: type) -> List[models.Field]:
+    """
+    Fields of model whose previous values are recorded with keep_history.
+    """
+    return [
+        f
+        for f in model._meta.concrete_fields
+        if not f.primary_key and f.name != "created_at"
+    ]
+
+
+def read_history_values(
+    model: type, using: str, pks: Iterable[Any], attnames: Sequence[str]
+) -> Dict[Any, Tuple[Any, ...]]:
+    """
+    Map the pk of each row in pks to its values of attnames.
+    """
+    values = {}
+    pks = iter(pks)
+    while batch := list(islice(pks, BATCH_SIZE)):
+        rows = (
+            model._base_manager.using(using)
+            .filter(pk__in=batch)
+            .values_list("pk", *attnames)
+        )
+        values.update((row[0], row[1:]) for row in rows)
+    return values
+
+
+def save_field_changes(
+    model: type,
+    using: str,
+    before: Dict[Any, Tuple[Any, ...]],
+    after: Dict[Any, Tuple[Any, ...]],
+    attnames: Sequence[str],
+) -> None:
+    """
+    Save the previous value of every field which differs between before and
+    after, read around a write. last_updated_at must be the last of attnames.
+    """
+    FieldChange = apps.get_model("django_model_extensions", "FieldChange")
+    label = model._meta.label_lower
+    changes = []
+    for pk, old_values in before.items():
+        new_values = after.get(pk)
+        if new_values is None or old_values[:-1] == new_values[:-1]:
+            continue
+        changes.extend(
+            FieldChange(
+                model=label,
+                object_id=str(pk),
+                field=attname,
+                changed_at=new_values[-1],
+                old_value=[old_value],
+            )
+            for attname, old_value, new_value in zip(attnames, old_values, new_values)
+            if old_value != new_value
+        )
+    FieldChange.objects.using(using).bulk_create(changes, batch_size=BATCH_SIZE)
+
+
+@contextmanager
+def record_history(
+    model: type, using: str, pks: Callable[[], Iterable[Any]], fields: Iterable[str]
+) -> Iterator[None]:
+    """
+    Record the previous values of fields of the rows with primary keys pks()
+    changed by the wrapped write, in the same transaction. Does nothing unless
+    model has keep_history.
+    """
+    if not getattr(model, "keep_history", False):
+        yield
+        return
+    opts = model._meta
+    history_fields = get_history_fields(model)
+    names = {opts.get_field(name).name for name in fields}
+    attnames = [
+        f.attname
+        for f in history_fields
+        if f.name in names and f.name != "last_updated_at"
+    ]
+    attnames.append(opts.get_field("last_updated_at").attname)
+    with transaction.atomic(using=using, savepoint=False):
+        before = read_history_values(model, using, pks(), attnames)
+        yield
+        after = read_history_values(model, using, before, attnames)
+        save_field_changes(model, using, before, after, attnames)
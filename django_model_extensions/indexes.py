@@ -0,0 +1,76 @@
+from typing import Optional
+
+from django.contrib.postgres.indexes import BrinIndex
+from django.db import models
+
+
+class TimestampBrinIndex(BrinIndex):
+    """
+    BRIN index for append-mostly tables on PostgreSQL.
+    Created as a regular B-tree index on other backends.
+    """
+
+    def create_sql(self, model, schema_editor, using="", **kwargs):
+        if schema_editor.connection.vendor != "postgresql":
+            return models.Index.create_sql(
+                self, model, schema_editor, using=using, **kwargs
+            )
+        return super().create_sql(model, schema_editor, using=using, **kwargs)
+
+
+class TimestampIndex:
+    """
+    Declares an index on a timestamp field of a CreatedUpdatedTimestampModel
+    subclass, listed in its timestamp_indexes attribute:
+
+        class Book(CreatedUpdatedTimestampModel):
+            timestamp_indexes = [
+                TimestampIndex("last_updated_at", with_pk=True),
+                TimestampIndex("created_at", brin=True),
+            ]
+
+    with_pk appends the primary key to the index, matching keyset scans on
+    (timestamp, pk). brin creates a BRIN index on PostgreSQL. condition
+    creates a partial index and, as for Django's Index, requires a name.
+    """
+
+    def __init__(
+        self,
+        field: str = "last_updated_at",
+        *,
+        with_pk: bool = False,
+        brin: bool = False,
+        condition: Optional[models.Q] = None,
+        name: Optional[str] = None,
+    ) -> None:
+        if brin and with_pk:
+            raise ValueError("TimestampIndex cannot combine brin and with_pk.")
+        self.field = field
+        self.with_pk = with_pk
+        self.brin = brin
+        self.condition = condition
+        self.name = name
+
+    def __repr__(self) -> str:
+        return "<%s: field=%r with_pk=%r brin=%r>" % (
+            self.__class__.__name__,
+            self.field,
+            self.with_pk,
+            self.brin,
+        )
+
+    def get_index(self, model: type) -> models.Index:
+        """
+        Django Index for model, named like Django names unnamed Meta.indexes.
+        """
+        fields = [self.field]
+        if self.with_pk:
+            fields.append(model._meta.pk.name)
+        kwargs = {"fields": fields, "condition": self.condition}
+        if self.name is not None:
+            kwargs["name"] = self.name
+        index_class = TimestampBrinIndex if self.brin else models.Index
+        index = index_class(**kwargs)
+        if not index.name:
+            index.set_name_with_model(model)
+        return index
@@ -0,0 +1,240 @@
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable, Dict, Iterable, Iterator, NamedTuple, Optional, Tuple
+
+from django.db import models
+from django.http import HttpRequest, HttpResponse
+
+logger = logging.getLogger("django_model_extensions.instrumentation")
+
+# Number of save() calls of one model within instrument() above which a
+# warning suggests a bulk method instead.
+DEFAULT_SAVE_THRESHOLD = 20
+
+
+class WriteEvent(NamedTuple):
+    """A write recorded by instrument()."""
+
+    model: type
+    # "save", "update", "bulk_create" or "bulk_update".
+    operation: str
+    # Objects passed to the write, 1 for save() and the rows for update().
+    objects: int
+    rows: int
+    duration: float
+    using: Optional[str]
+
+
+class OperationStats:
+    """Totals of the writes of one operation on one model."""
+
+    __slots__ = ("calls", "objects", "rows", "duration")
+
+    def __init__(self) -> None:
+        self.calls = self.objects = self.rows = 0
+        self.duration = 0.0
+
+    def __repr__(self) -> str:
+        return "<OperationStats calls=%s objects=%s rows=%s duration=%.6f>" % (
+            self.calls,
+            self.objects,
+            self.rows,
+            self.duration,
+        )
+
+
+class WriteStats:
+    """
+    Writes recorded by instrument(), passed to every sink and added up per
+    model label and operation in totals.
+    """
+
+    def __init__(
+        self,
+        sinks: Iterable[Callable[[WriteEvent], Any]] = (),
+        parent: Optional["WriteStats"] = None,
+    ) -> None:
+        self.sinks = list(sinks)
+        self.parent = parent
+        self.totals: Dict[Tuple[str, str], OperationStats] = {}
+
+    def record(self, event: WriteEvent) -> None:
+        key = (event.model._meta.label, event.operation)
+        stats = self.totals.get(key)
+        if stats is None:
+            stats = self.totals[key] = OperationStats()
+        stats.calls += 1
+        stats.objects += event.objects
+        stats.rows += event.rows
+        stats.duration += event.duration
+        for sink in self.sinks:
+            sink(event)
+        if self.parent is not None:
+            self.parent.record(event)
+
+    def report(
+        self, label: str = "", save_threshold: int = DEFAULT_SAVE_THRESHOLD
+    ) -> None:
+        """
+        Log the totals at DEBUG level, and a warning for every model saved
+        more than save_threshold times one object at a time.
+        """
+        prefix = "%s: " % label if label else ""
+        for (model_label, operation), stats in sorted(self.totals.items()):
+            logger.debug(
+                "%s%s.%s: %s call(s), %s object(s), %s row(s) in %.3fs",
+                prefix,
+                model_label,
+                operation,
+                stats.calls,
+                stats.objects,
+                stats.rows,
+                stats.duration,
+            )
+            if operation == "save" and stats.calls > save_threshold:
+                logger.warning(
+                    "%s%s objects of %s saved one at a time, consider bulk_create() "
+                    "or bulk_update().",
+                    prefix,
+                    stats.calls,
+                    model_label,
+                )
+
+
+_stats: ContextVar[Optional[WriteStats]] = ContextVar("write_stats", default=None)
+# Model of the write being recorded, so that writes it makes itself, e.g. the
+# update() calls of Django's bulk_update(), are not recorded twice.
+_recording: ContextVar[Optional[type]] = ContextVar("recording", default=None)
+
+
+class _CountingIterator:
+    def __init__(self, iterable: Iterable[Any]) -> None:
+        self._iterator = iter(iterable)
+        self.count = 0
+
+    def __iter__(self) -> "_CountingIterator":
+        return self
+
+    def __next__(self) -> Any:
+        item = next(self._iterator)
+        self.count += 1
+        return item
+
+
+def instrumented(
+    operation: str, get_rows: Callable[[Any], int], counts_objects: bool = False
+) -> Callable[[Callable], Callable]:
+    """
+    Decorator recording calls of a queryset or model write method while
+    instrument() is active. get_rows returns the number of rows written from
+    the result of the method. With counts_objects, the objects consumed from
+    its first argument are counted, otherwise one object per row.
+
+    When instrument() is not active, the only overhead is a context variable
+    lookup.
+    """
+
+    def decorator(method: Callable) -> Callable:
+        @wraps(method)
+        def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+            stats = _stats.get()
+            if stats is None:
+                return method(self, *args, **kwargs)
+            model = type(self) if isinstance(self, models.Model) else self.model
+            if _recording.get() is model:
+                return method(self, *args, **kwargs)
+            objs = None
+            if counts_objects:
+                if args:
+                    objs = _CountingIterator(args[0])
+                    args = (objs, *args[1:])
+                else:
+                    objs = kwargs["objs"] = _CountingIterator(kwargs["objs"])
+            token = _recording.set(model)
+            start = time.perf_counter()
+            try:
+                result = method(self, *args, **kwargs)
+            finally:
+                duration = time.perf_counter() - start
+                _recording.reset(token)
+            rows = get_rows(result)
+            stats.record(
+                WriteEvent(
+                    model,
+                    operation,
+                    objs.count if objs is not None else rows,
+                    rows,
+                    duration,
+                    self._state.db if isinstance(self, models.Model) else self.db,
+                )
+            )
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+@contextmanager
+def instrument(
+    sinks: Iterable[Callable[[WriteEvent], Any]] = (),
+    save_threshold: int = DEFAULT_SAVE_THRESHOLD,
+    label: str = "",
+) -> Iterator[WriteStats]:
+    """
+    Record the save(), update(), bulk_create() and bulk_update() calls of
+    CreatedUpdatedTimestampModel subclasses made in the block, in this thread
+    or async task, and pass each of them to sinks as a WriteEvent:
+
+        with instrument([statsd_sink]) as stats:
+            ...
+        stats.totals[("library.Book", "bulk_update")].rows
+
+    On exit, the totals are logged and a warning is logged for every model
+    with more than save_threshold save() calls, see WriteStats.report().
+    Writes are also recorded by an enclosing instrument() block.
+    """
+    stats = WriteStats(sinks, parent=_stats.get())
+    token = _stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _stats.reset(token)
+        stats.report(label, save_threshold)
+
+
+def log_write(event: WriteEvent) -> None:
+    """Sink logging every write at DEBUG level."""
+    logger.debug(
+        "%s.%s: %s object(s), %s row(s) in %.6fs on %s",
+        event.model._meta.label,
+        event.operation,
+        event.objects,
+        event.rows,
+        event.duration,
+        event.using,
+    )
+
+
+class WriteInstrumentationMiddleware:
+    """
+    Middleware running every request in instrument(), labelled with the
+    request method and path. Subclass it to set sinks or save_threshold.
+    """
+
+    sinks: Iterable[Callable[[WriteEvent], Any]] = ()
+    save_threshold = DEFAULT_SAVE_THRESHOLD
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        with instrument(
+            self.sinks,
+            self.save_threshold,
+            label="%s %s" % (request.method, request.path),
+        ):
+            return self.get_response(request)
@@ -0,0 +1,106 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections, router
+from django.utils import timezone
+
+from django_model_extensions.models import CreatedUpdatedTimestampModel
+from django_model_extensions.partitioning import (
+    create_partitions,
+    get_partition_interval,
+    get_partitions,
+    partition_start,
+    remove_partitions,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Create upcoming partitions of partitioned CreatedUpdatedTimestampModel "
+        "subclasses, and detach or drop the partitions older than --retain."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "models",
+            nargs="*",
+            metavar="app_label.ModelName",
+            help="Models to manage. Defaults to all models with a partition_interval.",
+        )
+        parser.add_argument(
+            "--ahead",
+            type=int,
+            default=2,
+            help="Number of partitions to create after the current one.",
+        )
+        parser.add_argument(
+            "--retain",
+            type=int,
+            help=(
+                "Number of partitions to keep before the current one. Older "
+                "partitions are dropped. Nothing is removed by default."
+            ),
+        )
+        parser.add_argument(
+            "--detach",
+            action="store_true",
+            help="Detach old partitions instead of dropping them.",
+        )
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only list the partitions that would be removed.",
+        )
+
+    def get_models(self, labels):
+        if not labels:
+            return [
+                model
+                for model in apps.get_models()
+                if issubclass(model, CreatedUpdatedTimestampModel)
+                and model.partition_interval
+            ]
+        models = []
+        for label in labels:
+            try:
+                model = apps.get_model(label)
+            except (LookupError, ValueError) as e:
+                raise CommandError(str(e))
+            if not getattr(model, "partition_interval", None):
+                raise CommandError("%s has no partition_interval." % label)
+            models.append(model)
+        return models
+
+    def handle(self, *args, **options):
+        using = options["database"]
+        if connections[using].vendor != "postgresql":
+            raise CommandError("Table partitioning is only supported on PostgreSQL.")
+        if options["retain"] is not None and options["retain"] < 0:
+            raise CommandError("--retain must not be negative.")
+        now = timezone.now()
+        for model in self.get_models(options["models"]):
+            if not router.allow_migrate_model(using, model):
+                continue
+            label = model._meta.label
+            if not options["dry_run"]:
+                for name in create_partitions(model, options["ahead"], now, using):
+                    self.stdout.write("%s: partition %s is ready." % (label, name))
+            if options["retain"] is None:
+                continue
+            before = partition_start(
+                now, get_partition_interval(model), -options["retain"]
+            )
+            self.remove_old_partitions(model, before, options, using)
+
+    def remove_old_partitions(self, model, before, options, using):
+        label = model._meta.label
+        if options["dry_run"]:
+            for partition in get_partitions(model, using):
+                if partition.end <= before:
+                    self.stdout.write(
+                        "%s: would remove partition %s." % (label, partition.name)
+                    )
+            return
+        verb = "detached" if options["detach"] else "dropped"
+        for partition in remove_partitions(model, before, options["detach"], using):
+            self.stdout.write("%s: %s partition %s." % (label, verb, partition.name))
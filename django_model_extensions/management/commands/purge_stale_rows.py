@@ -0,0 +1,98 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, router
+from django.utils import timezone
+
+from django_model_extensions.models import (
+    DEFAULT_BULK_BATCH_SIZE,
+    CreatedUpdatedTimestampModel,
+)
+from django_model_extensions.retention import (
+    get_retention_cutoff,
+    sort_by_dependencies,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete, or archive and delete, the rows of CreatedUpdatedTimestampModel "
+        "subclasses last updated before their retention_period."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "models",
+            nargs="*",
+            metavar="app_label.ModelName",
+            help="Models to purge. Defaults to all models with a retention_period.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BULK_BATCH_SIZE,
+            help="Number of rows deleted per transaction.",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0,
+            help="Seconds to wait between batches.",
+        )
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only count the stale rows of each model.",
+        )
+
+    def get_models(self, labels):
+        if not labels:
+            return [
+                model
+                for model in apps.get_models()
+                if issubclass(model, CreatedUpdatedTimestampModel)
+                and model.retention_period is not None
+            ]
+        models = []
+        for label in labels:
+            try:
+                model = apps.get_model(label)
+            except (LookupError, ValueError) as e:
+                raise CommandError(str(e))
+            if getattr(model, "retention_period", None) is None:
+                raise CommandError("%s has no retention_period." % label)
+            models.append(model)
+        return models
+
+    def handle(self, *args, **options):
+        using = options["database"]
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be a positive integer.")
+        now = timezone.now()
+        # Children first, so that their own retention policy and archive apply
+        # before rows are reached through a cascade.
+        for model in sort_by_dependencies(self.get_models(options["models"])):
+            if not router.allow_migrate_model(using, model):
+                continue
+            label = model._meta.label
+            cutoff = get_retention_cutoff(model, now)
+            queryset = model._default_manager.using(using)
+            if options["dry_run"]:
+                count = queryset.filter(last_updated_at__lt=cutoff).count()
+                self.stdout.write("%s: %s stale row(s)." % (label, count))
+                continue
+            total, counts = queryset.purge_stale(
+                cutoff, options["batch_size"], options["sleep"]
+            )
+            self.stdout.write(
+                "%s: deleted %s row(s)%s."
+                % (
+                    label,
+                    total,
+                    "".join(
+                        ", %s %s" % (count, related_label)
+                        for related_label, count in sorted(counts.items())
+                        if related_label != label and count
+                    ),
+                )
+            )
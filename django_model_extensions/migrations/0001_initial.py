@@ -0,0 +1,47 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:02
+
+from django.db import migrations, models
+
+import django_model_extensions.models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="FieldChange",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("model", models.CharField(max_length=100)),
+                ("object_id", models.CharField(max_length=255)),
+                ("field", models.CharField(max_length=255)),
+                ("changed_at", models.DateTimeField()),
+                (
+                    "old_value",
+                    models.JSONField(
+                        encoder=django_model_extensions.models.FieldChangeEncoder
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["model", "object_id", "field", "changed_at"],
+                        name="fieldchange_lookup_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -1,50 +1,2073 @@
-from typing import Iterable, Optional, Sequence
+import asyncio
+import copy
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from datetime import date, datetime
+from datetime import time as datetime_time
+from datetime import timedelta
+from decimal import Decimal
+from itertools import islice
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+from uuid import UUID
 
-from django.db import models
+from asgiref.sync import sync_to_async
+from django.core.cache import DEFAULT_CACHE_ALIAS
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import (
+    NotSupportedError,
+    OperationalError,
+    connections,
+    models,
+    router,
+    transaction,
+)
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.fields import AutoFieldMixin
+from django.db.models.functions import Cast, Now
+from django.db.models.signals import (
+    class_prepared,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.db.models.sql import UpdateQuery
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+from . import cache, history, outbox, propagation
+from .concurrency import ConcurrentUpdateError
+from .copy_loader import Row, copy_from, get_row_value, iter_csv_lines
+from .cursors import decode_cursor, encode_cursor, seek
+from .indexes import TimestampIndex
+from .instrumentation import instrumented
+from .partitioning import get_partition_interval, partition_bounds
+from .retention import (
+    archive_rows,
+    delete_rows,
+    get_archive_model,
+    get_retention_cutoff,
+    merge_counts,
+)
+from .signals import post_bulk_update, pre_bulk_update
 
-class CreateUpdateTimestampManager(models.Manager):
+TIMESTAMP_FIELDS = ("created_at", "last_updated_at")
+
+# Upper bound for chunks read from an iterable when the backend has no limit
+# on query parameters.
+DEFAULT_BULK_BATCH_SIZE = 1000
+
+# Number of chunks written at the same time by the async and parallel bulk
+# methods.
+DEFAULT_MAX_CONCURRENCY = 4
+
+# Objects per chunk, and per transaction, of the parallel bulk methods.
+DEFAULT_PARALLEL_CHUNK_SIZE = 10 * DEFAULT_BULK_BATCH_SIZE
+
+# Delay before the first retry of a failed chunk, doubled for every retry.
+RETRY_DELAY = 0.5
+
+BULK_UPDATE_STRATEGIES = ("case", "values")
+
+
+def _supports_update_from(connection: Any) -> bool:
     """
-    Custom Manager for CreatedUpdatedTimestampModel.
-    Used to update last_update_at on update.
+    Whether the backend supports "UPDATE ... FROM (VALUES ...)", used by the
+    "values" bulk_update strategy.
+    """
+    if connection.vendor == "postgresql":
+        return True
+    if connection.vendor == "sqlite":
+        return connection.Database.sqlite_version_info >= (3, 33, 0)
+    return False
+
+
+def _supports_upsert_returning(connection: Any) -> bool:
+    """
+    Whether the backend supports "INSERT ... ON CONFLICT DO UPDATE ... WHERE"
+    with RETURNING, used by bulk_upsert.
+    """
+    if connection.vendor == "postgresql":
+        return True
+    if connection.vendor == "sqlite":
+        return connection.Database.sqlite_version_info >= (3, 35, 0)
+    return False
+
+
+class UpsertResult(NamedTuple):
+    """Number of rows inserted, updated and left unchanged by bulk_upsert."""
+
+    inserted: int
+    updated: int
+    unchanged: int
+
+
+_timestamp_override: ContextVar[Optional[datetime]] = ContextVar(
+    "timestamp_override", default=None
+)
+
+
+@contextmanager
+def override_timestamp(timestamp: Optional[datetime]) -> Iterator[None]:
+    """
+    Use timestamp instead of the current time for created_at/last_updated_at
+    of the objects saved in the block. Does nothing when timestamp is None.
+    """
+    if timestamp is None:
+        yield
+        return
+    token = _timestamp_override.set(timestamp)
+    try:
+        yield
+    finally:
+        _timestamp_override.reset(token)
+
+
+class ChangeBatch(NamedTuple):
+    """
+    A batch of objects yielded by changed_since, along with the cursor to
+    resume from once the batch has been processed.
+    """
+
+    objects: List["CreatedUpdatedTimestampModel"]
+    cursor: str
+
+
+def _clear_timestamp_expressions(obj: "CreatedUpdatedTimestampModel") -> None:
+    """
+    Drop timestamp attributes still holding a database expression (e.g. Now())
+    so they are loaded from the database on next access instead of leaking the
+    expression to callers.
+    """
+    for attname in TIMESTAMP_FIELDS:
+        if hasattr(obj.__dict__.get(attname), "resolve_expression"):
+            del obj.__dict__[attname]
+
+
+# Values which cannot be changed in place, and need no copy in snapshots.
+IMMUTABLE_TYPES = (
+    type(None),
+    bool,
+    int,
+    float,
+    str,
+    bytes,
+    Decimal,
+    datetime,
+    date,
+    datetime_time,
+    timedelta,
+    UUID,
+)
+
+
+def _copy_loaded_value(value: Any) -> Any:
+    """
+    Copy of value for the snapshot of track_changes, so that changing a
+    mutable value in place, e.g. the dict of a JSONField, is seen as a change.
+    """
+    if isinstance(value, IMMUTABLE_TYPES):
+        return value
+    return copy.deepcopy(value)
+
+
+def _has_write_hooks(model: type) -> bool:
+    """
+    Whether writes of model append to the outbox or touch parents, which need
+    the primary keys of the rows written.
+    """
+    return bool(
+        getattr(model, "use_outbox", False) or getattr(model, "touch_parents", ())
+    )
+
+
+@contextmanager
+def _bulk_update_signals(
+    model: type,
+    using: str,
+    pks: Callable[[], Iterable[Any]],
+    fields: Iterable[str],
+    timestamp: Any,
+) -> Iterator[None]:
+    """
+    Send pre_bulk_update and post_bulk_update around the wrapped write of the
+    rows with primary keys pks(). Does nothing, and pks() is not evaluated,
+    when neither signal has receivers for model.
+    """
+    if not (
+        pre_bulk_update.has_listeners(model) or post_bulk_update.has_listeners(model)
+    ):
+        yield
+        return
+    opts = model._meta
+    kwargs = {
+        "sender": model,
+        "fields": [opts.get_field(name).name for name in fields],
+        "timestamp": None if hasattr(timestamp, "resolve_expression") else timestamp,
+        "using": using,
+    }
+    with transaction.atomic(using=using, savepoint=False):
+        kwargs["pks"] = list(pks())
+        pre_bulk_update.send(**kwargs)
+        yield
+    if getattr(model, "bulk_signals_on_commit", False):
+        transaction.on_commit(lambda: post_bulk_update.send(**kwargs), using=using)
+    else:
+        post_bulk_update.send(**kwargs)
+
+
+# Set during the write wrapped by _bulk_write_hooks, so that the update() run
+# by Django's bulk_update() does not run the hooks a second time.
+_in_bulk_write: ContextVar[bool] = ContextVar("_in_bulk_write", default=False)
+
+
+@contextmanager
+def _bulk_write_hooks(
+    model: type,
+    using: str,
+    pks: Callable[[], Iterable[Any]],
+    fields: Iterable[str],
+    timestamp: Any,
+    objs: Optional[Sequence["CreatedUpdatedTimestampModel"]] = None,
+    queryset: Optional[models.QuerySet] = None,
+) -> Iterator[None]:
+    """
+    Send the bulk update signals, record history and the outbox, and touch
+    the parents of the rows written by an update() of queryset or a
+    bulk_update() batch of objs.
+    """
+    if _in_bulk_write.get():
+        yield
+        return
+    fields = list(fields)
+    read_pks = pks
+    loaded_pks = []
+
+    def pks() -> List[Any]:
+        # Read once, before the write, and shared by all hooks.
+        if not loaded_pks:
+            loaded_pks.append(list(read_pks()))
+        return loaded_pks[0]
+
+    touches = None
+    moved_paths = []
+    if getattr(model, "touch_parents", ()):
+        # Read before the write, which may change the rows matching queryset.
+        touches = propagation.get_parent_touches(model, using, objs, queryset)
+        # Rows moved to other parents touch the parents they leave too.
+        moved_paths = propagation.get_moved_paths(model, fields)
+        if moved_paths:
+            propagation.merge_touches(
+                touches,
+                propagation.get_parent_touches(
+                    model, using, paths=moved_paths, pks=pks()
+                ),
+            )
+
+    with _bulk_update_signals(
+        model, using, pks, fields, timestamp
+    ), history.record_history(model, using, pks, fields), outbox.record_outbox(
+        model, using, pks, fields
+    ):
+        token = _in_bulk_write.set(True)
+        try:
+            yield
+        finally:
+            _in_bulk_write.reset(token)
+    if moved_paths and objs is None:
+        # The new parents of the rows of queryset.
+        propagation.merge_touches(
+            touches,
+            propagation.get_parent_touches(model, using, paths=moved_paths, pks=pks()),
+        )
+    if touches:
+        propagation.schedule_parent_touches(using, touches)
+
+
+def _record_upserted_rows(
+    model: type,
+    using: str,
+    rows: Sequence[Tuple[Any, bool]],
+    update_fields: Sequence[models.Field],
+) -> None:
+    """
+    Append the outbox entries of the rows written by an upsert, given as
+    (pk, inserted) pairs, and touch their parents. Parents a row is moved
+    away from by the upsert are not touched.
+    """
+    if getattr(model, "use_outbox", False):
+        outbox.write_outbox(
+            model, using, OutboxEntry.CREATE, [pk for pk, inserted in rows if inserted]
+        )
+        outbox.write_outbox(
+            model,
+            using,
+            OutboxEntry.UPDATE,
+            [pk for pk, inserted in rows if not inserted],
+            [*(f.name for f in update_fields), "last_updated_at"],
+        )
+    if getattr(model, "touch_parents", ()):
+        propagation.schedule_parent_touches(
+            using,
+            propagation.get_parent_touches(model, using, pks=[pk for pk, _ in rows]),
+        )
+
+
+class HistoricalModelIterable(models.query.ModelIterable):
+    """
+    Yields the objects of an as_of() queryset with the values of their fields
+    at that time.
+    """
+
+    def __iter__(self):
+        history_fields = history.get_history_fields(self.queryset.model)
+        for obj in super().__iter__():
+            for field in history_fields:
+                old_value = obj.__dict__.pop(history.AS_OF_PREFIX + field.attname, None)
+                if old_value is not None:
+                    setattr(obj, field.attname, field.to_python(old_value[0]))
+            yield obj
+
+
+class CreatedUpdatedTimestampField(models.DateTimeField):
+    """
+    DateTimeField used for "created_at" and "last_updated_at".
+    Behaves like a plain auto_now/auto_now_add DateTimeField unless the model
+    sets use_database_timestamps, in which case the value is computed by the
+    database with Now() and read back with RETURNING where supported.
+    """
+
+    def _uses_database_timestamps(self) -> bool:
+        model = getattr(self, "model", None)
+        return bool(getattr(model, "use_database_timestamps", False))
+
+    @property
+    def db_returning(self) -> bool:
+        return self._uses_database_timestamps()
+
+    def pre_save(self, model_instance: models.Model, add: bool) -> Any:
+        timestamp = _timestamp_override.get()
+        if timestamp is not None and (self.auto_now or (self.auto_now_add and add)):
+            setattr(model_instance, self.attname, timestamp)
+            return timestamp
+        if self._uses_database_timestamps() and (
+            self.auto_now or (self.auto_now_add and add)
+        ):
+            value = Now()
+            setattr(model_instance, self.attname, value)
+            return value
+        return super().pre_save(model_instance, add)
+
+    def deconstruct(self) -> Tuple[str, str, list, dict]:
+        # Deconstruct as a plain DateTimeField so existing migrations stay valid.
+        name, _path, args, kwargs = super().deconstruct()
+        return name, "django.db.models.DateTimeField", args, kwargs
+
+
+class CreatedUpdatedTimestampQuerySet(models.QuerySet):
+    """
+    Custom QuerySet for CreatedUpdatedTimestampModel.
+    Used to update last_updated_at on every update, including filtered ones.
     """
 
-    def update(self, **kwargs: any) -> int:
+    def _get_update_timestamp(self) -> Any:
+        """
+        Value for last_updated_at on update queries. Either the current time or,
+        with use_database_timestamps, a Now() expression evaluated by the database.
+        """
+        if getattr(self.model, "use_database_timestamps", False):
+            return Now()
+        return timezone.now()
+
+    @instrumented("update", int)
+    def update(self, **kwargs: Any) -> int:
         """
         Update values of fields in kwargs along with last_updated_at field.
+        The timestamp is part of the same UPDATE statement, so a filtered
+        update still runs as a single query.
         """
-        kwargs["last_updated_at"] = timezone.now()
-        return super().update(**kwargs)
+        kwargs.setdefault("last_updated_at", self._get_update_timestamp())
+        pks = self.values_list("pk", flat=True)
+        # The hooks may read the rows outside of a transaction, the UPDATE
+        # locks them anyway.
+        pks.query.select_for_update = False
+        with _bulk_write_hooks(
+            self.model,
+            self.db,
+            pks.all,
+            kwargs,
+            kwargs["last_updated_at"],
+            queryset=self,
+        ):
+            rows = super().update(**kwargs)
+        self._invalidate_cache()
+        return rows
+
+    update.alters_data = True
 
+    def delete(self) -> Tuple[int, Dict[str, int]]:
+        deleted = super().delete()
+        self._invalidate_cache()
+        return deleted
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
+    def _invalidate_cache(self) -> None:
+        """
+        Invalidate the cached instances of the model after a bulk write, see
+        cached_get.
+        """
+        if getattr(self.model, "cache_instances", False):
+            cache.invalidate_model(self.model, using=self.db)
+
+    def _check_cached_lookup(self, method_name: str) -> None:
+        if not getattr(self.model, "cache_instances", False):
+            raise ImproperlyConfigured(
+                "%s() requires %s.cache_instances to be True."
+                % (method_name, self.model.__name__)
+            )
+        if self.query.where or self.query.is_sliced:
+            raise TypeError(
+                "%s() cannot be used on a filtered or sliced queryset." % method_name
+            )
+
+    def cached_get(self, pk: Any) -> "CreatedUpdatedTimestampModel":
+        """
+        Return the object with the given pk from the cache, reading it from the
+        database and caching it on a miss.
+
+        Cached objects are dropped when they are saved or deleted, and all
+        cached objects of the model are dropped by update(), bulk_update(),
+        bulk_upsert() and delete() on querysets, by bumping a per-model
+        generation which is part of every cache key.
+        """
+        self._check_cached_lookup("cached_get")
+        generation, cached = cache.get_instances(self.model, [pk])
+        if cached:
+            return cached[pk]
+        obj = self.get(pk=pk)
+        cache.set_instances(self.model, [obj], generation)
+        return obj
+
+    def cached_in_bulk(
+        self, pks: Iterable[Any]
+    ) -> Dict[Any, "CreatedUpdatedTimestampModel"]:
+        """
+        Like in_bulk(pks), reading the objects from the cache first and only
+        querying the database for the missing ones. See cached_get.
+        """
+        self._check_cached_lookup("cached_in_bulk")
+        pks = list(pks)
+        generation, objs = cache.get_instances(self.model, pks)
+        missing = [pk for pk in pks if pk not in objs]
+        if missing:
+            loaded = self.in_bulk(missing)
+            cache.set_instances(self.model, loaded.values(), generation)
+            objs.update(loaded)
+        return objs
+
+    def update_or_create(
+        self, defaults: Optional[Mapping[str, Any]] = None, **kwargs: Any
+    ) -> Tuple["CreatedUpdatedTimestampModel", bool]:
+        """
+        Overriden update_or_create method. Makes sure last_updated_at is saved
+        along with the defaults when an existing object is updated.
+        """
+        defaults = dict(defaults or {})
+        defaults.setdefault("last_updated_at", self._get_update_timestamp())
+        return super().update_or_create(defaults=defaults, **kwargs)
+
+    @instrumented("bulk_create", len, counts_objects=True)
+    def bulk_create(
+        self,
+        objs: Iterable["CreatedUpdatedTimestampModel"],
+        *args: Any,
+        timestamp: Optional[datetime] = None,
+        **kwargs: Any,
+    ) -> List["CreatedUpdatedTimestampModel"]:
+        """
+        Overriden bulk_create method. Sets created_at and last_updated_at to
+        timestamp when given. With use_database_timestamps, timestamps that
+        could not be returned by the database are left to be loaded lazily.
+        """
+        with transaction.atomic(using=self.db, savepoint=False), override_timestamp(
+            timestamp
+        ):
+            objs = super().bulk_create(objs, *args, **kwargs)
+            if getattr(self.model, "use_outbox", False):
+                # Objects whose pk is not returned by the backend are skipped.
+                outbox.write_outbox(
+                    self.model,
+                    self.db,
+                    OutboxEntry.CREATE,
+                    [obj.pk for obj in objs if obj.pk is not None],
+                )
+            if getattr(self.model, "touch_parents", ()):
+                propagation.schedule_parent_touches(
+                    self.db, propagation.get_parent_touches(self.model, self.db, objs)
+                )
+        if getattr(self.model, "use_database_timestamps", False):
+            for obj in objs:
+                _clear_timestamp_expressions(obj)
+        return objs
+
+    bulk_create.alters_data = True
+
+    def _get_bulk_batch_size(
+        self, fields: Sequence[Any], batch_size: Optional[int] = None
+    ) -> int:
+        """
+        Batch size for a bulk write of the given fields, bounded by batch_size
+        and the query parameter limit of the backend.
+        """
+        if batch_size is not None and batch_size <= 0:
+            raise ValueError("Batch size must be a positive integer.")
+        batch_size = batch_size or DEFAULT_BULK_BATCH_SIZE
+        ops = connections[self.db].ops
+        return max(min(batch_size, ops.bulk_batch_size(fields, range(batch_size))), 1)
+
+    def _bulk_update_values(
+        self,
+        objs: Sequence["CreatedUpdatedTimestampModel"],
+        fields: Sequence[str],
+        timestamp: Any,
+    ) -> int:
+        """
+        Update objs with a single "UPDATE ... FROM (VALUES ...)" statement.
+        last_updated_at is set once for the statement instead of per row.
+        """
+        opts = self.model._meta
+        connection = connections[self.db]
+        qn = connection.ops.quote_name
+        fields = [opts.get_field(name) for name in fields]
+        if any(f not in opts.local_concrete_fields or f.primary_key for f in fields):
+            raise ValueError(
+                "bulk_update() with strategy='values' can only be used with "
+                "non-primary key concrete fields of the model's own table."
+            )
+        if any(obj.pk is None for obj in objs):
+            raise ValueError("All bulk_update() objects must have a primary key set.")
+        for obj in objs:
+            obj._prepare_related_fields_for_save(
+                operation_name="bulk_update", fields=fields
+            )
+        value_fields = [opts.pk, *(f for f in fields if f.name != "last_updated_at")]
+        # PostgreSQL infers VALUES column types from the first row only, and
+        # cannot infer them at all from untyped parameters.
+        if connection.vendor == "postgresql":
+            placeholders = [
+                "CAST(%%s AS %s)" % f.cast_db_type(connection) for f in value_fields
+            ]
+        else:
+            placeholders = ["%s"] * len(value_fields)
+        row_sql = "(%s)" % ", ".join(placeholders)
+        params = []
+        for obj in objs:
+            for field in value_fields:
+                value = getattr(obj, field.attname)
+                if hasattr(value, "resolve_expression"):
+                    raise ValueError(
+                        "bulk_update() with strategy='values' does not support "
+                        "expressions (%s.%s)." % (opts.object_name, field.name)
+                    )
+                params.append(field.get_db_prep_save(value, connection))
+
+        query = UpdateQuery(self.model)
+        compiler = query.get_compiler(using=self.db)
+        timestamp_field = opts.get_field("last_updated_at")
+        if hasattr(timestamp, "resolve_expression"):
+            timestamp_sql, timestamp_params = compiler.compile(
+                timestamp.resolve_expression(query)
+            )
+        else:
+            timestamp_sql = "%s"
+            timestamp_params = [timestamp_field.get_db_prep_save(timestamp, connection)]
+
+        # Both PostgreSQL and SQLite name VALUES columns column1, column2, ...
+        alias = qn("bulk_update_values")
+        assignments = [
+            "%s = %s.column%d" % (qn(field.column), alias, index)
+            for index, field in enumerate(value_fields[1:], start=2)
+        ]
+        assignments.append("%s = %s" % (qn(timestamp_field.column), timestamp_sql))
+        sql = "UPDATE %s SET %s FROM (VALUES %s) AS %s WHERE %s.%s = %s.column1" % (
+            qn(opts.db_table),
+            ", ".join(assignments),
+            ", ".join([row_sql] * len(objs)),
+            alias,
+            qn(opts.db_table),
+            qn(opts.pk.column),
+            alias,
+        )
+        with transaction.atomic(using=self.db, savepoint=False):
+            with connection.cursor() as cursor:
+                cursor.execute(sql, (*timestamp_params, *params))
+                rows = cursor.rowcount
+        self._invalidate_cache()
+        return rows
+
+    @instrumented("bulk_update", int, counts_objects=True)
     def bulk_update(
         self,
         objs: Iterable["CreatedUpdatedTimestampModel"],
         fields: Sequence[str],
         batch_size: Optional[int] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        strategy: str = "case",
+        timestamp: Optional[datetime] = None,
+        atomic: bool = True,
     ) -> int:
         """
-        Overriden bulk_update method. Adds current timestamp to last_updated_at field.
+        Overriden bulk_update method. Adds current timestamp to last_updated_at field,
+        or timestamp when given.
+
+        objs can be any iterable, including a generator. It is consumed in
+        chunks of batch_size objects, so memory use does not grow with the
+        input. When batch_size is not given it is derived from the backend's
+        query parameter limit and the number of fields. All chunks are written
+        in a single transaction, like Django's bulk_update(). With
+        atomic=False, each chunk is written in its own transaction instead,
+        so a failure leaves the previous chunks committed, unless the call is
+        wrapped in atomic().
+
+        progress_callback, if given, is called after every chunk with the number
+        of objects processed and rows updated so far.
+
+        strategy selects the SQL used for each chunk:
+        - "case": Django's bulk_update, one CASE/WHEN expression per field.
+        - "values": a single UPDATE joined with a VALUES list, which is much
+          cheaper to plan for large chunks. Falls back to "case" on backends
+          without UPDATE ... FROM support.
+        """
+        if strategy not in BULK_UPDATE_STRATEGIES:
+            raise ValueError(
+                "Unknown bulk_update() strategy %r, expected one of %s."
+                % (strategy, ", ".join(BULK_UPDATE_STRATEGIES))
+            )
+        fields = list(fields)
+        if "last_updated_at" not in fields:
+            fields.append("last_updated_at")
+        self._for_write = True
+        if strategy == "values" and not _supports_update_from(connections[self.db]):
+            strategy = "case"
+        if strategy == "values":
+            # One parameter per value column, the timestamp is shared.
+            batch_size = self._get_bulk_batch_size(
+                ["pk", *(f for f in fields if f != "last_updated_at")], batch_size
+            )
+        else:
+            # PK is used twice per object in Django's CASE/WHEN update query.
+            batch_size = self._get_bulk_batch_size(["pk", "pk", *fields], batch_size)
+        if timestamp is None:
+            timestamp = self._get_update_timestamp()
+        objs = iter(objs)
+        objs_processed = rows_updated = 0
+        with (
+            transaction.atomic(using=self.db, savepoint=False)
+            if atomic
+            else nullcontext()
+        ):
+            while batch := list(islice(objs, batch_size)):
+                for obj in batch:
+                    obj.last_updated_at = timestamp
+                pks = [obj.pk for obj in batch]
+                with _bulk_write_hooks(
+                    self.model, self.db, lambda: pks, fields, timestamp, batch
+                ):
+                    if strategy == "values":
+                        rows_updated += self._bulk_update_values(
+                            batch, fields, timestamp
+                        )
+                    else:
+                        rows_updated += super().bulk_update(batch, fields, batch_size)
+                if getattr(self.model, "use_database_timestamps", False):
+                    for obj in batch:
+                        _clear_timestamp_expressions(obj)
+                if getattr(self.model, "track_changes", False):
+                    for obj in batch:
+                        obj._snapshot(fields)
+                objs_processed += len(batch)
+                if progress_callback is not None:
+                    progress_callback(objs_processed, rows_updated)
+        return rows_updated
+
+    bulk_update.alters_data = True
+
+    def bulk_update_optimistic(
+        self,
+        objs: Iterable["CreatedUpdatedTimestampModel"],
+        fields: Sequence[str],
+        batch_size: Optional[int] = None,
+    ) -> List[Any]:
+        """
+        bulk_update() for a model with optimistic_locking, only writing the
+        objects whose row still has the last_updated_at they were loaded with.
+        Return the primary keys of the other, stale objects, which are left
+        unchanged.
+
+        Each batch is checked with SELECT ... FOR UPDATE and written in the
+        same transaction, so the bulk update signals, history and outbox only
+        see the objects actually written.
         """
-        timestamp = timezone.now()
+        if not getattr(self.model, "optimistic_locking", False):
+            raise ImproperlyConfigured(
+                "bulk_update_optimistic() requires %s.optimistic_locking to be True."
+                % self.model.__name__
+            )
+        # The version is one more parameter per object.
+        batch_size = self._get_bulk_batch_size(
+            ["pk", "pk", "pk", *fields, "last_updated_at"], batch_size
+        )
+        objs = iter(objs)
+        stale_pks = []
+        while batch := list(islice(objs, batch_size)):
+            if any(obj.__dict__.get("_loaded_version") is None for obj in batch):
+                raise ValueError(
+                    "bulk_update_optimistic() objects must be loaded with their "
+                    "last_updated_at."
+                )
+            condition = models.Q()
+            for obj in batch:
+                condition |= models.Q(pk=obj.pk, last_updated_at=obj._loaded_version)
+            timestamp = timezone.now()
+            with transaction.atomic(using=self.db, savepoint=False):
+                # The locked rows keep their version until the batch is written.
+                fresh_pks = set(
+                    self.filter(condition)
+                    .select_for_update()
+                    .values_list("pk", flat=True)
+                )
+                fresh = [obj for obj in batch if obj.pk in fresh_pks]
+                if fresh:
+                    self.bulk_update(
+                        fresh, fields, batch_size=len(fresh), timestamp=timestamp
+                    )
+            for obj in batch:
+                if obj.pk in fresh_pks:
+                    obj._loaded_version = timestamp
+                else:
+                    stale_pks.append(obj.pk)
+        return stale_pks
+
+    bulk_update_optimistic.alters_data = True
+
+    def _get_touch_related_model(self, path: str) -> type:
+        """
+        Model reached from this one by path, a chain of forward foreign keys
+        separated by "__", e.g. "book__publication".
+        """
+        model = self.model
+        for name in path.split(LOOKUP_SEP):
+            field = model._meta.get_field(name)
+            if not (field.many_to_one or field.one_to_one) or not field.concrete:
+                raise ValueError(
+                    "touch_related must only follow foreign keys, %s.%s is not one."
+                    % (model.__name__, name)
+                )
+            model = field.related_model
+        if not issubclass(model, CreatedUpdatedTimestampModel):
+            raise ValueError(
+                "touch_related path %r leads to %s, which has no last_updated_at."
+                % (path, model.__name__)
+            )
+        return model
+
+    def _touch(self, timestamp: Any, touch_related: Sequence[str]) -> int:
+        # Parents first, so that the subqueries still match rows of this
+        # queryset filtered on last_updated_at.
+        for path in touch_related:
+            related_model = self._get_touch_related_model(path)
+            related_model._default_manager.db_manager(self.db).filter(
+                pk__in=self.values(path)
+            ).update(last_updated_at=timestamp)
+        return self.update(last_updated_at=timestamp)
+
+    def touch(
+        self,
+        pks_or_queryset: Optional[Union[Iterable[Any], models.QuerySet]] = None,
+        timestamp: Optional[datetime] = None,
+        touch_related: Sequence[str] = (),
+        batch_size: Optional[int] = None,
+    ) -> int:
+        """
+        Set last_updated_at to timestamp, or the current time, without loading
+        or changing anything else, and return the number of rows touched.
+
+        pks_or_queryset selects the rows of this queryset to touch, all of
+        them by default. A queryset is used as a subquery, so the rows are
+        touched with a single UPDATE, while primary keys are touched with one
+        UPDATE per chunk of batch_size.
+
+        touch_related lists foreign keys, or paths of foreign keys such as
+        "book__publication", whose target rows are touched along with these
+        ones, with one UPDATE per path and chunk.
+        """
+        if timestamp is None:
+            timestamp = self._get_update_timestamp()
+        for path in touch_related:
+            self._get_touch_related_model(path)
+        if pks_or_queryset is None:
+            return self._touch(timestamp, touch_related)
+        if isinstance(pks_or_queryset, models.QuerySet):
+            return self.filter(pk__in=pks_or_queryset.values("pk"))._touch(
+                timestamp, touch_related
+            )
+        batch_size = self._get_bulk_batch_size(["pk"], batch_size)
+        pks = iter(pks_or_queryset)
+        rows = 0
+        while batch := list(islice(pks, batch_size)):
+            with transaction.atomic(using=self.db, savepoint=False):
+                rows += self.filter(pk__in=batch)._touch(timestamp, touch_related)
+        return rows
+
+    touch.alters_data = True
+
+    def _get_upsert_sql(
+        self,
+        fields: Sequence[models.Field],
+        unique_fields: Sequence[models.Field],
+        update_fields: Sequence[models.Field],
+        source_sql: str,
+    ) -> str:
+        """
+        "INSERT ... ON CONFLICT DO UPDATE" statement inserting fields from
+        source_sql (VALUES or SELECT), which only updates rows where one of
+        update_fields changed, or "ON CONFLICT DO NOTHING" without
+        update_fields. Each returned row is the primary key of a written row
+        and whether it was inserted.
+        """
+        opts = self.model._meta
+        connection = connections[self.db]
+        qn = connection.ops.quote_name
+        distinct_operator = (
+            "IS DISTINCT FROM" if connection.vendor == "postgresql" else "IS NOT"
+        )
+        table = qn(opts.db_table)
+        assignments = [
+            "%s = EXCLUDED.%s" % (qn(f.column), qn(f.column))
+            for f in (*update_fields, opts.get_field("last_updated_at"))
+        ]
+        changed = [
+            "%s.%s %s EXCLUDED.%s"
+            % (table, qn(f.column), distinct_operator, qn(f.column))
+            for f in update_fields
+        ]
+        sql = "INSERT INTO %s (%s) %s ON CONFLICT (%s)" % (
+            table,
+            ", ".join(qn(f.column) for f in fields),
+            source_sql,
+            ", ".join(qn(f.column) for f in unique_fields),
+        )
+        if update_fields:
+            sql += " DO UPDATE SET %s WHERE %s" % (
+                ", ".join(assignments),
+                " OR ".join(changed),
+            )
+        else:
+            sql += " DO NOTHING"
+        # Inserted rows are the only ones whose timestamps are still equal, as
+        # updates set last_updated_at to the timestamp of a later statement.
+        sql += " RETURNING %s, %s = %s" % (
+            qn(opts.pk.column),
+            qn(opts.get_field("created_at").column),
+            qn(opts.get_field("last_updated_at").column),
+        )
+        return sql
+
+    def _get_upsert_fields(
+        self,
+        unique_fields: Sequence[str],
+        update_fields: Sequence[str],
+        method_name: str,
+    ) -> Tuple[List[models.Field], List[models.Field]]:
+        """
+        Validate and resolve the unique_fields and update_fields of an upsert.
+        """
+        if not unique_fields:
+            raise ValueError("unique_fields must be given to %s()." % method_name)
+        opts = self.model._meta
+        unique_fields = [opts.get_field(name) for name in unique_fields]
+        update_fields = [opts.get_field(name) for name in update_fields]
+        if any(
+            not f.concrete or f.many_to_many or f.name in TIMESTAMP_FIELDS
+            for f in (*unique_fields, *update_fields)
+        ):
+            raise ValueError(
+                "%s() can only be used with concrete fields other than "
+                "created_at and last_updated_at." % method_name
+            )
+        if any(f.primary_key for f in update_fields):
+            raise ValueError("%s() cannot update primary key fields." % method_name)
+        if getattr(self.model, "keep_history", False):
+            raise ImproperlyConfigured(
+                "%s() cannot record the history of %s, which has keep_history."
+                % (method_name, self.model.__name__)
+            )
+        return unique_fields, update_fields
+
+    def _bulk_upsert_batch(
+        self,
+        objs: Sequence["CreatedUpdatedTimestampModel"],
+        fields: Sequence[models.Field],
+        unique_fields: Sequence[models.Field],
+        update_fields: Sequence[models.Field],
+        timestamp: Any,
+    ) -> Tuple[int, int]:
+        """
+        Upsert objs with a single "INSERT ... ON CONFLICT DO UPDATE" statement.
+        Return the number of rows inserted and updated.
+        """
+        connection = connections[self.db]
+        params = []
         for obj in objs:
-            obj.last_updated_at = timestamp
-        fields.append("last_updated_at")
-        return super().bulk_update(objs, fields, batch_size)
+            obj._prepare_related_fields_for_save(operation_name="bulk_upsert")
+            for field in fields:
+                if field.name in TIMESTAMP_FIELDS:
+                    value = timestamp
+                else:
+                    value = getattr(obj, field.attname)
+                params.append(field.get_db_prep_save(value, connection))
+        row_sql = "(%s)" % ", ".join(["%s"] * len(fields))
+        sql = self._get_upsert_sql(
+            fields,
+            unique_fields,
+            update_fields,
+            "VALUES %s" % ", ".join([row_sql] * len(objs)),
+        )
+        with transaction.atomic(using=self.db, savepoint=False):
+            with connection.cursor() as cursor:
+                cursor.execute(sql, params)
+                rows = cursor.fetchall()
+            _record_upserted_rows(self.model, self.db, rows, update_fields)
+        self._invalidate_cache()
+        inserted = sum(1 for _pk, is_insert in rows if is_insert)
+        return inserted, len(rows) - inserted
+
+    def bulk_upsert(
+        self,
+        objs: Iterable["CreatedUpdatedTimestampModel"],
+        unique_fields: Sequence[str],
+        update_fields: Sequence[str],
+        batch_size: Optional[int] = None,
+    ) -> UpsertResult:
+        """
+        Insert objs, or update update_fields of the rows conflicting with them on
+        unique_fields, with one "INSERT ... ON CONFLICT" statement per batch.
+
+        created_at keeps the value of the original insert. Rows are only
+        updated, and last_updated_at only bumped, when one of update_fields
+        actually changed. Without update_fields, conflicting rows are left
+        untouched and counted as unchanged. The objects themselves are not
+        modified, and primary keys are not set on them.
+
+        objs must not repeat a unique key, ValueError is raised before the
+        batch repeating it is written. Each batch is written with its own
+        timestamp.
+
+        Supported on PostgreSQL and SQLite >= 3.35.
+        """
+        if not _supports_upsert_returning(connections[self.db]):
+            raise NotSupportedError(
+                "bulk_upsert() is not supported on this database backend."
+            )
+        unique_fields, update_fields = self._get_upsert_fields(
+            unique_fields, update_fields, "bulk_upsert"
+        )
+        fields = [
+            f
+            for f in self.model._meta.local_concrete_fields
+            if not (isinstance(f, AutoFieldMixin) and f not in unique_fields)
+        ]
+        self._for_write = True
+        batch_size = self._get_bulk_batch_size(fields, batch_size)
+        objs = iter(objs)
+        seen_keys = set()
+        timestamp = None
+        inserted = updated = unchanged = 0
+        while batch := list(islice(objs, batch_size)):
+            for obj in batch:
+                key = tuple(getattr(obj, f.attname) for f in unique_fields)
+                # NULLs never conflict.
+                if None in key:
+                    continue
+                if key in seen_keys:
+                    raise ValueError(
+                        "bulk_upsert() objs repeat the unique key %r." % (key,)
+                    )
+                seen_keys.add(key)
+            # Inserts are told apart by equal timestamps, so no two batches
+            # share one.
+            now = timezone.now()
+            if timestamp is not None and now <= timestamp:
+                now = timestamp + timedelta(microseconds=1)
+            timestamp = now
+            batch_inserted, batch_updated = self._bulk_upsert_batch(
+                batch, fields, unique_fields, update_fields, timestamp
+            )
+            inserted += batch_inserted
+            updated += batch_updated
+            unchanged += len(batch) - batch_inserted - batch_updated
+        return UpsertResult(inserted, updated, unchanged)
+
+    bulk_upsert.alters_data = True
+
+    def bulk_copy(
+        self,
+        rows: Iterable[Row],
+        fields: Optional[Sequence[str]] = None,
+        unique_fields: Optional[Sequence[str]] = None,
+        update_fields: Sequence[str] = (),
+        batch_size: Optional[int] = None,
+    ) -> Union[int, UpsertResult]:
+        """
+        Load rows, model instances or mappings of field names to values, with
+        PostgreSQL's COPY ... FROM STDIN. Rows are streamed from the iterable
+        as CSV without building model instances, created_at/last_updated_at are
+        set to the same current timestamp, and fields missing from a mapping get
+        their default. fields defaults to all fields except an auto primary key.
+
+        With unique_fields, rows are copied to a temporary staging table and
+        merged like bulk_upsert(), returning an UpsertResult. Otherwise the
+        number of rows loaded is returned. Rows must not repeat a unique key.
+        On models with use_outbox or touch_parents, rows are always copied to
+        a staging table first, to know the primary keys of the rows written.
+
+        On other backends, rows are written with bulk_create() or bulk_upsert()
+        in batches of batch_size.
+        """
+        opts = self.model._meta
+        if fields is None:
+            fields = [
+                f
+                for f in opts.local_concrete_fields
+                if not isinstance(f, AutoFieldMixin) and f.name not in TIMESTAMP_FIELDS
+            ]
+        else:
+            fields = [opts.get_field(name) for name in fields]
+            if any(
+                f not in opts.local_concrete_fields or f.name in TIMESTAMP_FIELDS
+                for f in fields
+            ):
+                raise ValueError(
+                    "bulk_copy() can only be used with concrete fields other than "
+                    "created_at and last_updated_at."
+                )
+        if unique_fields is not None:
+            upsert_fields = self._get_upsert_fields(
+                unique_fields, update_fields, "bulk_copy"
+            )
+        self._for_write = True
+        connection = connections[self.db]
+
+        if connection.vendor != "postgresql":
+            objs = (
+                (
+                    row
+                    if isinstance(row, models.Model)
+                    else self.model(
+                        **{f.attname: get_row_value(row, f) for f in fields}
+                    )
+                )
+                for row in rows
+            )
+            if unique_fields is not None:
+                return self.bulk_upsert(objs, unique_fields, update_fields, batch_size)
+            batch_size = batch_size or DEFAULT_BULK_BATCH_SIZE
+            timestamp = timezone.now()
+            created = 0
+            while batch := list(islice(objs, batch_size)):
+                created += len(
+                    self.bulk_create(batch, batch_size=batch_size, timestamp=timestamp)
+                )
+            return created
+
+        fields = [
+            *fields,
+            opts.get_field("created_at"),
+            opts.get_field("last_updated_at"),
+        ]
+        qn = connection.ops.quote_name
+        table = qn(opts.db_table)
+        columns = [qn(f.column) for f in fields]
+        row_count = 0
+
+        def count_rows(lines: Iterator[str]) -> Iterator[str]:
+            nonlocal row_count
+            for line in lines:
+                row_count += 1
+                yield line
+
+        lines = count_rows(iter_csv_lines(rows, fields, timezone.now(), connection))
+        with transaction.atomic(using=self.db, savepoint=False):
+            with connection.cursor() as cursor:
+                if unique_fields is None and not _has_write_hooks(self.model):
+                    copy_from(cursor, table, columns, lines)
+                else:
+                    stage = qn("%s_stage" % opts.db_table)
+                    cursor.execute(
+                        "CREATE TEMPORARY TABLE %s ON COMMIT DROP AS "
+                        "SELECT %s FROM %s WITH NO DATA"
+                        % (stage, ", ".join(columns), table)
+                    )
+                    copy_from(cursor, stage, columns, lines)
+                    source_sql = "SELECT %s FROM %s" % (", ".join(columns), stage)
+                    if unique_fields is None:
+                        upsert_fields = ((), ())
+                        cursor.execute(
+                            "INSERT INTO %s (%s) %s RETURNING %s, true"
+                            % (
+                                table,
+                                ", ".join(columns),
+                                source_sql,
+                                qn(opts.pk.column),
+                            )
+                        )
+                    else:
+                        cursor.execute(
+                            self._get_upsert_sql(fields, *upsert_fields, source_sql)
+                        )
+                    merged = cursor.fetchall()
+                    cursor.execute("DROP TABLE %s" % stage)
+                    _record_upserted_rows(self.model, self.db, merged, upsert_fields[1])
+        self._invalidate_cache()
+        if unique_fields is None:
+            return row_count
+        inserted = sum(1 for _pk, is_insert in merged if is_insert)
+        updated = len(merged) - inserted
+        return UpsertResult(inserted, updated, row_count - inserted - updated)
+
+    bulk_copy.alters_data = True
+
+    def purge_stale(
+        self,
+        cutoff: Optional[datetime] = None,
+        batch_size: Optional[int] = None,
+        sleep: float = 0,
+    ) -> Tuple[int, Dict[str, int]]:
+        """
+        Delete the rows last updated before cutoff, which defaults to now minus
+        the retention_period of the model, in transactions of batch_size rows
+        taken in primary key order. Rows are first copied to the table of the
+        model's retention_archive, if any. Sleeps sleep seconds between batches
+        to throttle the load on the database.
+
+        Batches are deleted with a single DELETE when no signals or cascades
+        apply, otherwise through QuerySet.delete(). Return the number of rows
+        deleted and their count per model, as QuerySet.delete() does.
+        """
+        if cutoff is None:
+            cutoff = get_retention_cutoff(self.model)
+        batch_size = batch_size or DEFAULT_BULK_BATCH_SIZE
+        archive_model = get_archive_model(self.model)
+        queryset = self.filter(last_updated_at__lt=cutoff).order_by("pk")
+        total, counts = 0, {}
+        last_pk = None
+        while True:
+            batch = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+            pks = list(batch.values_list("pk", flat=True)[:batch_size])
+            if not pks:
+                break
+            last_pk = pks[-1]
+            with transaction.atomic(using=self.db):
+                rows = queryset.filter(pk__in=pks)
+                if archive_model is not None:
+                    archive_rows(rows, archive_model)
+                deleted, deleted_counts = delete_rows(rows)
+            total += deleted
+            merge_counts(counts, deleted_counts)
+            if len(pks) < batch_size:
+                break
+            if sleep:
+                time.sleep(sleep)
+        self._invalidate_cache()
+        return total, counts
+
+    purge_stale.alters_data = True
+
+    def as_of(self, timestamp: datetime) -> "CreatedUpdatedTimestampQuerySet":
+        """
+        Objects as they were at timestamp, for a model with keep_history.
+        Objects created after timestamp are excluded, deleted objects are not
+        restored.
+
+        The value of each field is the previous value recorded by the first
+        change after timestamp, or the current value when there is none. Each
+        field costs one index lookup per object, in the same query, however
+        long the history is.
+        """
+        if not getattr(self.model, "keep_history", False):
+            raise ImproperlyConfigured(
+                "as_of() requires %s.keep_history to be True." % self.model.__name__
+            )
+        changes = FieldChange.objects.using(self.db).filter(
+            model=self.model._meta.label_lower,
+            object_id=Cast(models.OuterRef("pk"), models.CharField()),
+            changed_at__gt=timestamp,
+        )
+        queryset = self.filter(created_at__lte=timestamp).annotate(**{
+            history.AS_OF_PREFIX
+            + field.attname: models.Subquery(
+                changes.filter(field=field.attname)
+                .order_by("changed_at")
+                .values("old_value")[:1]
+            )
+            for field in history.get_history_fields(self.model)
+        })
+        queryset._iterable_class = HistoricalModelIterable
+        return queryset
+
+    def created_between(
+        self,
+        start: datetime,
+        end: Optional[datetime] = None,
+    ) -> "CreatedUpdatedTimestampQuerySet":
+        """
+        Filter rows created at or after start and before end. Comparing
+        created_at to constant bounds lets PostgreSQL prune the partitions of a
+        partitioned model when planning the query.
+        """
+        queryset = self.filter(created_at__gte=start)
+        if end is not None:
+            queryset = queryset.filter(created_at__lt=end)
+        return queryset
+
+    def in_partition(self, timestamp: datetime) -> "CreatedUpdatedTimestampQuerySet":
+        """
+        Filter rows of the partition, following the partition_interval of the
+        model, containing timestamp.
+        """
+        return self.created_between(
+            *partition_bounds(timestamp, get_partition_interval(self.model))
+        )
+
+    def changed_since(
+        self,
+        watermark: Union[datetime, str, None] = None,
+        batch_size: int = DEFAULT_BULK_BATCH_SIZE,
+    ) -> Iterator[ChangeBatch]:
+        """
+        Yield batches of objects changed after watermark, ordered by
+        (last_updated_at, pk).
+
+        watermark is either a datetime, a cursor of a previously yielded
+        ChangeBatch, or None to start from the beginning. Paging uses the
+        (last_updated_at, pk) keyset, so rows sharing a timestamp are never
+        skipped or yielded twice, and each page is an index range scan.
+        A row updated during the scan is yielded again with its new timestamp.
+        """
+        if batch_size <= 0:
+            raise ValueError("Batch size must be a positive integer.")
+        pk = None
+        if isinstance(watermark, str):
+            watermark, pk = decode_cursor(watermark)
+        queryset = self.order_by("last_updated_at", "pk")
+        while True:
+            page = queryset
+            if watermark is not None:
+                page = seek(page, "last_updated_at", watermark, pk)
+            objs = list(page[:batch_size])
+            if not objs:
+                return
+            watermark, pk = objs[-1].last_updated_at, objs[-1].pk
+            yield ChangeBatch(objs, encode_cursor(watermark, pk))
+            if len(objs) < batch_size:
+                return
+
+    def _can_write_concurrently(self) -> bool:
+        """
+        Whether chunks can be written concurrently on separate connections.
+        SQLite serializes writers, and chunks written on other connections
+        would escape a transaction opened by the caller.
+        """
+        connection = connections[self.db]
+        return connection.vendor != "sqlite" and not connection.in_atomic_block
+
+    async def _arun_chunks(
+        self,
+        func: Callable[[List[Any]], Any],
+        objs: Iterable[Any],
+        chunk_size: int,
+        max_concurrency: int,
+    ) -> List[Any]:
+        """
+        Call func with consecutive chunks of objs without blocking the event
+        loop, up to max_concurrency chunks at a time on separate connections
+        when the backend allows it. Return the results in chunk order.
+        """
+        if max_concurrency <= 0:
+            raise ValueError("max_concurrency must be a positive integer.")
+        concurrent = (
+            max_concurrency > 1 and await sync_to_async(self._can_write_concurrently)()
+        )
+        if not concurrent:
+            return [
+                await sync_to_async(func)(chunk)
+                for chunk in iter(lambda: list(islice(objs, chunk_size)), [])
+            ]
+
+        def run_in_thread(chunk: List[Any]) -> Any:
+            try:
+                return func(chunk)
+            finally:
+                # Worker threads are reused, don't leave their connection open.
+                connections[self.db].close()
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run(chunk: List[Any]) -> Any:
+            try:
+                return await sync_to_async(run_in_thread, thread_sensitive=False)(chunk)
+            finally:
+                semaphore.release()
+
+        tasks = []
+        objs = iter(objs)
+        # Only read the next chunk once a slot is free, to bound memory use.
+        while True:
+            await semaphore.acquire()
+            chunk = list(islice(objs, chunk_size))
+            if not chunk:
+                semaphore.release()
+                break
+            tasks.append(asyncio.ensure_future(run(chunk)))
+        return await asyncio.gather(*tasks)
+
+    async def aupdate(self, **kwargs: Any) -> int:
+        """
+        Async version of update(), also setting last_updated_at.
+        """
+        return await sync_to_async(self.update)(**kwargs)
+
+    aupdate.alters_data = True
+
+    async def abulk_create(
+        self,
+        objs: Iterable["CreatedUpdatedTimestampModel"],
+        batch_size: Optional[int] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        **kwargs: Any,
+    ) -> List["CreatedUpdatedTimestampModel"]:
+        """
+        Async version of bulk_create(). objs are created in chunks of
+        batch_size, up to max_concurrency chunks at a time where the backend
+        allows it. Each chunk is committed separately in that case.
+        """
+        batch_size = batch_size or DEFAULT_BULK_BATCH_SIZE
+        results = await self._arun_chunks(
+            lambda chunk: self.bulk_create(chunk, batch_size=batch_size, **kwargs),
+            iter(objs),
+            batch_size,
+            max_concurrency,
+        )
+        return [obj for chunk in results for obj in chunk]
+
+    abulk_create.alters_data = True
+
+    async def abulk_update(
+        self,
+        objs: Iterable["CreatedUpdatedTimestampModel"],
+        fields: Sequence[str],
+        batch_size: Optional[int] = None,
+        strategy: str = "case",
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ) -> int:
+        """
+        Async version of bulk_update(). Chunks are updated up to max_concurrency
+        at a time where the backend allows it, all with the same
+        last_updated_at.
+        """
+        timestamp = self._get_update_timestamp()
+        batch_size = batch_size or DEFAULT_BULK_BATCH_SIZE
+        results = await self._arun_chunks(
+            lambda chunk: self.bulk_update(
+                chunk, fields, batch_size, strategy=strategy, timestamp=timestamp
+            ),
+            iter(objs),
+            batch_size,
+            max_concurrency,
+        )
+        return sum(results)
+
+    abulk_update.alters_data = True
+
+    def _write_chunk(
+        self, func: Callable[[List[Any]], Any], chunk: List[Any], retries: int
+    ) -> Any:
+        """
+        Call func with chunk in a transaction, retrying up to retries times on
+        OperationalError, e.g. a deadlock or a dropped connection.
+        """
+        for attempt in range(retries + 1):
+            try:
+                with transaction.atomic(using=self.db):
+                    return func(chunk)
+            except OperationalError:
+                if attempt == retries:
+                    raise
+                time.sleep(RETRY_DELAY * 2**attempt)
+
+    def _run_chunks_in_pool(
+        self,
+        func: Callable[[List[Any]], int],
+        objs: Iterable[Any],
+        chunk_size: int,
+        max_workers: int,
+        retries: int,
+    ) -> int:
+        """
+        Call func with consecutive chunks of objs in a thread pool, each chunk
+        committed separately on the connection of its worker thread. Chunks
+        run one after another when the backend does not allow concurrent
+        writes. Return the sum of the results.
+        """
+        if max_workers <= 0:
+            raise ValueError("max_workers must be a positive integer.")
+        objs = iter(objs)
+        chunks = iter(lambda: list(islice(objs, chunk_size)), [])
+        if max_workers == 1 or not self._can_write_concurrently():
+            return sum(self._write_chunk(func, chunk, retries) for chunk in chunks)
+
+        def run_in_thread(chunk: List[Any]) -> int:
+            try:
+                return self._write_chunk(func, chunk, retries)
+            finally:
+                connections[self.db].close()
+
+        total = 0
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = set()
+            for chunk in chunks:
+                # Only read the next chunk once a worker is free, to bound
+                # memory use.
+                if len(pending) >= max_workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    total += sum(future.result() for future in done)
+                pending.add(executor.submit(run_in_thread, chunk))
+            total += sum(future.result() for future in wait(pending).done)
+        return total
+
+    def parallel_bulk_create(
+        self,
+        objs: Iterable["CreatedUpdatedTimestampModel"],
+        batch_size: Optional[int] = None,
+        chunk_size: int = DEFAULT_PARALLEL_CHUNK_SIZE,
+        max_workers: int = DEFAULT_MAX_CONCURRENCY,
+        retries: int = 3,
+        **kwargs: Any,
+    ) -> int:
+        """
+        bulk_create objs in chunks of chunk_size objects, written in parallel
+        by max_workers threads with their own database connections. Each chunk
+        is committed separately and retried on OperationalError. Every object
+        gets the same created_at/last_updated_at. Return the number of objects
+        created.
+        """
+        timestamp = timezone.now()
+        return self._run_chunks_in_pool(
+            lambda chunk: len(
+                self.bulk_create(
+                    chunk, batch_size=batch_size, timestamp=timestamp, **kwargs
+                )
+            ),
+            objs,
+            chunk_size,
+            max_workers,
+            retries,
+        )
+
+    parallel_bulk_create.alters_data = True
+
+    def parallel_bulk_update(
+        self,
+        objs: Iterable["CreatedUpdatedTimestampModel"],
+        fields: Sequence[str],
+        batch_size: Optional[int] = None,
+        strategy: str = "case",
+        chunk_size: int = DEFAULT_PARALLEL_CHUNK_SIZE,
+        max_workers: int = DEFAULT_MAX_CONCURRENCY,
+        retries: int = 3,
+    ) -> int:
+        """
+        bulk_update objs in chunks of chunk_size objects, written in parallel
+        like parallel_bulk_create, all with the same last_updated_at. Return
+        the number of rows updated.
+        """
+        timestamp = self._get_update_timestamp()
+        return self._run_chunks_in_pool(
+            lambda chunk: self.bulk_update(
+                chunk, fields, batch_size, strategy=strategy, timestamp=timestamp
+            ),
+            objs,
+            chunk_size,
+            max_workers,
+            retries,
+        )
+
+    parallel_bulk_update.alters_data = True
+
+    async def achanged_since(
+        self,
+        watermark: Union[datetime, str, None] = None,
+        batch_size: int = DEFAULT_BULK_BATCH_SIZE,
+    ) -> AsyncIterator[ChangeBatch]:
+        """
+        Async version of changed_since().
+        """
+        batches = self.changed_since(watermark, batch_size)
+        while True:
+            batch = await sync_to_async(next)(batches, None)
+            if batch is None:
+                return
+            yield batch
+
+
+class CreateUpdateTimestampManager(
+    models.Manager.from_queryset(CreatedUpdatedTimestampQuerySet)
+):
+    """
+    Custom Manager for CreatedUpdatedTimestampModel.
+    Exposes the methods of CreatedUpdatedTimestampQuerySet.
+    """
 
 
 class CreatedUpdatedTimestampModel(models.Model):
     """
     An abstract base class that provides self-managed "created_at" and
     "last_updated_at" fields.
+
+    Set use_database_timestamps = True on a subclass to let the database fill
+    both fields (Now()) instead of calling timezone.now() for every row.
+
+    List field names or TimestampIndex instances in timestamp_indexes to index
+    the timestamp fields, e.g. timestamp_indexes = ["last_updated_at"].
+
+    Set track_changes = True on a subclass to keep a snapshot of the values
+    loaded from the database. save() then only writes the changed fields along
+    with last_updated_at, and skips the UPDATE when nothing changed. Like a
+    plain save(), a changed object whose row was deleted is inserted again.
+
+    Set cache_instances = True on a subclass to enable objects.cached_get()
+    and objects.cached_in_bulk(), using the cache_alias cache. Cached
+    instances are invalidated by writes and deletions, including cascades.
+
+    Set partition_interval = "month" or "day" on a subclass whose table is
+    created by the CreatePartitionedModel migration operation, to partition it
+    by range of created_at on PostgreSQL.
+
+    Set retention_period to a timedelta to let objects.purge_stale() and the
+    purge_stale_rows command delete rows not updated for that long, and
+    retention_archive to the label of a model to copy them to first.
+
+    Set keep_history = True on a subclass to record the previous value of
+    every field changed by save(), update() and bulk_update() as a FieldChange,
+    and query past states with objects.as_of(). bulk_upsert() and bulk_copy()
+    with unique_fields raise ImproperlyConfigured on such models.
+
+    update() and bulk_update() send the pre_bulk_update and post_bulk_update
+    signals, bulk_upsert() and bulk_copy() do not. Set
+    bulk_signals_on_commit = True on a subclass to delay post_bulk_update
+    until the transaction is committed.
+
+    Set optimistic_locking = True on a subclass to make save() only update
+    the row if its last_updated_at is still the loaded one, raising
+    ConcurrentUpdateError otherwise, see also objects.bulk_update_optimistic().
+    Objects loaded without last_updated_at are saved without the check.
+
+    Set use_outbox = True on a subclass to append an OutboxEntry for every row
+    created, updated or deleted by save(), delete(), bulk_create(), update(),
+    bulk_update(), bulk_upsert() and bulk_copy(), in the same transaction as
+    the write. Consume them with OutboxEntry.objects.consume().
+
+    List relations, or paths of relations, in touch_parents to touch the
+    parent rows they lead to when objects are saved, created, updated or
+    deleted, or when a many-to-many relation in touch_parents changes, e.g.
+    touch_parents = ["book"] on a price. The parents written in a transaction
+    are collected and touched together once it is committed.
+
+    save(), update(), bulk_create() and bulk_update() calls made within
+    instrumentation.instrument(), or WriteInstrumentationMiddleware, are
+    counted and timed per model.
     """
 
-    created_at = models.DateTimeField(_("created timestamp"), auto_now_add=True)
-    last_updated_at = models.DateTimeField(_("last update timestamp"), auto_now=True)
+    created_at = CreatedUpdatedTimestampField(_("created timestamp"), auto_now_add=True)
+    last_updated_at = CreatedUpdatedTimestampField(
+        _("last update timestamp"), auto_now=True
+    )
+
+    use_database_timestamps = False
+    timestamp_indexes: Sequence[Union[str, TimestampIndex]] = ()
+    track_changes = False
+    cache_instances = False
+    cache_alias = DEFAULT_CACHE_ALIAS
+    cache_timeout = DEFAULT_TIMEOUT
+    partition_interval: Optional[str] = None
+    retention_period: Optional[timedelta] = None
+    retention_archive: Optional[str] = None
+    keep_history = False
+    bulk_signals_on_commit = False
+    use_outbox = False
+    optimistic_locking = False
+    touch_parents: Sequence[str] = ()
 
     objects = CreateUpdateTimestampManager()
 
     class Meta:
         abstract = True
         get_latest_by = "last_updated_at"
+
+    @classmethod
+    def from_db(
+        cls, db: Optional[str], field_names: Sequence[str], values: Sequence[Any]
+    ) -> "CreatedUpdatedTimestampModel":
+        instance = super().from_db(db, field_names, values)
+        if cls.track_changes:
+            # Keyed by attname, only the fields which were actually loaded.
+            instance._loaded_values = {
+                name: _copy_loaded_value(value)
+                for name, value in zip(field_names, values)
+            }
+        if cls.optimistic_locking and "last_updated_at" in field_names:
+            instance._loaded_version = values[field_names.index("last_updated_at")]
+        return instance
+
+    def _snapshot(self, fields: Optional[Iterable[str]] = None) -> None:
+        """
+        Record the current values of fields (all loaded fields by default) as
+        the values stored in the database.
+        """
+        if fields is None:
+            attnames = [f.attname for f in self._meta.concrete_fields]
+        else:
+            attnames = [self._meta.get_field(name).attname for name in fields]
+        loaded_values = self.__dict__.setdefault("_loaded_values", {})
+        for attname in attnames:
+            if attname in self.__dict__:
+                loaded_values[attname] = _copy_loaded_value(self.__dict__[attname])
+
+    def get_dirty_fields(self) -> Dict[str, Any]:
+        """
+        Map the name of every field changed since the object was loaded or
+        saved to its previous value. Fields with no recorded value, e.g. all
+        fields of an unsaved object, count as changed with a previous value of
+        None. created_at and last_updated_at are never reported.
+        """
+        loaded_values = getattr(self, "_loaded_values", {})
+        dirty_fields = {}
+        for field in self._meta.concrete_fields:
+            if field.name in TIMESTAMP_FIELDS or field.attname not in self.__dict__:
+                continue
+            value = self.__dict__[field.attname]
+            if field.attname not in loaded_values:
+                dirty_fields[field.name] = None
+            elif value != loaded_values[field.attname]:
+                dirty_fields[field.name] = loaded_values[field.attname]
+        return dirty_fields
+
+    @property
+    def has_changed(self) -> bool:
+        """Whether any field changed since the object was loaded or saved."""
+        return bool(self.get_dirty_fields())
+
+    def save(
+        self,
+        force_insert: bool = False,
+        force_update: bool = False,
+        using: Optional[str] = None,
+        update_fields: Optional[Iterable[str]] = None,
+    ) -> None:
+        if (
+            self.track_changes
+            and update_fields is None
+            and not force_insert
+            and not self._state.adding
+            and (using is None or using == self._state.db)
+        ):
+            dirty_fields = self.get_dirty_fields()
+            if not dirty_fields:
+                return
+            if self._meta.pk.name not in dirty_fields:
+                # Only the changed fields are written by _do_update(). Django
+                # still gets no update_fields, so that a deleted row is
+                # inserted again, as with a plain save().
+                self._changed_fields = [*dirty_fields, "last_updated_at"]
+        try:
+            self._save(force_insert, force_update, using, update_fields)
+        finally:
+            self.__dict__.pop("_changed_fields", None)
+
+    def _save(
+        self,
+        force_insert: bool,
+        force_update: bool,
+        using: Optional[str],
+        update_fields: Optional[Iterable[str]],
+    ) -> None:
+        if self.use_outbox or self.optimistic_locking:
+            using = using or router.db_for_write(type(self), instance=self)
+            operation = OutboxEntry.CREATE if self._state.adding else OutboxEntry.UPDATE
+            # With optimistic_locking, the savepoint keeps an outer transaction
+            # usable after a ConcurrentUpdateError.
+            with transaction.atomic(using=using, savepoint=self.optimistic_locking):
+                super().save(
+                    force_insert=force_insert,
+                    force_update=force_update,
+                    using=using,
+                    update_fields=update_fields,
+                )
+                if self.use_outbox:
+                    outbox.write_outbox(
+                        type(self),
+                        using,
+                        operation,
+                        [self.pk],
+                        (
+                            update_fields or self.__dict__.get("_changed_fields")
+                            if operation == OutboxEntry.UPDATE
+                            else None
+                        ),
+                    )
+        else:
+            super().save(
+                force_insert=force_insert,
+                force_update=force_update,
+                using=using,
+                update_fields=update_fields,
+            )
+        if self.use_database_timestamps:
+            _clear_timestamp_expressions(self)
+        if self.optimistic_locking:
+            self._update_loaded_version(using)
+        if self.track_changes:
+            self._snapshot(update_fields)
+        if self.cache_instances:
+            cache.invalidate_instance(self, using=using or self._state.db)
+
+    def _update_loaded_version(self, using: Optional[str]) -> None:
+        """Record last_updated_at after a write as the version of the object."""
+        if "last_updated_at" in self.__dict__:
+            self._loaded_version = self.last_updated_at
+        else:
+            # Set by the database and not returned.
+            self.refresh_from_db(using=using, fields=["last_updated_at"])
+
+    def touch(
+        self, timestamp: Optional[datetime] = None, touch_related: Sequence[str] = ()
+    ) -> None:
+        """
+        Set last_updated_at of this object to timestamp, or the current time,
+        without saving its other fields. See CreatedUpdatedTimestampQuerySet.touch().
+
+        With optimistic_locking, ConcurrentUpdateError is raised if the row
+        was changed or deleted since the object was loaded, like save().
+        """
+        if self.pk is None:
+            raise ValueError(
+                "%s object can't be touched because its primary key is not set."
+                % type(self).__name__
+            )
+        queryset = type(self)._default_manager.using(self._state.db)
+        if timestamp is None:
+            timestamp = queryset._get_update_timestamp()
+        version = self.__dict__.get("_loaded_version")
+        if self.optimistic_locking and version is not None:
+            rows = queryset.filter(pk=self.pk, last_updated_at=version).touch(
+                timestamp=timestamp, touch_related=touch_related
+            )
+            if not rows:
+                raise ConcurrentUpdateError(
+                    "%s %s was changed or deleted since it was loaded."
+                    % (type(self).__name__, self.pk),
+                    [self.pk],
+                )
+        else:
+            queryset.touch([self.pk], timestamp, touch_related)
+        self.last_updated_at = timestamp
+        if self.use_database_timestamps:
+            _clear_timestamp_expressions(self)
+        if self.optimistic_locking:
+            self._update_loaded_version(self._state.db)
+
+    @instrumented("save", lambda result: 1)
+    def save_base(self, *args: Any, **kwargs: Any) -> None:
+        super().save_base(*args, **kwargs)
+
+    def _do_update(
+        self,
+        base_qs: models.QuerySet,
+        using: str,
+        pk_val: Any,
+        values: Sequence[Tuple[models.Field, Any, Any]],
+        update_fields: Optional[Iterable[str]],
+        forced_update: bool,
+    ) -> bool:
+        opts = base_qs.model._meta
+        version = None
+        # Only checked on the table holding last_updated_at. With multi-table
+        # inheritance, child tables are written after it was changed.
+        if (
+            self.optimistic_locking
+            and opts.get_field("last_updated_at") in opts.local_fields
+        ):
+            version = self.__dict__.get("_loaded_version")
+        if version is not None:
+            base_qs = base_qs.filter(last_updated_at=version)
+        changed_fields = self.__dict__.get("_changed_fields")
+        if changed_fields is not None:
+            values = [value for value in values if value[0].name in changed_fields]
+        with history.record_history(
+            type(self), using, lambda: [pk_val], [field.name for field, *_ in values]
+        ):
+            updated = super()._do_update(
+                base_qs, using, pk_val, values, update_fields, forced_update
+            )
+        if version is not None and not updated:
+            raise ConcurrentUpdateError(
+                "%s %s was changed or deleted since it was loaded."
+                % (type(self).__name__, pk_val),
+                [pk_val],
+            )
+        return updated
+
+    def as_of(self, timestamp: datetime) -> Optional["CreatedUpdatedTimestampModel"]:
+        """
+        This object as it was at timestamp, or None if it did not exist yet.
+        See CreatedUpdatedTimestampQuerySet.as_of().
+        """
+        return (
+            type(self)
+            ._default_manager.using(self._state.db)
+            .filter(pk=self.pk)
+            .as_of(timestamp)
+            .first()
+        )
+
+    def refresh_from_db(
+        self, using: Optional[str] = None, fields: Optional[Sequence[str]] = None
+    ) -> None:
+        super().refresh_from_db(using=using, fields=fields)
+        if self.track_changes:
+            self._snapshot(fields)
+        if self.optimistic_locking and (fields is None or "last_updated_at" in fields):
+            self._loaded_version = self.last_updated_at
+
+
+def add_timestamp_indexes(sender: type, **kwargs: Any) -> None:
+    """
+    Add the indexes declared in timestamp_indexes of a CreatedUpdatedTimestampModel
+    subclass to its Meta.indexes, so they are picked up by migrations.
+    """
+    if not issubclass(sender, CreatedUpdatedTimestampModel) or sender._meta.abstract:
+        return
+    local_field_names = {field.name for field in sender._meta.local_fields}
+    indexes = []
+    for timestamp_index in sender.timestamp_indexes:
+        if isinstance(timestamp_index, str):
+            timestamp_index = TimestampIndex(timestamp_index)
+        # Fields inherited from a concrete parent are indexed on the parent.
+        if timestamp_index.field in local_field_names:
+            indexes.append(timestamp_index.get_index(sender))
+    if indexes:
+        # Copy rather than extend, the list may be shared with a parent's Meta.
+        sender._meta.indexes = [*sender._meta.indexes, *indexes]
+        # Migrations only serialize options found in original_attrs.
+        sender._meta.original_attrs["indexes"] = sender._meta.indexes
+
+
+class_prepared.connect(add_timestamp_indexes)
+
+
+def connect_outbox(sender: type, **kwargs: Any) -> None:
+    """
+    Record the deletions of CreatedUpdatedTimestampModel subclasses with
+    use_outbox.
+    """
+    if (
+        issubclass(sender, CreatedUpdatedTimestampModel)
+        and not sender._meta.abstract
+        and sender.use_outbox
+    ):
+        post_delete.connect(
+            outbox.write_delete_outbox,
+            sender=sender,
+            dispatch_uid="outbox_%s" % sender._meta.label_lower,
+        )
+
+
+class_prepared.connect(connect_outbox)
+
+
+def _invalidate_deleted_instance(
+    sender: type, instance: "CreatedUpdatedTimestampModel", using: str, **kwargs: Any
+) -> None:
+    """
+    post_delete receiver of models with cache_instances. Receivers disable
+    Django's fast deletes, so rows deleted by cascades are seen.
+    """
+    cache.invalidate_instance(instance, using=using)
+
+
+def connect_cache(sender: type, **kwargs: Any) -> None:
+    """
+    Invalidate the cached instances of CreatedUpdatedTimestampModel subclasses
+    with cache_instances when they are deleted, including by a cascade.
+    """
+    if (
+        issubclass(sender, CreatedUpdatedTimestampModel)
+        and not sender._meta.abstract
+        and sender.cache_instances
+    ):
+        post_delete.connect(
+            _invalidate_deleted_instance,
+            sender=sender,
+            dispatch_uid="cache_instances_%s" % sender._meta.label_lower,
+        )
+
+
+class_prepared.connect(connect_cache)
+
+
+def connect_touch_parents(sender: type, **kwargs: Any) -> None:
+    """
+    Touch the parents of saved and deleted objects of CreatedUpdatedTimestampModel
+    subclasses with touch_parents. M2M changes are handled by
+    propagation.touch_parents_on_m2m_changed.
+    """
+    if (
+        issubclass(sender, CreatedUpdatedTimestampModel)
+        and not sender._meta.abstract
+        and sender.touch_parents
+    ):
+        uid = "touch_parents_%s" % sender._meta.label_lower
+        pre_save.connect(propagation.read_old_parents, sender=sender, dispatch_uid=uid)
+        post_save.connect(
+            propagation.touch_parents_on_write, sender=sender, dispatch_uid=uid
+        )
+        pre_delete.connect(
+            propagation.touch_parents_on_write, sender=sender, dispatch_uid=uid
+        )
+
+
+class_prepared.connect(connect_touch_parents)
+
+
+class FieldChangeEncoder(DjangoJSONEncoder):
+    """
+    DjangoJSONEncoder keeping the microseconds of datetimes and times.
+    """
+
+    def default(self, o: Any) -> Any:
+        if isinstance(o, (datetime, datetime_time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+class FieldChange(models.Model):
+    """
+    Previous value of one field of a keep_history model, replaced at
+    changed_at. Values are stored as a one item JSON list, so None is kept.
+    """
+
+    model = models.CharField(max_length=100)
+    object_id = models.CharField(max_length=255)
+    field = models.CharField(max_length=255)
+    changed_at = models.DateTimeField()
+    old_value = models.JSONField(encoder=FieldChangeEncoder)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["model", "object_id", "field", "changed_at"],
+                name="fieldchange_lookup_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return "%s %s.%s at %s" % (
+            self.model,
+            self.object_id,
+            self.field,
+            self.changed_at,
+        )
+
+
+class OutboxEntryQuerySet(models.QuerySet):
+    """
+    QuerySet of OutboxEntry, with the consumer API.
+    """
+
+    def for_model(self, model: type) -> "OutboxEntryQuerySet":
+        return self.filter(model=model._meta.label_lower)
+
+    def ack(self, entries: Iterable["OutboxEntry"]) -> int:
+        """
+        Acknowledge entries, deleting them. Return the number deleted.
+        """
+        return (
+            self.model._base_manager.using(self.db)
+            .filter(pk__in=[entry.pk for entry in entries])
+            ._raw_delete(self.db)
+        )
+
+    ack.alters_data = True
+
+    def consume(
+        self, batch_size: int = DEFAULT_BULK_BATCH_SIZE
+    ) -> Iterator[List["OutboxEntry"]]:
+        """
+        Yield the entries of the queryset in batches, in sequence order. A
+        batch is acknowledged when the next one is requested, so entries are
+        delivered again if the consumer fails before finishing a batch.
+
+        Entries committed late by a concurrent transaction may have a lower
+        sequence than entries already consumed. They are not skipped, as each
+        batch reads the remaining entries again. Changes of a single row are
+        always in order, its writers being serialized by the row lock.
+        """
+        while True:
+            batch = list(self.order_by("pk")[:batch_size])
+            if not batch:
+                return
+            yield batch
+            self.ack(batch)
+
+
+class OutboxEntry(models.Model):
+    """
+    A row of a use_outbox model created, updated or deleted. The primary key
+    gives the order of the changes. fields lists the fields written by an
+    update, or is None when all fields may have changed.
+    """
+
+    CREATE = outbox.CREATE
+    UPDATE = outbox.UPDATE
+    DELETE = outbox.DELETE
+    OPERATION_CHOICES = [(CREATE, "create"), (UPDATE, "update"), (DELETE, "delete")]
+
+    model = models.CharField(max_length=100)
+    object_id = models.CharField(max_length=255)
+    operation = models.CharField(max_length=6, choices=OPERATION_CHOICES)
+    fields = models.JSONField(null=True, blank=True)
+
+    objects = OutboxEntryQuerySet.as_manager()
+
+    def __str__(self) -> str:
+        return "%s %s.%s" % (self.operation, self.model, self.object_id)
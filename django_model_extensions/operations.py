@@ -0,0 +1,162 @@
+from datetime import date, datetime
+from typing import Any, Union
+
+from django.db.migrations.operations.base import Operation
+from django.db.migrations.operations.models import (
+    CreateModel,
+    DeleteModel,
+    ModelOperation,
+)
+
+from .partitioning import (
+    PARTITION_INTERVALS,
+    create_partitioned_table,
+    get_create_partition_sql,
+    partition_name,
+    partition_start,
+)
+
+
+def _check_interval(interval: str) -> None:
+    if interval not in PARTITION_INTERVALS:
+        raise ValueError(
+            "partition_interval must be one of %s, not %r."
+            % (", ".join(PARTITION_INTERVALS), interval)
+        )
+
+
+class CreatePartitionedModel(CreateModel):
+    """
+    CreateModel for a CreatedUpdatedTimestampModel subclass with a
+    partition_interval. On PostgreSQL, the table is created partitioned by
+    range of created_at. Other backends create a regular table.
+
+    makemigrations generates a CreateModel, to be replaced by this operation
+    with the partition_interval of the model.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fields: Any,
+        partition_interval: str = "month",
+        options: Any = None,
+        bases: Any = None,
+        managers: Any = None,
+    ) -> None:
+        _check_interval(partition_interval)
+        self.partition_interval = partition_interval
+        super().__init__(name, fields, options=options, bases=bases, managers=managers)
+
+    def deconstruct(self):
+        name, args, kwargs = super().deconstruct()
+        kwargs["partition_interval"] = self.partition_interval
+        return name, args, kwargs
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+        if schema_editor.connection.vendor == "postgresql":
+            create_partitioned_table(schema_editor, model)
+        else:
+            schema_editor.create_model(model)
+
+    def describe(self):
+        return "Create model %s partitioned by %s" % (
+            self.name,
+            self.partition_interval,
+        )
+
+    def reduce(self, operation, app_label):
+        # Only deletion is optimized, other operations would be folded into
+        # a regular CreateModel.
+        if (
+            isinstance(operation, DeleteModel)
+            and self.name_lower == operation.name_lower
+        ):
+            return []
+        return ModelOperation.reduce(self, operation, app_label)
+
+
+class AddTimestampPartitions(Operation):
+    """
+    Create count partitions of a model created by CreatePartitionedModel,
+    starting with the partition containing start. Does nothing on backends
+    other than PostgreSQL.
+    """
+
+    reversible = True
+
+    def __init__(
+        self,
+        model_name: str,
+        start: Union[date, datetime, str],
+        count: int = 1,
+        partition_interval: str = "month",
+    ) -> None:
+        _check_interval(partition_interval)
+        self.model_name = model_name
+        self.start = start
+        self.count = count
+        self.partition_interval = partition_interval
+
+    def deconstruct(self):
+        kwargs = {"model_name": self.model_name, "start": self.start}
+        if self.count != 1:
+            kwargs["count"] = self.count
+        if self.partition_interval != "month":
+            kwargs["partition_interval"] = self.partition_interval
+        return self.__class__.__name__, [], kwargs
+
+    def state_forwards(self, app_label, state):
+        pass
+
+    def _get_starts(self):
+        start = self.start
+        if isinstance(start, str):
+            start = datetime.fromisoformat(start)
+        return [
+            partition_start(start, self.partition_interval, offset)
+            for offset in range(self.count)
+        ]
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        connection = schema_editor.connection
+        if connection.vendor != "postgresql" or not self.allow_migrate_model(
+            connection.alias, model
+        ):
+            return
+        for start in self._get_starts():
+            schema_editor.execute(
+                get_create_partition_sql(
+                    connection, model._meta.db_table, start, self.partition_interval
+                )
+            )
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        model = from_state.apps.get_model(app_label, self.model_name)
+        connection = schema_editor.connection
+        if connection.vendor != "postgresql" or not self.allow_migrate_model(
+            connection.alias, model
+        ):
+            return
+        for start in self._get_starts():
+            schema_editor.execute(
+                "DROP TABLE IF EXISTS %s"
+                % schema_editor.quote_name(
+                    partition_name(model._meta.db_table, start, self.partition_interval)
+                )
+            )
+
+    def describe(self):
+        return "Add %s %s partition(s) to %s" % (
+            self.count,
+            self.partition_interval,
+            self.model_name,
+        )
+
+    @property
+    def migration_name_fragment(self):
+        return "%s_partitions" % self.model_name.lower()
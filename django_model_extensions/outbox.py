@@ -0,0 +1,66 @@
+from contextlib import contextmanager
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from django.apps import apps
+from django.db import models, transaction
+
+# OutboxEntry objects created per query.
+BATCH_SIZE = 1000
+
+# Operations of OutboxEntry.
+CREATE = "create"
+UPDATE = "update"
+DELETE = "delete"
+
+
+def write_outbox(
+    model: type,
+    using: str,
+    operation: str,
+    pks: Iterable[Any],
+    fields: Optional[Iterable[str]] = None,
+) -> None:
+    """
+    Append an OutboxEntry for each of pks, with one INSERT per batch.
+    """
+    OutboxEntry = apps.get_model("django_model_extensions", "OutboxEntry")
+    label = model._meta.label_lower
+    if fields is not None:
+        fields = [model._meta.get_field(name).name for name in fields]
+    OutboxEntry.objects.using(using).bulk_create(
+        [
+            OutboxEntry(
+                model=label, object_id=str(pk), operation=operation, fields=fields
+            )
+            for pk in pks
+        ],
+        batch_size=BATCH_SIZE,
+    )
+
+
+@contextmanager
+def record_outbox(
+    model: type, using: str, pks: Callable[[], Iterable[Any]], fields: Iterable[str]
+) -> Iterator[None]:
+    """
+    Append an "update" OutboxEntry for each row with primary keys pks()
+    written by the wrapped write, in the same transaction. Does nothing unless
+    model has use_outbox.
+    """
+    if not getattr(model, "use_outbox", False):
+        yield
+        return
+    with transaction.atomic(using=using, savepoint=False):
+        pks = pks()
+        yield
+        write_outbox(model, using, UPDATE, pks, fields)
+
+
+def write_delete_outbox(
+    sender: type, instance: models.Model, using: str, **kwargs: Any
+) -> None:
+    """
+    post_delete receiver of models with use_outbox. Receivers disable Django's
+    fast deletes, so rows deleted by cascades and QuerySet.delete() are seen.
+    """
+    write_outbox(sender, using, DELETE, [instance.pk])
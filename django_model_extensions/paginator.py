@@ -0,0 +1,172 @@
+from math import ceil
+from typing import Any, Iterator, List, Optional
+
+from django.core.paginator import EmptyPage, InvalidPage, Page, PageNotAnInteger
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+
+from .cursors import InvalidCursor, decode_cursor, encode_cursor, seek
+
+NEXT = "n"
+PREVIOUS = "p"
+
+
+class KeysetPage(Page):
+    """
+    A page of a KeysetPaginator. number is the cursor the page was requested
+    with (None for the first page), and next_page_number/previous_page_number
+    return cursors instead of integers. As a page does not know its position
+    in the whole list, start_index/end_index are 1-based indexes within the
+    page.
+    """
+
+    def __init__(
+        self,
+        object_list: List[Any],
+        number: Optional[str],
+        paginator: "KeysetPaginator",
+        has_next: bool,
+        has_previous: bool,
+    ) -> None:
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self) -> str:
+        return "<KeysetPage %s>" % (self.number or "first")
+
+    def has_next(self) -> bool:
+        return self._has_next
+
+    def has_previous(self) -> bool:
+        return self._has_previous
+
+    def next_page_number(self) -> str:
+        if not self.has_next():
+            raise EmptyPage(_("That page contains no results"))
+        return self.paginator.get_cursor(self.object_list[-1], NEXT)
+
+    def previous_page_number(self) -> str:
+        if not self.has_previous():
+            raise EmptyPage(_("That page contains no results"))
+        return self.paginator.get_cursor(self.object_list[0], PREVIOUS)
+
+    def start_index(self) -> int:
+        """
+        Return the 1-based index of the first object within the page, 0 for an
+        empty page.
+        """
+        return 1 if self.object_list else 0
+
+    def end_index(self) -> int:
+        """Return the 1-based index of the last object within the page."""
+        return len(self.object_list)
+
+
+class KeysetPaginator:
+    """
+    Paginator seeking on (field, pk) instead of using LIMIT/OFFSET, so every
+    page costs the same regardless of how deep it is. Pages are addressed by
+    opaque cursors instead of page numbers:
+
+        paginator = KeysetPaginator(Book.objects.all(), 50)
+        page = paginator.get_page(request.GET.get("cursor"))
+        if page.has_next():
+            next_cursor = page.next_page_number()
+
+    Objects are ordered by field, newest first unless descending is False.
+    Index (field, pk) for best results, see TimestampIndex(with_pk=True).
+
+    The interface follows Paginator, except that pages have no numbers:
+    page_range and get_elided_page_range() raise TypeError, so templates
+    listing page numbers must link to the previous and next pages instead.
+    """
+
+    def __init__(
+        self,
+        object_list: QuerySet,
+        per_page: int,
+        field: str = "last_updated_at",
+        descending: bool = True,
+    ) -> None:
+        self.object_list = object_list
+        self.per_page = int(per_page)
+        self.field = field
+        self.descending = descending
+
+    def get_cursor(self, obj: Any, direction: str) -> str:
+        """Cursor of the page next to obj in the given direction."""
+        return "%s.%s" % (direction, encode_cursor(getattr(obj, self.field), obj.pk))
+
+    def _order(self, descending: bool) -> QuerySet:
+        prefix = "-" if descending else ""
+        return self.object_list.order_by(prefix + self.field, prefix + "pk")
+
+    def validate_number(self, number: Optional[str]) -> Optional[str]:
+        """Validate the given cursor, None being the first page."""
+        if number is None:
+            return None
+        direction, _sep, token = str(number).partition(".")
+        if direction not in (NEXT, PREVIOUS):
+            raise PageNotAnInteger(_("That page number is not a valid cursor"))
+        try:
+            decode_cursor(token)
+        except InvalidCursor:
+            raise PageNotAnInteger(_("That page number is not a valid cursor"))
+        return number
+
+    def get_page(self, number: Optional[str]) -> KeysetPage:
+        """
+        Return a valid page, falling back to the first page for an invalid or
+        out of range cursor.
+        """
+        try:
+            page = self.page(number)
+        except InvalidPage:
+            return self.page(None)
+        if number is not None and not page.object_list:
+            return self.page(None)
+        return page
+
+    def page(self, number: Optional[str]) -> KeysetPage:
+        """Return a KeysetPage for the given cursor, None for the first page."""
+        number = self.validate_number(number)
+        if number is None:
+            objs = list(self._order(self.descending)[: self.per_page + 1])
+            has_next = len(objs) > self.per_page
+            return KeysetPage(objs[: self.per_page], number, self, has_next, False)
+
+        direction, _sep, token = number.partition(".")
+        timestamp, pk = decode_cursor(token)
+        # Previous pages are read in reverse order and flipped back.
+        descending = self.descending != (direction == PREVIOUS)
+        queryset = seek(self._order(descending), self.field, timestamp, pk, descending)
+        objs = list(queryset[: self.per_page + 1])
+        has_more = len(objs) > self.per_page
+        objs = objs[: self.per_page]
+        if direction == PREVIOUS:
+            objs.reverse()
+            return KeysetPage(objs, number, self, True, has_more)
+        return KeysetPage(objs, number, self, has_more, True)
+
+    @cached_property
+    def count(self) -> int:
+        """Return the total number of objects, across all pages."""
+        return self.object_list.count()
+
+    @cached_property
+    def num_pages(self) -> int:
+        """Return the total number of pages."""
+        return max(ceil(self.count / self.per_page), 1)
+
+    @property
+    def page_range(self) -> range:
+        raise TypeError(
+            "KeysetPaginator pages are addressed by cursors and have no page "
+            "numbers, use page.next_page_number() and "
+            "page.previous_page_number() instead."
+        )
+
+    def get_elided_page_range(self, *args: Any, **kwargs: Any) -> Iterator[Any]:
+        return self.page_range
@@ -0,0 +1,222 @@
+import re
+from datetime import date, datetime, timedelta
+from datetime import timezone as dt_timezone
+from typing import Any, List, NamedTuple, Optional, Tuple, Union
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS, NotSupportedError, connections
+from django.utils import timezone
+
+PARTITION_INTERVALS = ("day", "month")
+PARTITION_FIELD = "created_at"
+
+
+class Partition(NamedTuple):
+    name: str
+    start: datetime
+    end: datetime
+
+
+def get_partition_interval(model: type) -> str:
+    """
+    The partition_interval of a CreatedUpdatedTimestampModel subclass.
+    """
+    interval = getattr(model, "partition_interval", None)
+    if interval not in PARTITION_INTERVALS:
+        raise ImproperlyConfigured(
+            "%s.partition_interval must be one of %s, not %r."
+            % (model.__name__, ", ".join(PARTITION_INTERVALS), interval)
+        )
+    return interval
+
+
+def partition_bounds(
+    timestamp: Union[date, datetime], interval: str
+) -> Tuple[datetime, datetime]:
+    """
+    Start (inclusive) and end (exclusive) in UTC of the partition of interval
+    ("day" or "month") containing timestamp.
+    """
+    if interval not in PARTITION_INTERVALS:
+        raise ValueError(
+            "interval must be one of %s, not %r."
+            % (", ".join(PARTITION_INTERVALS), interval)
+        )
+    if not isinstance(timestamp, datetime):
+        timestamp = datetime(timestamp.year, timestamp.month, timestamp.day)
+    if timezone.is_aware(timestamp):
+        timestamp = timestamp.astimezone(dt_timezone.utc)
+    start = datetime(
+        timestamp.year, timestamp.month, timestamp.day, tzinfo=dt_timezone.utc
+    )
+    if interval == "day":
+        return start, start + timedelta(days=1)
+    start = start.replace(day=1)
+    if start.month == 12:
+        return start, start.replace(year=start.year + 1, month=1)
+    return start, start.replace(month=start.month + 1)
+
+
+def partition_start(
+    timestamp: Union[date, datetime], interval: str, offset: int = 0
+) -> datetime:
+    """
+    Start of the partition offset intervals after (or before, when negative)
+    the partition containing timestamp.
+    """
+    start = partition_bounds(timestamp, interval)[0]
+    for _ in range(abs(offset)):
+        if offset > 0:
+            start = partition_bounds(start, interval)[1]
+        else:
+            start = partition_bounds(start - timedelta(days=1), interval)[0]
+    return start
+
+
+def partition_name(table: str, start: datetime, interval: str) -> str:
+    """
+    Name of the partition of table starting at start, e.g. "app_event_p202610".
+    """
+    return "%s_p%s" % (table, start.strftime("%Y%m%d" if interval == "day" else "%Y%m"))
+
+
+def _check_connection(connection: Any) -> None:
+    if connection.vendor != "postgresql":
+        raise NotSupportedError("Table partitioning is only supported on PostgreSQL.")
+
+
+def create_partitioned_table(schema_editor: Any, model: type) -> None:
+    """
+    Create the table of model as a parent table partitioned by range of
+    created_at. The primary key becomes (pk, created_at), as PostgreSQL requires
+    the partition key in every unique constraint.
+    """
+    opts = model._meta
+    if (
+        any(field.unique and not field.primary_key for field in opts.local_fields)
+        or opts.unique_together
+        or opts.local_many_to_many
+    ):
+        raise ValueError(
+            "Partitioned model %s cannot have unique fields, unique_together or "
+            "many-to-many fields."
+            % model.__name__
+        )
+    qn = schema_editor.quote_name
+    pk = opts.pk
+    column = qn(opts.get_field(PARTITION_FIELD).column)
+    schema_editor.sql_create_table = (
+        "CREATE TABLE %%(table)s (%%(definition)s, PRIMARY KEY (%s, %s)) "
+        "PARTITION BY RANGE (%s)" % (qn(pk.column), column, column)
+    )
+    pk.primary_key = False
+    try:
+        schema_editor.create_model(model)
+    finally:
+        pk.primary_key = True
+        del schema_editor.sql_create_table
+
+
+def get_create_partition_sql(
+    connection: Any, table: str, start: datetime, interval: str
+) -> str:
+    """
+    SQL creating the partition of table starting at start, unless it exists.
+    """
+    start, end = partition_bounds(start, interval)
+    qn = connection.ops.quote_name
+    return (
+        "CREATE TABLE IF NOT EXISTS %s PARTITION OF %s FOR VALUES FROM ('%s') TO ('%s')"
+        % (
+            qn(partition_name(table, start, interval)),
+            qn(table),
+            start.isoformat(),
+            end.isoformat(),
+        )
+    )
+
+
+def get_partitions(model: type, using: str = DEFAULT_DB_ALIAS) -> List[Partition]:
+    """
+    Partitions of model, oldest first. Only partitions named by
+    partition_name() are listed.
+    """
+    connection = connections[using]
+    _check_connection(connection)
+    interval = get_partition_interval(model)
+    table = model._meta.db_table
+    pattern = re.compile(r"^%s_p(\d{8}|\d{6})$" % re.escape(table))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = %s::regclass",
+            [connection.ops.quote_name(table)],
+        )
+        names = [name for (name,) in cursor.fetchall()]
+    partitions = []
+    for name in names:
+        match = pattern.match(name)
+        if match is None:
+            continue
+        suffix = match.group(1)
+        start = datetime.strptime(
+            suffix if len(suffix) == 8 else suffix + "01", "%Y%m%d"
+        )
+        partitions.append(Partition(name, *partition_bounds(start, interval)))
+    return sorted(partitions, key=lambda partition: partition.start)
+
+
+def create_partitions(
+    model: type,
+    ahead: int = 1,
+    start: Optional[datetime] = None,
+    using: str = DEFAULT_DB_ALIAS,
+) -> List[str]:
+    """
+    Create the partition of model containing start (default: now) and the
+    ahead following ones, if they do not exist. Return their names.
+    """
+    connection = connections[using]
+    _check_connection(connection)
+    interval = get_partition_interval(model)
+    table = model._meta.db_table
+    start = start or timezone.now()
+    names = []
+    with connection.cursor() as cursor:
+        for offset in range(ahead + 1):
+            partition = partition_start(start, interval, offset)
+            cursor.execute(
+                get_create_partition_sql(connection, table, partition, interval)
+            )
+            names.append(partition_name(table, partition, interval))
+    return names
+
+
+def remove_partitions(
+    model: type,
+    before: datetime,
+    detach: bool = False,
+    using: str = DEFAULT_DB_ALIAS,
+) -> List[Partition]:
+    """
+    Drop the partitions of model only holding rows created before before, or
+    only detach them from the parent table with detach. Return them.
+    """
+    connection = connections[using]
+    partitions = [
+        partition
+        for partition in get_partitions(model, using)
+        if partition.end <= before
+    ]
+    qn = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        for partition in partitions:
+            if detach:
+                cursor.execute(
+                    "ALTER TABLE %s DETACH PARTITION %s"
+                    % (qn(model._meta.db_table), qn(partition.name))
+                )
+            else:
+                cursor.execute("DROP TABLE %s" % qn(partition.name))
+    return partitions
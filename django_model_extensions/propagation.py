@@ -0,0 +1,268 @@
+from contextvars import ContextVar
+from functools import partial
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from weakref import WeakKeyDictionary
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections, models, transaction
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.signals import m2m_changed
+
+# Primary keys per query reading parents.
+BATCH_SIZE = 1000
+
+
+def get_parent_model(model: type, path: str) -> type:
+    """
+    Model reached from model by path, an entry of its touch_parents.
+    """
+    parent = model
+    for name in path.split(LOOKUP_SEP):
+        field = parent._meta.get_field(name)
+        if not field.is_relation:
+            raise ImproperlyConfigured(
+                "%s.touch_parents: %s.%s is not a relation."
+                % (model.__name__, parent.__name__, name)
+            )
+        parent = field.related_model
+    # Only CreatedUpdatedTimestampModel subclasses have touch_parents.
+    if not hasattr(parent, "touch_parents"):
+        raise ImproperlyConfigured(
+            "%s.touch_parents: %r leads to %s, which has no last_updated_at."
+            % (model.__name__, path, parent.__name__)
+        )
+    return parent
+
+
+def read_parent_pks(model: type, using: str, path: str, pks: Sequence[Any]) -> Set[Any]:
+    parent_pks = set()
+    queryset = model._base_manager.using(using)
+    for start in range(0, len(pks), BATCH_SIZE):
+        parent_pks.update(
+            queryset.filter(pk__in=pks[start : start + BATCH_SIZE])
+            .values_list(path, flat=True)
+            .distinct()
+        )
+    parent_pks.discard(None)
+    return parent_pks
+
+
+# Parent rows to touch once the current transaction of each connection is
+# committed, along with the run_on_commit list of that transaction, which
+# Django replaces on commit and rollback.
+_pending_touches: "WeakKeyDictionary[Any, Tuple[list, Dict[type, Set[Any]]]]" = (
+    WeakKeyDictionary()
+)
+# Parent models being touched by _flush_parent_touches, which are not touched
+# again when reached through a cycle of touch_parents.
+_touching_parents: ContextVar[frozenset] = ContextVar(
+    "_touching_parents", default=frozenset()
+)
+
+
+def _flush_parent_touches(using: str, touches: Dict[type, Set[Any]]) -> None:
+    connection = connections[using]
+    if _pending_touches.get(connection, (None, None))[1] is touches:
+        del _pending_touches[connection]
+    token = _touching_parents.set(_touching_parents.get() | touches.keys())
+    try:
+        for parent, pks in touches.items():
+            parent._default_manager.db_manager(using).touch(pks)
+    finally:
+        _touching_parents.reset(token)
+
+
+def get_parent_touches(
+    model: type,
+    using: str,
+    objs: Optional[Sequence[models.Model]] = None,
+    queryset: Optional[models.QuerySet] = None,
+    paths: Optional[Iterable[str]] = None,
+    path_pks: Optional[Iterable[Any]] = None,
+    pks: Optional[Sequence[Any]] = None,
+) -> Dict[type, Set[Any]]:
+    """
+    Primary keys of the parents of objs, or of the rows of queryset, per
+    parent model, through paths (model.touch_parents by default). path_pks,
+    if given, are the primary keys of the first model of every path instead.
+    pks, if given, are the primary keys of rows of model whose parents are
+    read from the database.
+    """
+    touching = _touching_parents.get()
+    touches = {}
+    for path in model.touch_parents if paths is None else paths:
+        parent = get_parent_model(model, path)
+        if parent in touching:
+            continue
+        name, _, rest = path.partition(LOOKUP_SEP)
+        field = model._meta.get_field(name)
+        if path_pks is not None:
+            parent_pks = set(path_pks)
+            if rest:
+                parent_pks = read_parent_pks(
+                    field.related_model, using, rest, list(parent_pks)
+                )
+        elif pks is not None:
+            parent_pks = read_parent_pks(model, using, path, pks)
+        elif objs is None:
+            parents = queryset.order_by().values_list(path, flat=True).distinct()
+            # The rows of queryset are locked by the write itself, and
+            # FOR UPDATE cannot be combined with DISTINCT.
+            parents.query.select_for_update = False
+            parent_pks = set(parents)
+        elif not rest and field.many_to_one and field.concrete:
+            parent_pks = {getattr(obj, field.attname) for obj in objs}
+        else:
+            obj_pks = [obj.pk for obj in objs if obj.pk is not None]
+            parent_pks = read_parent_pks(model, using, path, obj_pks)
+        parent_pks.discard(None)
+        if parent_pks:
+            touches.setdefault(parent, set()).update(parent_pks)
+    return touches
+
+
+def get_moved_paths(model: type, fields: Optional[Iterable[str]] = None) -> List[str]:
+    """
+    Paths of model.touch_parents starting with a foreign key in fields (any
+    foreign key when fields is None), whose parents change with its value.
+    """
+    opts = model._meta
+    names = None if fields is None else {opts.get_field(name).name for name in fields}
+    paths = []
+    for path in model.touch_parents:
+        field = opts.get_field(path.split(LOOKUP_SEP, 1)[0])
+        if (
+            (field.many_to_one or field.one_to_one)
+            and field.concrete
+            and (names is None or field.name in names)
+        ):
+            paths.append(path)
+    return paths
+
+
+def merge_touches(touches: Dict[type, Set[Any]], other: Dict[type, Set[Any]]) -> None:
+    for parent, parent_pks in other.items():
+        touches.setdefault(parent, set()).update(parent_pks)
+
+
+def schedule_parent_touches(using: str, touches: Dict[type, Set[Any]]) -> None:
+    """
+    Touch the parent rows in touches once the current transaction commits.
+    The parents of all writes of a transaction are touched together, with one
+    UPDATE per parent model and batch of primary keys.
+    """
+    if not touches:
+        return
+    connection = connections[using]
+    if not connection.in_atomic_block:
+        _flush_parent_touches(using, touches)
+        return
+    run_on_commit, pending = _pending_touches.get(connection, (None, None))
+    if run_on_commit is not connection.run_on_commit:
+        pending = {}
+        _pending_touches[connection] = (connection.run_on_commit, pending)
+        transaction.on_commit(
+            partial(_flush_parent_touches, using, pending), using=using
+        )
+    merge_touches(pending, touches)
+
+
+def read_old_parents(
+    sender: type,
+    instance: models.Model,
+    using: str,
+    raw: bool = False,
+    update_fields: Optional[Iterable[str]] = None,
+    **kwargs: Any,
+) -> None:
+    """
+    pre_save receiver of models with touch_parents, reading the parents an
+    existing row may be moved away from, which are touched along with the new
+    ones. With track_changes, the loaded foreign keys are used instead.
+    """
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    loaded_values = instance.__dict__.get("_loaded_values", {})
+    touches = {}
+    for path in get_moved_paths(sender, update_fields):
+        field = sender._meta.get_field(path.split(LOOKUP_SEP, 1)[0])
+        if field.attname in loaded_values:
+            old_pk = loaded_values[field.attname]
+            if old_pk == getattr(instance, field.attname):
+                continue
+            other = get_parent_touches(sender, using, paths=[path], path_pks=[old_pk])
+        else:
+            other = get_parent_touches(sender, using, paths=[path], pks=[instance.pk])
+        merge_touches(touches, other)
+    instance._old_parent_touches = touches
+
+
+def touch_parents_on_write(
+    sender: type,
+    instance: models.Model,
+    using: str,
+    raw: bool = False,
+    **kwargs: Any,
+) -> None:
+    """
+    post_save and pre_delete receiver of models with touch_parents. Parents
+    reached through another relation than a foreign key are read before the
+    row is deleted.
+    """
+    old_touches = instance.__dict__.pop("_old_parent_touches", {})
+    if not raw:
+        touches = get_parent_touches(sender, using, [instance])
+        merge_touches(touches, old_touches)
+        schedule_parent_touches(using, touches)
+
+
+def touch_parents_on_m2m_changed(
+    sender: type,
+    instance: models.Model,
+    action: str,
+    reverse: bool,
+    model: type,
+    pk_set: Optional[Set[Any]],
+    using: str,
+    **kwargs: Any,
+) -> None:
+    """
+    m2m_changed receiver touching the parents of the model on either side of
+    the relation, when touch_parents follows it.
+    """
+    for child in {type(instance), model}:
+        for path in getattr(child, "touch_parents", ()):
+            name = path.split(LOOKUP_SEP, 1)[0]
+            field = child._meta.get_field(name)
+            if not field.many_to_many:
+                continue
+            # ManyToManyRel is the auto created reverse side of the relation.
+            through = (
+                field.through if field.auto_created else field.remote_field.through
+            )
+            if through is not sender:
+                continue
+            if isinstance(instance, child) and reverse == field.auto_created:
+                # The parents added to or removed from instance.
+                if action == "pre_clear":
+                    accessor = (
+                        field.get_accessor_name() if field.auto_created else field.name
+                    )
+                    pks = list(getattr(instance, accessor).values_list("pk", flat=True))
+                elif action in ("post_add", "post_remove"):
+                    pks = list(pk_set)
+                else:
+                    continue
+            elif action in ("post_add", "post_remove", "post_clear") and (
+                pk_set or action == "post_clear"
+            ):
+                # instance is the parent whose children changed.
+                pks = [instance.pk]
+            else:
+                continue
+            schedule_parent_touches(
+                using, get_parent_touches(child, using, paths=[path], path_pks=pks)
+            )
+
+
+m2m_changed.connect(touch_parents_on_m2m_changed, dispatch_uid="touch_parents")
@@ -0,0 +1,105 @@
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.apps import apps
+from django.db import connections
+from django.db.models import QuerySet
+from django.db.models.deletion import Collector
+from django.utils import timezone
+
+
+def get_retention_cutoff(model: type, now: Optional[datetime] = None) -> datetime:
+    """
+    Rows of model last updated before the returned timestamp are stale,
+    following its retention_period.
+    """
+    retention_period = getattr(model, "retention_period", None)
+    if retention_period is None:
+        raise ValueError("%s has no retention_period." % model.__name__)
+    return (now or timezone.now()) - retention_period
+
+
+def get_archive_model(model: type) -> Optional[type]:
+    """
+    The model named by the retention_archive ("app_label.ModelName") of model.
+    """
+    label = getattr(model, "retention_archive", None)
+    return apps.get_model(label) if label else None
+
+
+def archive_rows(queryset: QuerySet, archive_model: type) -> int:
+    """
+    Copy the rows of queryset to the table of archive_model with a single
+    "INSERT ... SELECT", keeping their values as they are. archive_model must
+    have a field named like each concrete field of the model, or like its
+    attname (e.g. an IntegerField "publication_id" for a ForeignKey).
+    """
+    using = queryset.db
+    connection = connections[using]
+    qn = connection.ops.quote_name
+    fields = queryset.model._meta.concrete_fields
+    archive_opts = archive_model._meta
+    columns = [qn(archive_opts.get_field(f.attname).column) for f in fields]
+    select_sql, params = (
+        queryset.order_by()
+        .values_list(*[f.attname for f in fields])
+        .query.get_compiler(using)
+        .as_sql()
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "INSERT INTO %s (%s) %s"
+            % (qn(archive_opts.db_table), ", ".join(columns), select_sql),
+            params,
+        )
+        return cursor.rowcount
+
+
+def delete_rows(queryset: QuerySet) -> Tuple[int, Dict[str, int]]:
+    """
+    Delete the rows of queryset with a single DELETE when no signal receivers,
+    cascades or generic relations apply to them. Otherwise fall back to
+    QuerySet.delete(), which collects the related rows and deletes them in
+    dependency order.
+    """
+    queryset = queryset.order_by()
+    if Collector(using=queryset.db).can_fast_delete(queryset):
+        deleted = queryset._raw_delete(queryset.db)
+        return deleted, {queryset.model._meta.label: deleted} if deleted else {}
+    return queryset.delete()
+
+
+def sort_by_dependencies(models: Iterable[type]) -> List[type]:
+    """
+    Sort models so that models with a foreign key to another one of models
+    come before it, e.g. Price before Book. Cycles keep their original order.
+    """
+    models = list(models)
+    remaining = {
+        model: {
+            field.related_model
+            for field in model._meta.get_fields()
+            if (field.one_to_many or field.one_to_one)
+            and field.auto_created
+            and not field.concrete
+            and field.related_model in models
+            and field.related_model is not model
+        }
+        for model in models
+    }
+    ordered = []
+    while remaining:
+        ready = [model for model, children in remaining.items() if not children]
+        if not ready:
+            ready = list(remaining)
+        for model in ready:
+            ordered.append(model)
+            del remaining[model]
+        for children in remaining.values():
+            children.difference_update(ready)
+    return ordered
+
+
+def merge_counts(total: Dict[str, int], counts: Dict[str, Any]) -> None:
+    for label, count in counts.items():
+        total[label] = total.get(label, 0) + count
@@ -0,0 +1,13 @@
+from django.dispatch import Signal
+
+# Sent by CreatedUpdatedTimestampQuerySet.update() and bulk_update(), once per
+# statement or batch, with the arguments:
+# - sender: the model class.
+# - pks: list of the primary keys of the rows written.
+# - fields: names of the fields written, including last_updated_at.
+# - timestamp: the new last_updated_at, or None when set by the database.
+# - using: the database alias.
+# post_bulk_update is sent once the transaction is committed when the model
+# sets bulk_signals_on_commit.
+pre_bulk_update = Signal()
+post_bulk_update = Signal()
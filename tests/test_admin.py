@@ -0,0 +1,68 @@
+from django.contrib.admin.sites import site
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from django_model_extensions.admin import CURSOR_VAR, get_estimated_count
+
+from .testapp.models import Book, Publication
+
+
+class TestTimestampedModelAdmin(TestCase):
+    """Test Cases for TimestampedModelAdmin"""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = User.objects.create_superuser("admin", "admin@example.com", "pw")
+        publication = Publication.objects.create(name="publication")
+        cls.books = [
+            Book.objects.create(title=f"book {i}", publication=publication)
+            for i in range(5)
+        ]
+
+    def setUp(self) -> None:
+        self.client.force_login(self.user)
+        self.model_admin = site._registry[Book]
+        self.model_admin.list_per_page = 2
+        self.url = reverse("admin:testapp_book_changelist")
+
+    def tearDown(self) -> None:
+        self.model_admin.list_per_page = 100
+
+    def get_pks(self, response):
+        return [obj.pk for obj in response.context["cl"].result_list]
+
+    def test_changelist_paginates_by_keyset(self):
+        expected = [book.pk for book in reversed(self.books)]
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        cl = response.context["cl"]
+        self.assertEqual(cl.result_count, 5)
+        self.assertEqual(self.get_pks(response), expected[:2])
+        self.assertIsNone(cl.previous_page_url)
+
+        response = self.client.get(self.url + cl.next_page_url)
+        cl = response.context["cl"]
+        self.assertEqual(self.get_pks(response), expected[2:4])
+        self.assertContains(response, cl.previous_page_url.replace("&", "&amp;"))
+        self.assertNotIn(CURSOR_VAR, cl.get_query_string())
+
+    def test_changelist_sorted_by_user_uses_page_numbers(self):
+        response = self.client.get(self.url, {"o": "2", "p": "2"})
+        cl = response.context["cl"]
+        self.assertIsNone(cl.keyset_page)
+        self.assertEqual(len(cl.result_list), 2)
+
+    def test_timestamps_are_readonly_fields(self):
+        response = self.client.get(
+            reverse("admin:testapp_book_change", args=(self.books[0].pk,))
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            self.model_admin.get_readonly_fields(response.wsgi_request),
+            ("created_at", "last_updated_at"),
+        )
+        self.assertContains(response, "Created timestamp")
+
+    def test_estimated_count_falls_back_to_count(self):
+        self.assertEqual(get_estimated_count(Book.objects.all(), 0), 5)
@@ -0,0 +1,96 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase
+
+from django_model_extensions import cache as cache_module
+
+from .testapp.models import CachedTestModel, Publication
+
+
+class TestCachedLookups(TestCase):
+    """Test Cases for cached_get and cached_in_bulk"""
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.objs = CachedTestModel.objects.bulk_create(
+            [CachedTestModel(name=str(i)) for i in range(3)]
+        )
+
+    def test_cached_get_reads_database_once(self):
+        pk = self.objs[0].pk
+        with self.assertNumQueries(1):
+            CachedTestModel.objects.cached_get(pk)
+        with self.assertNumQueries(0):
+            obj = CachedTestModel.objects.cached_get(pk)
+        self.assertEqual(obj.name, "0")
+
+    def test_cached_get_raises_does_not_exist(self):
+        with self.assertRaises(CachedTestModel.DoesNotExist):
+            CachedTestModel.objects.cached_get(0)
+
+    def test_save_and_delete_invalidate_instance(self):
+        obj = CachedTestModel.objects.cached_get(self.objs[0].pk)
+        obj.name = "new name"
+        obj.save()
+        self.assertEqual(
+            CachedTestModel.objects.cached_get(obj.pk).name,
+            "new name",
+        )
+        obj.delete()
+        with self.assertRaises(CachedTestModel.DoesNotExist):
+            CachedTestModel.objects.cached_get(obj.pk)
+
+    def test_cascade_delete_invalidates_instance(self):
+        publication = Publication.objects.create(name="publication")
+        obj = CachedTestModel.objects.create(name="child", publication=publication)
+        CachedTestModel.objects.cached_get(obj.pk)
+        publication.delete()
+        with self.assertRaises(CachedTestModel.DoesNotExist):
+            CachedTestModel.objects.cached_get(obj.pk)
+
+    def test_bulk_writes_invalidate_model(self):
+        pks = [obj.pk for obj in self.objs]
+        CachedTestModel.objects.cached_in_bulk(pks)
+        CachedTestModel.objects.filter(pk=pks[0]).update(name="updated")
+        self.assertEqual(CachedTestModel.objects.cached_get(pks[0]).name, "updated")
+
+        objs = list(CachedTestModel.objects.all())
+        for obj in objs:
+            obj.name = "bulk updated"
+        CachedTestModel.objects.bulk_update(objs, ["name"], strategy="values")
+        self.assertEqual(
+            {obj.name for obj in CachedTestModel.objects.cached_in_bulk(pks).values()},
+            {"bulk updated"},
+        )
+
+    def test_bulk_write_during_read_is_not_cached(self):
+        pk = self.objs[0].pk
+        set_instances = cache_module.set_instances
+
+        def update_then_set_instances(*args):
+            # A bulk write committed after the object was read.
+            CachedTestModel.objects.filter(pk=pk).update(name="new")
+            set_instances(*args)
+
+        with mock.patch.object(
+            cache_module, "set_instances", side_effect=update_then_set_instances
+        ):
+            self.assertEqual(CachedTestModel.objects.cached_get(pk).name, "0")
+        self.assertEqual(CachedTestModel.objects.cached_get(pk).name, "new")
+
+    def test_cached_in_bulk_only_queries_missing_objects(self):
+        pks = [obj.pk for obj in self.objs]
+        CachedTestModel.objects.cached_get(pks[0])
+        with self.assertNumQueries(1):
+            objs = CachedTestModel.objects.cached_in_bulk(pks)
+        self.assertEqual(sorted(objs), pks)
+        with self.assertNumQueries(0):
+            CachedTestModel.objects.cached_in_bulk(pks)
+
+    def test_cached_lookups_must_be_enabled(self):
+        with self.assertRaises(ImproperlyConfigured):
+            Publication.objects.cached_get(1)
+        with self.assertRaises(TypeError):
+            CachedTestModel.objects.filter(name="0").cached_get(1)
@@ -0,0 +1,19 @@
+from django.test import SimpleTestCase
+from django.utils import timezone
+
+from django_model_extensions.cursors import InvalidCursor, decode_cursor, encode_cursor
+
+
+class TestCursors(SimpleTestCase):
+    """Test Cases for keyset cursor encoding"""
+
+    def test_cursor_round_trip(self):
+        timestamp = timezone.now()
+        token = encode_cursor(timestamp, 42)
+        self.assertNotIn("=", token)
+        self.assertEqual(decode_cursor(token), (timestamp, 42))
+
+    def test_invalid_cursor_raises_error(self):
+        for token in ("", "not a cursor", encode_cursor(timezone.now(), 1)[:-3]):
+            with self.subTest(token=token), self.assertRaises(InvalidCursor):
+                decode_cursor(token)
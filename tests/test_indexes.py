@@ -0,0 +1,52 @@
+from django.db import connection
+from django.db.models import Index, Q
+from django.test import SimpleTestCase, TestCase
+
+from django_model_extensions.indexes import TimestampBrinIndex, TimestampIndex
+
+from .testapp.models import Book, CatalogueItem, Publication
+
+
+class TestTimestampIndexes(TestCase):
+    """Test Cases for timestamp_indexes of CreatedUpdatedTimestampModel"""
+
+    def get_index_columns(self, model):
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(
+                cursor, model._meta.db_table
+            )
+        return [
+            constraint["columns"]
+            for constraint in constraints.values()
+            if constraint["index"] and not constraint["unique"]
+        ]
+
+    def test_timestamp_indexes_are_added_to_meta(self):
+        self.assertEqual(
+            [(type(index), index.fields) for index in Book._meta.indexes],
+            [(Index, ["created_at"]), (Index, ["last_updated_at", "id"])],
+        )
+        self.assertEqual(
+            [type(index) for index in CatalogueItem._meta.indexes],
+            [TimestampBrinIndex, Index],
+        )
+        self.assertEqual(Publication._meta.indexes, [])
+
+    def test_timestamp_indexes_are_created_by_migrations(self):
+        index_columns = self.get_index_columns(Book)
+        self.assertIn(["created_at"], index_columns)
+        self.assertIn(["last_updated_at", "id"], index_columns)
+        # BRIN falls back to a regular index outside PostgreSQL.
+        self.assertIn(["created_at"], self.get_index_columns(CatalogueItem))
+
+
+class TestTimestampIndex(SimpleTestCase):
+    """Test Cases for TimestampIndex"""
+
+    def test_partial_index_requires_name(self):
+        with self.assertRaises(ValueError):
+            TimestampIndex(condition=Q(pk__gt=0)).get_index(Book)
+
+    def test_brin_index_cannot_include_pk(self):
+        with self.assertRaises(ValueError):
+            TimestampIndex(brin=True, with_pk=True)
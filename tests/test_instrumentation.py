@@ -0,0 +1,98 @@
+from unittest import mock
+
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase
+
+from django_model_extensions.instrumentation import (
+    WriteInstrumentationMiddleware,
+    instrument,
+)
+
+from .testapp.models import Publication
+
+
+class TestInstrumentation(TestCase):
+    """Test Cases for instrument() and WriteInstrumentationMiddleware"""
+
+    def test_records_writes_per_model_and_operation(self):
+        with instrument() as stats:
+            obj = Publication(name="saved")
+            obj.save()
+            objs = Publication.objects.bulk_create(
+                Publication(name=str(i)) for i in range(3)
+            )
+            for publication in objs:
+                publication.name = "updated"
+            Publication.objects.bulk_update(iter(objs), ["name"], batch_size=2)
+            Publication.objects.filter(name="updated").update(name="again")
+        totals = {
+            operation: (stats.calls, stats.objects, stats.rows)
+            for (label, operation), stats in stats.totals.items()
+        }
+        self.assertEqual(
+            totals,
+            {
+                "save": (1, 1, 1),
+                "bulk_create": (1, 3, 3),
+                # Django's bulk_update() calls update(), which is not recorded.
+                "bulk_update": (1, 3, 3),
+                "update": (1, 3, 3),
+            },
+        )
+        self.assertEqual({label for label, _ in stats.totals}, {"testapp.Publication"})
+
+    def test_sinks_receive_events(self):
+        sink = mock.Mock()
+        with instrument([sink]) as outer, instrument() as inner:
+            Publication.objects.create(name="created")
+        event = sink.call_args.args[0]
+        self.assertEqual(sink.call_count, 1)
+        self.assertEqual(
+            (event.model, event.operation, event.objects, event.rows, event.using),
+            (Publication, "save", 1, 1, "default"),
+        )
+        self.assertGreater(event.duration, 0)
+        self.assertEqual(outer.totals.keys(), inner.totals.keys())
+
+    def test_nothing_recorded_outside_instrument(self):
+        sink = mock.Mock()
+        with instrument([sink]):
+            pass
+        Publication.objects.create(name="created")
+        sink.assert_not_called()
+
+    def test_warns_on_save_loops(self):
+        with self.assertLogs(
+            "django_model_extensions.instrumentation", "WARNING"
+        ) as logs, instrument(save_threshold=2, label="test"):
+            for i in range(3):
+                Publication.objects.create(name=str(i))
+        self.assertEqual(
+            logs.output,
+            [
+                "WARNING:django_model_extensions.instrumentation:test: 3 objects of "
+                "testapp.Publication saved one at a time, consider bulk_create() "
+                "or bulk_update()."
+            ],
+        )
+
+    def test_middleware(self):
+        def view(request):
+            for i in range(3):
+                Publication.objects.create(name=str(i))
+            return HttpResponse()
+
+        class Middleware(WriteInstrumentationMiddleware):
+            save_threshold = 2
+
+        request = RequestFactory().post("/publications/")
+        with self.assertLogs(
+            "django_model_extensions.instrumentation", "DEBUG"
+        ) as logs:
+            Middleware(view)(request)
+        self.assertIn(
+            "DEBUG:django_model_extensions.instrumentation:POST /publications/: "
+            "testapp.Publication.save: 3 call(s), 3 object(s), 3 row(s)",
+            logs.output[0],
+        )
+        self.assertIn("3 objects of testapp.Publication saved", logs.output[1])
@@ -1,10 +1,37 @@
-from datetime import timedelta
+from datetime import datetime, timedelta
+from decimal import Decimal
 from unittest import mock
 
-from django.test import TestCase
+from django.core.exceptions import ImproperlyConfigured
+from django.db import IntegrityError, OperationalError, connection, transaction
+from django.db.models import Value
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
-from .testapp.models import CreatedUpdatedTimestampTestModel
+from django_model_extensions.concurrency import (
+    ConcurrentUpdateError,
+    retry_on_conflict,
+)
+from django_model_extensions.copy_loader import IteratorFile, format_csv_value
+from django_model_extensions.models import FieldChange, OutboxEntry, UpsertResult
+from django_model_extensions.signals import post_bulk_update, pre_bulk_update
+
+from .testapp.models import (
+    Author,
+    Book,
+    CatalogueItem,
+    ChangeTrackingTestModel,
+    CreatedUpdatedTimestampTestModel,
+    DatabaseTimestampTestModel,
+    HistoryTestModel,
+    MediumType,
+    OptimisticLockingTestModel,
+    OutboxTestModel,
+    Price,
+    Publication,
+    Rating,
+)
 
 
 class TestCreateUpdateTimestampModel(TestCase):
@@ -98,3 +125,1250 @@ class TestUpdateQueryOnCreatedUpdatedTimeStampModel(TestCase):
         for obj in test_objects:
             self.assertNotEqual(obj.created_at, self.mocked_update_time)
             self.assertEqual(obj.last_updated_at, self.mocked_update_time)
+
+
+class TestCreatedUpdatedTimestampQuerySet(TestCase):
+    """Test Cases for CreatedUpdatedTimestampQuerySet"""
+
+    def setUp(self) -> None:
+        self.object_count = 5
+        for _ in range(self.object_count):
+            CreatedUpdatedTimestampTestModel.objects.create()
+
+        self.mocked_update_time = timezone.now() + timedelta(days=1)
+
+    @mock.patch("django.utils.timezone.now")
+    def test_last_updated_at_is_now_on_filtered_update_query(self, mock_now):
+        """
+        Test last_updated_at is updated only for filtered objects, in one query.
+        """
+        mock_now.return_value = self.mocked_update_time
+        pks = list(
+            CreatedUpdatedTimestampTestModel.objects.order_by("pk").values_list(
+                "pk", flat=True
+            )
+        )
+        with self.assertNumQueries(1):
+            update_result = CreatedUpdatedTimestampTestModel.objects.filter(
+                pk__in=pks[:2]
+            ).update()
+        self.assertEqual(update_result, 2)
+
+        for obj in CreatedUpdatedTimestampTestModel.objects.all():
+            if obj.pk in pks[:2]:
+                self.assertEqual(obj.last_updated_at, self.mocked_update_time)
+            else:
+                self.assertNotEqual(obj.last_updated_at, self.mocked_update_time)
+
+    @mock.patch("django.utils.timezone.now")
+    def test_last_updated_at_is_now_on_select_for_update_update(self, mock_now):
+        """
+        Test last_updated_at is updated for select_for_update().update().
+        """
+        mock_now.return_value = self.mocked_update_time
+        update_result = (
+            CreatedUpdatedTimestampTestModel.objects.select_for_update().update()
+        )
+        self.assertEqual(update_result, self.object_count)
+        for obj in CreatedUpdatedTimestampTestModel.objects.all():
+            self.assertEqual(obj.last_updated_at, self.mocked_update_time)
+
+    def test_explicit_last_updated_at_is_kept_on_update(self):
+        """
+        Test an explicitly passed last_updated_at is not overwritten.
+        """
+        explicit_time = timezone.now() - timedelta(days=10)
+        CreatedUpdatedTimestampTestModel.objects.update(last_updated_at=explicit_time)
+        for obj in CreatedUpdatedTimestampTestModel.objects.all():
+            self.assertEqual(obj.last_updated_at, explicit_time)
+
+    @mock.patch("django.utils.timezone.now")
+    def test_last_updated_at_is_now_on_update_or_create(self, mock_now):
+        """
+        Test last_updated_at is saved when update_or_create updates an object.
+        """
+        obj = CreatedUpdatedTimestampTestModel.objects.first()
+        mock_now.return_value = self.mocked_update_time
+        updated_obj, created = CreatedUpdatedTimestampTestModel.objects.filter(
+            pk=obj.pk
+        ).update_or_create(pk=obj.pk)
+        self.assertFalse(created)
+        self.assertEqual(updated_obj.last_updated_at, self.mocked_update_time)
+        obj.refresh_from_db()
+        self.assertEqual(obj.last_updated_at, self.mocked_update_time)
+        self.assertNotEqual(obj.created_at, self.mocked_update_time)
+
+
+class TestDatabaseTimestampModel(TestCase):
+    """Test Cases for CreatedUpdatedTimestampModel with use_database_timestamps"""
+
+    def assertTimestampIsRecent(self, value):
+        self.assertIsInstance(value, datetime)
+        self.assertLess(abs(timezone.now() - value), timedelta(minutes=1))
+
+    def test_timestamps_are_filled_by_database_on_create(self):
+        """
+        Test created_at, last_updated_at come from the database and are returned.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            obj = DatabaseTimestampTestModel.objects.create()
+        self.assertIn("STRFTIME", queries[0]["sql"])
+        self.assertTimestampIsRecent(obj.created_at)
+        self.assertEqual(obj.created_at, obj.last_updated_at)
+
+    def test_timestamps_are_filled_by_database_on_bulk_create(self):
+        objs = DatabaseTimestampTestModel.objects.bulk_create(
+            [DatabaseTimestampTestModel() for _ in range(5)]
+        )
+        for obj in objs:
+            self.assertTimestampIsRecent(obj.created_at)
+            self.assertTimestampIsRecent(obj.last_updated_at)
+
+    def test_last_updated_at_is_loaded_from_database_after_save(self):
+        obj = DatabaseTimestampTestModel.objects.create()
+        created_at = obj.created_at
+        obj.save()
+        self.assertEqual(obj.created_at, created_at)
+        with self.assertNumQueries(1):
+            self.assertGreaterEqual(obj.last_updated_at, created_at)
+
+    def test_last_updated_at_is_set_by_database_on_update(self):
+        obj = DatabaseTimestampTestModel.objects.create()
+        past = timezone.now() - timedelta(days=1)
+        DatabaseTimestampTestModel.objects.update(last_updated_at=past)
+        with CaptureQueriesContext(connection) as queries:
+            DatabaseTimestampTestModel.objects.filter(pk=obj.pk).update()
+        self.assertIn("STRFTIME", queries[0]["sql"])
+        obj.refresh_from_db()
+        self.assertTimestampIsRecent(obj.last_updated_at)
+
+    def test_last_updated_at_is_set_by_database_on_bulk_update(self):
+        DatabaseTimestampTestModel.objects.bulk_create(
+            [DatabaseTimestampTestModel() for _ in range(3)]
+        )
+        past = timezone.now() - timedelta(days=1)
+        DatabaseTimestampTestModel.objects.update(last_updated_at=past)
+        objs = list(DatabaseTimestampTestModel.objects.all())
+        DatabaseTimestampTestModel.objects.bulk_update(objs, [])
+        for obj in objs:
+            self.assertTimestampIsRecent(obj.last_updated_at)
+
+
+class TestStreamingBulkUpdate(TestCase):
+    """Test Cases for chunked bulk_update of CreateUpdateTimestampManager"""
+
+    def setUp(self) -> None:
+        self.object_count = 7
+        CreatedUpdatedTimestampTestModel.objects.bulk_create(
+            [CreatedUpdatedTimestampTestModel() for _ in range(self.object_count)]
+        )
+        self.mocked_update_time = timezone.now() + timedelta(days=1)
+
+    @mock.patch("django.utils.timezone.now")
+    def test_bulk_update_accepts_generator(self, mock_now):
+        """
+        Test a generator is consumed in chunks and every object is updated.
+        """
+        mock_now.return_value = self.mocked_update_time
+        objs = (obj for obj in CreatedUpdatedTimestampTestModel.objects.iterator())
+        rows = CreatedUpdatedTimestampTestModel.objects.bulk_update(
+            objs, [], batch_size=3
+        )
+        self.assertEqual(rows, self.object_count)
+        self.assertEqual(
+            CreatedUpdatedTimestampTestModel.objects.filter(
+                last_updated_at=self.mocked_update_time
+            ).count(),
+            self.object_count,
+        )
+
+    def test_bulk_update_does_not_mutate_fields(self):
+        objs = list(CreatedUpdatedTimestampTestModel.objects.all())
+        fields = []
+        CreatedUpdatedTimestampTestModel.objects.bulk_update(objs, fields)
+        self.assertEqual(fields, [])
+        rows = CreatedUpdatedTimestampTestModel.objects.bulk_update(objs, ())
+        self.assertEqual(rows, self.object_count)
+
+    def test_bulk_update_reports_progress_per_chunk(self):
+        objs = list(CreatedUpdatedTimestampTestModel.objects.all())
+        progress_callback = mock.Mock()
+        with self.assertNumQueries(3):
+            CreatedUpdatedTimestampTestModel.objects.bulk_update(
+                objs, [], batch_size=3, progress_callback=progress_callback
+            )
+        self.assertEqual(
+            progress_callback.call_args_list,
+            [mock.call(3, 3), mock.call(6, 6), mock.call(7, 7)],
+        )
+
+    def test_bulk_update_batch_size_respects_backend_limit(self):
+        queryset = CreatedUpdatedTimestampTestModel.objects.all()
+        fields = ["pk", "pk", "last_updated_at"]
+        max_batch_size = connection.ops.bulk_batch_size(fields, range(10**6))
+        self.assertLessEqual(
+            queryset._get_bulk_batch_size(fields, 10**6), max_batch_size
+        )
+        self.assertEqual(queryset._get_bulk_batch_size(fields, 2), 2)
+        with self.assertRaises(ValueError):
+            queryset._get_bulk_batch_size(fields, 0)
+
+
+class TestBulkUpdateTransaction(TransactionTestCase):
+    """Test Cases for the transaction of chunked bulk_update"""
+
+    def setUp(self) -> None:
+        self.objs = Publication.objects.bulk_create(
+            [Publication(name=str(i)) for i in range(10)]
+        )
+        for obj in self.objs:
+            obj.name = "updated"
+        # NOT NULL violation in the last chunk.
+        self.objs[-1].name = None
+
+    def test_bulk_update_is_atomic(self):
+        with self.assertRaises(IntegrityError):
+            Publication.objects.bulk_update(self.objs, ["name"], batch_size=3)
+        self.assertFalse(Publication.objects.filter(name="updated").exists())
+
+    def test_bulk_update_commits_per_chunk_when_not_atomic(self):
+        with self.assertRaises(IntegrityError):
+            Publication.objects.bulk_update(
+                self.objs, ["name"], batch_size=3, atomic=False
+            )
+        self.assertEqual(Publication.objects.filter(name="updated").count(), 9)
+
+
+class TestValuesBulkUpdate(TestCase):
+    """Test Cases for the "values" strategy of bulk_update"""
+
+    def setUp(self) -> None:
+        self.object_count = 5
+        Publication.objects.bulk_create(
+            [Publication(name=f"name {i}") for i in range(self.object_count)]
+        )
+        self.mocked_update_time = timezone.now() + timedelta(days=1)
+
+    @mock.patch("django.utils.timezone.now")
+    def test_values_strategy_updates_fields_and_last_updated_at(self, mock_now):
+        mock_now.return_value = self.mocked_update_time
+        objs = list(Publication.objects.order_by("pk"))
+        for obj in objs:
+            obj.name = f"updated {obj.pk}"
+        with self.assertNumQueries(2):
+            rows = Publication.objects.bulk_update(
+                objs, ["name"], batch_size=3, strategy="values"
+            )
+        self.assertEqual(rows, self.object_count)
+        for obj in Publication.objects.all():
+            self.assertEqual(obj.name, f"updated {obj.pk}")
+            self.assertEqual(obj.last_updated_at, self.mocked_update_time)
+            self.assertNotEqual(obj.created_at, self.mocked_update_time)
+
+    def test_values_strategy_only_updates_given_objects(self):
+        first, *rest = Publication.objects.order_by("pk")
+        first.name = "updated"
+        rows = Publication.objects.bulk_update([first], ["name"], strategy="values")
+        self.assertEqual(rows, 1)
+        self.assertEqual(Publication.objects.filter(name="updated").get().pk, first.pk)
+        self.assertEqual(Publication.objects.exclude(pk=first.pk).count(), len(rest))
+        self.assertFalse(
+            Publication.objects.filter(name="updated").exclude(pk=first.pk).exists()
+        )
+
+    def test_values_strategy_with_database_timestamps(self):
+        DatabaseTimestampTestModel.objects.bulk_create(
+            [DatabaseTimestampTestModel() for _ in range(3)]
+        )
+        past = timezone.now() - timedelta(days=1)
+        DatabaseTimestampTestModel.objects.update(last_updated_at=past)
+        objs = list(DatabaseTimestampTestModel.objects.all())
+        rows = DatabaseTimestampTestModel.objects.bulk_update(
+            objs, [], strategy="values"
+        )
+        self.assertEqual(rows, 3)
+        for obj in objs:
+            self.assertGreater(obj.last_updated_at, past)
+
+    def test_values_strategy_rejects_expressions(self):
+        objs = list(Publication.objects.all())
+        objs[0].name = Value("expression")
+        with self.assertRaises(ValueError):
+            Publication.objects.bulk_update(objs, ["name"], strategy="values")
+
+    def test_strategies_reject_objects_without_pk(self):
+        for strategy in ("case", "values"):
+            with self.subTest(strategy=strategy), self.assertRaisesMessage(
+                ValueError, "All bulk_update() objects must have a primary key set."
+            ):
+                Publication.objects.bulk_update(
+                    [Publication(name="x")], ["name"], strategy=strategy
+                )
+
+    def test_unknown_strategy_raises_error(self):
+        with self.assertRaises(ValueError):
+            Publication.objects.bulk_update([], ["name"], strategy="unknown")
+
+
+class TestBulkUpsert(TestCase):
+    """Test Cases for bulk_upsert of CreateUpdateTimestampManager"""
+
+    def setUp(self) -> None:
+        self.mocked_time_past = timezone.now() - timedelta(days=1)
+        self.mocked_time_now = timezone.now()
+        with mock.patch("django.utils.timezone.now") as mock_now:
+            mock_now.return_value = self.mocked_time_past
+            CatalogueItem.objects.bulk_create([
+                CatalogueItem(code="a", name="A", price=Decimal("1.00")),
+                CatalogueItem(code="b", name="B", price=None),
+            ])
+
+    @mock.patch("django.utils.timezone.now")
+    def test_bulk_upsert_inserts_updates_and_skips_unchanged(self, mock_now):
+        mock_now.return_value = self.mocked_time_now
+        objs = [
+            CatalogueItem(code="a", name="A", price=Decimal("1.00")),
+            CatalogueItem(code="b", name="B", price=Decimal("2.00")),
+            CatalogueItem(code="c", name="C", price=Decimal("3.00")),
+        ]
+        with self.assertNumQueries(1):
+            result = CatalogueItem.objects.bulk_upsert(
+                objs, unique_fields=["code"], update_fields=["name", "price"]
+            )
+        self.assertEqual(result, UpsertResult(inserted=1, updated=1, unchanged=1))
+
+        items = {item.code: item for item in CatalogueItem.objects.all()}
+        self.assertEqual(items["a"].created_at, self.mocked_time_past)
+        self.assertEqual(items["a"].last_updated_at, self.mocked_time_past)
+        self.assertEqual(items["b"].price, Decimal("2.00"))
+        self.assertEqual(items["b"].created_at, self.mocked_time_past)
+        self.assertEqual(items["b"].last_updated_at, self.mocked_time_now)
+        self.assertEqual(items["c"].created_at, self.mocked_time_now)
+        self.assertEqual(items["c"].last_updated_at, self.mocked_time_now)
+
+    def test_bulk_upsert_batches_input(self):
+        objs = (CatalogueItem(code=str(i), name=str(i)) for i in range(5))
+        with self.assertNumQueries(3):
+            result = CatalogueItem.objects.bulk_upsert(
+                objs, unique_fields=["code"], update_fields=["name"], batch_size=2
+            )
+        self.assertEqual(result, UpsertResult(inserted=5, updated=0, unchanged=0))
+        self.assertEqual(CatalogueItem.objects.count(), 7)
+
+    @mock.patch("django.utils.timezone.now")
+    def test_bulk_upsert_without_update_fields_skips_conflicts(self, mock_now):
+        mock_now.return_value = self.mocked_time_now
+        objs = [
+            CatalogueItem(code="a", name="changed"),
+            CatalogueItem(code="c", name="C"),
+        ]
+        result = CatalogueItem.objects.bulk_upsert(
+            objs, unique_fields=["code"], update_fields=[]
+        )
+        self.assertEqual(result, UpsertResult(inserted=1, updated=0, unchanged=1))
+        item = CatalogueItem.objects.get(code="a")
+        self.assertEqual(item.name, "A")
+        self.assertEqual(item.last_updated_at, self.mocked_time_past)
+
+    @mock.patch("django.utils.timezone.now")
+    def test_bulk_upsert_batches_get_distinct_timestamps(self, mock_now):
+        mock_now.return_value = self.mocked_time_now
+        objs = [CatalogueItem(code=str(i), name=str(i)) for i in range(2)]
+        CatalogueItem.objects.bulk_upsert(
+            objs, unique_fields=["code"], update_fields=["name"], batch_size=1
+        )
+        first, second = CatalogueItem.objects.filter(code__in=["0", "1"]).order_by(
+            "code"
+        )
+        self.assertEqual(first.created_at, self.mocked_time_now)
+        self.assertGreater(second.created_at, first.created_at)
+
+    def test_bulk_upsert_rejects_repeated_unique_keys(self):
+        objs = [CatalogueItem(code="c", name="C"), CatalogueItem(code="c", name="D")]
+        # The batch repeating the key is not written, earlier batches are.
+        for batch_size, names in ((2, []), (1, ["C"])):
+            with self.subTest(batch_size=batch_size):
+                with self.assertRaises(ValueError):
+                    CatalogueItem.objects.bulk_upsert(
+                        objs,
+                        unique_fields=["code"],
+                        update_fields=["name"],
+                        batch_size=batch_size,
+                    )
+                self.assertEqual(
+                    list(
+                        CatalogueItem.objects.filter(code="c").values_list(
+                            "name", flat=True
+                        )
+                    ),
+                    names,
+                )
+
+    def test_bulk_upsert_appends_outbox_entries(self):
+        a = CatalogueItem.objects.get(code="a")
+        objs = [
+            CatalogueItem(code="a", name="changed"),
+            CatalogueItem(code="b", name="B"),
+            CatalogueItem(code="c", name="C"),
+        ]
+        with mock.patch.object(CatalogueItem, "use_outbox", True):
+            CatalogueItem.objects.bulk_upsert(
+                objs, unique_fields=["code"], update_fields=["name"]
+            )
+        c = CatalogueItem.objects.get(code="c")
+        self.assertEqual(
+            list(
+                OutboxEntry.objects.for_model(CatalogueItem)
+                .order_by("pk")
+                .values_list("object_id", "operation", "fields")
+            ),
+            [
+                (str(c.pk), OutboxEntry.CREATE, None),
+                (str(a.pk), OutboxEntry.UPDATE, ["name", "last_updated_at"]),
+            ],
+        )
+
+    def test_bulk_upsert_touches_parents(self):
+        past = timezone.now() - timedelta(days=1)
+        with mock.patch("django.utils.timezone.now", return_value=past):
+            publication = Publication.objects.create(name="publication")
+            book = Book.objects.create(title="book", publication=publication)
+            medium = MediumType.objects.create(name="paperback")
+            with self.captureOnCommitCallbacks(execute=True):
+                price = Price.objects.create(
+                    medium=medium, book=book, price=Decimal("1.00")
+                )
+        price.price = Decimal("2.00")
+        with self.captureOnCommitCallbacks(execute=True):
+            Price.objects.bulk_upsert(
+                [price], unique_fields=["id"], update_fields=["price"]
+            )
+        book.refresh_from_db()
+        self.assertGreater(book.last_updated_at, past)
+
+    def test_bulk_upsert_rejects_keep_history_models(self):
+        with mock.patch.object(CatalogueItem, "keep_history", True):
+            with self.assertRaises(ImproperlyConfigured):
+                CatalogueItem.objects.bulk_upsert(
+                    [], unique_fields=["code"], update_fields=["name"]
+                )
+
+    def test_bulk_upsert_rejects_timestamp_fields(self):
+        with self.assertRaises(ValueError):
+            CatalogueItem.objects.bulk_upsert(
+                [], unique_fields=["code"], update_fields=["last_updated_at"]
+            )
+
+
+class TestBulkCopy(TestCase):
+    """Test Cases for bulk_copy of CreateUpdateTimestampManager"""
+
+    def test_bulk_copy_creates_rows_from_mappings(self):
+        rows = ({"code": str(i), "name": "Item %s" % i} for i in range(5))
+        created = CatalogueItem.objects.bulk_copy(rows, batch_size=2)
+        self.assertEqual(created, 5)
+        items = CatalogueItem.objects.order_by("code")
+        self.assertEqual(
+            [item.name for item in items], ["Item %s" % i for i in range(5)]
+        )
+        self.assertIsNone(items[0].price)
+        timestamps = set(items.values_list("created_at", "last_updated_at"))
+        self.assertEqual(len(timestamps), 1)
+
+    def test_bulk_copy_merges_on_unique_fields(self):
+        CatalogueItem.objects.create(code="a", name="A")
+        result = CatalogueItem.objects.bulk_copy(
+            [{"code": "a", "name": "AA"}, {"code": "b", "name": "B"}],
+            fields=["code", "name"],
+            unique_fields=["code"],
+            update_fields=["name"],
+        )
+        self.assertEqual(result, UpsertResult(inserted=1, updated=1, unchanged=0))
+        self.assertEqual(CatalogueItem.objects.get(code="a").name, "AA")
+
+    def test_bulk_copy_rejects_timestamp_fields(self):
+        with self.assertRaises(ValueError):
+            CatalogueItem.objects.bulk_copy([], fields=["code", "created_at"])
+
+    def test_format_csv_value(self):
+        name = CatalogueItem._meta.get_field("name")
+        price = CatalogueItem._meta.get_field("price")
+        self.assertEqual(format_csv_value(name, 'say "hi"', connection), '"say ""hi"""')
+        self.assertEqual(format_csv_value(name, "", connection), '""')
+        self.assertEqual(format_csv_value(price, None, connection), "")
+
+    def test_iterator_file_reads_in_chunks(self):
+        file = IteratorFile(iter(["ab\n", "cd\n", "e"]))
+        self.assertEqual(file.read(4), "ab\nc")
+        self.assertEqual(file.read(), "d\ne")
+        self.assertEqual(file.read(), "")
+
+
+class TestChangedSince(TestCase):
+    """Test Cases for changed_since of CreateUpdateTimestampManager"""
+
+    def setUp(self) -> None:
+        self.mocked_time_past = timezone.now() - timedelta(days=1)
+        self.mocked_time_now = timezone.now()
+        with mock.patch("django.utils.timezone.now") as mock_now:
+            mock_now.return_value = self.mocked_time_past
+            self.old_objs = CreatedUpdatedTimestampTestModel.objects.bulk_create(
+                [CreatedUpdatedTimestampTestModel() for _ in range(2)]
+            )
+            # Objects sharing the same timestamp.
+            mock_now.return_value = self.mocked_time_now
+            self.new_objs = CreatedUpdatedTimestampTestModel.objects.bulk_create(
+                [CreatedUpdatedTimestampTestModel() for _ in range(5)]
+            )
+
+    def test_changed_since_pages_through_timestamp_ties(self):
+        batches = list(
+            CreatedUpdatedTimestampTestModel.objects.changed_since(
+                self.mocked_time_past, batch_size=2
+            )
+        )
+        self.assertEqual([len(batch.objects) for batch in batches], [2, 2, 1])
+        self.assertEqual(
+            [obj.pk for batch in batches for obj in batch.objects],
+            [obj.pk for obj in self.new_objs],
+        )
+
+    def test_changed_since_resumes_from_cursor(self):
+        batches = CreatedUpdatedTimestampTestModel.objects.changed_since(batch_size=3)
+        first_batch = next(batches)
+        self.assertEqual(
+            [obj.pk for obj in first_batch.objects],
+            [obj.pk for obj in (*self.old_objs, self.new_objs[0])],
+        )
+        resumed = CreatedUpdatedTimestampTestModel.objects.changed_since(
+            first_batch.cursor, batch_size=3
+        )
+        self.assertEqual(
+            [obj.pk for batch in resumed for obj in batch.objects],
+            [obj.pk for obj in self.new_objs[1:]],
+        )
+
+    def test_changed_since_yields_updated_rows_again(self):
+        batches = list(CreatedUpdatedTimestampTestModel.objects.changed_since())
+        self.old_objs[0].save()
+        resumed = CreatedUpdatedTimestampTestModel.objects.changed_since(
+            batches[-1].cursor
+        )
+        self.assertEqual(
+            [obj.pk for batch in resumed for obj in batch.objects],
+            [self.old_objs[0].pk],
+        )
+
+
+class TestChangeTracking(TestCase):
+    """Test Cases for CreatedUpdatedTimestampModel with track_changes"""
+
+    def setUp(self) -> None:
+        self.mocked_time_past = timezone.now() - timedelta(days=1)
+        with mock.patch("django.utils.timezone.now") as mock_now:
+            mock_now.return_value = self.mocked_time_past
+            ChangeTrackingTestModel.objects.create(name="name")
+        self.obj = ChangeTrackingTestModel.objects.get()
+
+    def test_save_without_changes_skips_update(self):
+        self.assertFalse(self.obj.has_changed)
+        with self.assertNumQueries(0):
+            self.obj.save()
+        self.obj.refresh_from_db()
+        self.assertEqual(self.obj.last_updated_at, self.mocked_time_past)
+
+    def test_save_only_writes_dirty_fields(self):
+        publication = Publication.objects.create(name="publication")
+        self.obj.name = "new name"
+        self.obj.publication = publication
+        self.assertEqual(
+            self.obj.get_dirty_fields(), {"name": "name", "publication": None}
+        )
+        with CaptureQueriesContext(connection) as queries:
+            self.obj.save()
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('"created_at"', queries[0]["sql"])
+        self.assertFalse(self.obj.has_changed)
+        self.obj.refresh_from_db()
+        self.assertEqual(self.obj.name, "new name")
+        self.assertEqual(self.obj.publication, publication)
+        self.assertGreater(self.obj.last_updated_at, self.mocked_time_past)
+
+    def test_save_inserts_deleted_row_again(self):
+        ChangeTrackingTestModel.objects.all().delete()
+        self.obj.name = "new name"
+        self.obj.save()
+        obj = ChangeTrackingTestModel.objects.get()
+        self.assertEqual((obj.pk, obj.name), (self.obj.pk, "new name"))
+
+    def test_created_object_is_tracked(self):
+        obj = ChangeTrackingTestModel(name="name")
+        self.assertTrue(obj.has_changed)
+        obj.save()
+        self.assertFalse(obj.has_changed)
+        with self.assertNumQueries(0):
+            obj.save()
+
+    def test_bulk_update_resets_dirty_fields(self):
+        self.obj.name = "new name"
+        ChangeTrackingTestModel.objects.bulk_update([self.obj], ["name"])
+        self.assertEqual(self.obj.get_dirty_fields(), {})
+
+    def test_deferred_fields_are_not_dirty(self):
+        obj = ChangeTrackingTestModel.objects.only("pk").get()
+        self.assertEqual(obj.get_dirty_fields(), {})
+        obj.name = "new name"
+        self.assertEqual(obj.get_dirty_fields(), {"name": None})
+
+    def test_json_field_changed_in_place(self):
+        ChangeTrackingTestModel.objects.update(data={"a": 1})
+        obj = ChangeTrackingTestModel.objects.get()
+        obj.data["a"] = 2
+        self.assertEqual(obj.get_dirty_fields(), {"data": {"a": 1}})
+        obj.save()
+        obj.data["a"] = 3
+        self.assertEqual(obj.get_dirty_fields(), {"data": {"a": 2}})
+        self.assertEqual(ChangeTrackingTestModel.objects.get().data, {"a": 2})
+
+
+class TestHistory(TestCase):
+    """Test Cases for CreatedUpdatedTimestampModel with keep_history"""
+
+    def setUp(self) -> None:
+        self.times = [timezone.now() - timedelta(days=days) for days in (3, 2, 1)]
+        with mock.patch("django.utils.timezone.now", return_value=self.times[0]):
+            self.obj = HistoryTestModel.objects.create(name="first", price=None)
+
+    def test_save_records_changed_fields_only(self):
+        self.obj.name = "second"
+        with mock.patch("django.utils.timezone.now", return_value=self.times[1]):
+            self.obj.save()
+        changes = FieldChange.objects.order_by("field")
+        self.assertEqual(
+            [(change.field, change.old_value) for change in changes],
+            [
+                ("last_updated_at", [self.times[0].isoformat()]),
+                ("name", ["first"]),
+            ],
+        )
+        self.assertEqual({change.changed_at for change in changes}, {self.times[1]})
+
+    def test_save_without_changes_records_nothing(self):
+        with mock.patch("django.utils.timezone.now", return_value=self.times[1]):
+            self.obj.save()
+        self.assertEqual(HistoryTestModel.objects.get().last_updated_at, self.times[1])
+        self.assertFalse(FieldChange.objects.exists())
+
+    def test_update_without_changes_records_nothing(self):
+        HistoryTestModel.objects.filter(pk=self.obj.pk).update(name="first")
+        self.assertFalse(FieldChange.objects.exists())
+
+    def test_as_of_rebuilds_past_states(self):
+        with mock.patch("django.utils.timezone.now", return_value=self.times[1]):
+            HistoryTestModel.objects.update(name="second", price=Decimal("1.50"))
+        self.obj.refresh_from_db()
+        self.obj.price = Decimal("2.50")
+        with mock.patch("django.utils.timezone.now", return_value=self.times[2]):
+            HistoryTestModel.objects.bulk_update([self.obj], ["price"])
+        # bulk_update() records its batch once, not again from update().
+        self.assertEqual(FieldChange.objects.filter(field="price").count(), 2)
+
+        first = self.obj.as_of(self.times[0])
+        self.assertEqual((first.name, first.price), ("first", None))
+        self.assertEqual(first.last_updated_at, self.times[0])
+        second = HistoryTestModel.objects.as_of(self.times[1] + timedelta(hours=1))
+        self.assertEqual(
+            [(obj.name, obj.price) for obj in second], [("second", Decimal("1.50"))]
+        )
+        current = HistoryTestModel.objects.as_of(timezone.now()).get()
+        self.assertEqual((current.name, current.price), ("second", Decimal("2.50")))
+        self.assertIsNone(self.obj.as_of(self.times[0] - timedelta(days=1)))
+
+    def test_as_of_uses_a_single_query(self):
+        with self.assertNumQueries(1):
+            list(HistoryTestModel.objects.as_of(self.times[1]))
+
+    def test_as_of_requires_keep_history(self):
+        with self.assertRaises(ImproperlyConfigured):
+            Publication.objects.as_of(self.times[1])
+
+
+class TestBulkUpdateSignals(TestCase):
+    """Test Cases for pre_bulk_update and post_bulk_update"""
+
+    def setUp(self) -> None:
+        self.publications = Publication.objects.bulk_create(
+            [Publication(name=str(i)) for i in range(3)]
+        )
+        self.pks = [obj.pk for obj in self.publications]
+        self.pre_receiver = mock.Mock()
+        self.post_receiver = mock.Mock()
+        pre_bulk_update.connect(self.pre_receiver, sender=Publication)
+        post_bulk_update.connect(self.post_receiver, sender=Publication)
+        self.addCleanup(
+            pre_bulk_update.disconnect, self.pre_receiver, sender=Publication
+        )
+        self.addCleanup(
+            post_bulk_update.disconnect, self.post_receiver, sender=Publication
+        )
+
+    def test_update_sends_signals_once(self):
+        timestamp = timezone.now()
+        with mock.patch("django.utils.timezone.now", return_value=timestamp):
+            Publication.objects.filter(pk__in=self.pks[:2]).update(name="new")
+        for receiver in (self.pre_receiver, self.post_receiver):
+            receiver.assert_called_once()
+            kwargs = receiver.call_args.kwargs
+            self.assertEqual(sorted(kwargs["pks"]), self.pks[:2])
+            self.assertEqual(kwargs["fields"], ["name", "last_updated_at"])
+            self.assertEqual(kwargs["timestamp"], timestamp)
+            self.assertEqual(kwargs["using"], "default")
+
+    def test_bulk_update_sends_signals_per_batch(self):
+        for obj in self.publications:
+            obj.name = "new"
+        Publication.objects.bulk_update(self.publications, ["name"], batch_size=2)
+        self.assertEqual(
+            [call.kwargs["pks"] for call in self.post_receiver.call_args_list],
+            [self.pks[:2], self.pks[2:]],
+        )
+        self.assertEqual(self.pre_receiver.call_count, 2)
+
+    def test_post_bulk_update_on_commit(self):
+        with mock.patch.object(Publication, "bulk_signals_on_commit", True):
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                Publication.objects.update(name="new")
+                self.pre_receiver.assert_called_once()
+                self.post_receiver.assert_not_called()
+        self.assertEqual(len(callbacks), 1)
+        self.post_receiver.assert_called_once()
+
+    def test_no_pk_query_without_receivers(self):
+        pre_bulk_update.disconnect(self.pre_receiver, sender=Publication)
+        post_bulk_update.disconnect(self.post_receiver, sender=Publication)
+        with self.assertNumQueries(1):
+            Publication.objects.update(name="new")
+
+
+class TestOutbox(TestCase):
+    """Test Cases for CreatedUpdatedTimestampModel with use_outbox"""
+
+    def get_entries(self):
+        return list(
+            OutboxEntry.objects.order_by("pk").values_list(
+                "object_id", "operation", "fields"
+            )
+        )
+
+    def test_writes_append_entries(self):
+        obj = OutboxTestModel.objects.create(name="first")
+        obj.name = "second"
+        obj.save(update_fields=["name"])
+        OutboxTestModel.objects.update(name="third")
+        pk = str(obj.pk)
+        obj.delete()
+        self.assertEqual(
+            self.get_entries(),
+            [
+                (pk, "create", None),
+                (pk, "update", ["name"]),
+                (pk, "update", ["name", "last_updated_at"]),
+                (pk, "delete", None),
+            ],
+        )
+
+    def test_bulk_writes_insert_entries_per_batch(self):
+        with self.assertNumQueries(2):
+            objs = OutboxTestModel.objects.bulk_create(
+                [OutboxTestModel(name=str(i)) for i in range(3)]
+            )
+        for obj in objs:
+            obj.name = "new"
+        # SELECT of the pks is not needed, one UPDATE and one INSERT per batch.
+        with self.assertNumQueries(4):
+            OutboxTestModel.objects.bulk_update(objs, ["name"], batch_size=2)
+        self.assertEqual(
+            [entry[1] for entry in self.get_entries()], ["create"] * 3 + ["update"] * 3
+        )
+        OutboxTestModel.objects.all().delete()
+        self.assertEqual(OutboxEntry.objects.filter(operation="delete").count(), 3)
+
+    def test_consume_acknowledges_processed_batches(self):
+        OutboxTestModel.objects.bulk_create(
+            [OutboxTestModel(name=str(i)) for i in range(5)]
+        )
+        batches = OutboxEntry.objects.for_model(OutboxTestModel).consume(batch_size=2)
+        first = next(batches)
+        self.assertEqual(len(first), 2)
+        self.assertEqual(OutboxEntry.objects.count(), 5)
+        second = next(batches)
+        self.assertEqual(OutboxEntry.objects.count(), 3)
+        self.assertLess(first[-1].pk, second[0].pk)
+        self.assertEqual(sum(len(batch) for batch in batches), 1)
+        self.assertFalse(OutboxEntry.objects.exists())
+
+    def test_other_models_do_not_write_entries(self):
+        Publication.objects.create(name="publication")
+        Publication.objects.update(name="new")
+        self.assertFalse(OutboxEntry.objects.exists())
+
+
+class TestOptimisticLocking(TestCase):
+    """Test Cases for CreatedUpdatedTimestampModel with optimistic_locking"""
+
+    def setUp(self) -> None:
+        OptimisticLockingTestModel.objects.bulk_create(
+            [OptimisticLockingTestModel(name=str(i)) for i in range(3)]
+        )
+
+    def test_save_checks_loaded_version(self):
+        obj = OptimisticLockingTestModel.objects.first()
+        other = OptimisticLockingTestModel.objects.get(pk=obj.pk)
+        other.name = "other"
+        other.save()
+        obj.name = "stale"
+        with self.assertRaises(ConcurrentUpdateError) as context:
+            obj.save()
+        self.assertEqual(context.exception.pks, [obj.pk])
+        self.assertEqual(
+            OptimisticLockingTestModel.objects.get(pk=obj.pk).name, "other"
+        )
+        # The version is updated by save(), so saving again succeeds.
+        other.name = "again"
+        other.save()
+        obj.refresh_from_db()
+        obj.name = "fresh"
+        obj.save()
+
+    def test_save_of_deleted_row_conflicts(self):
+        obj = OptimisticLockingTestModel.objects.first()
+        OptimisticLockingTestModel.objects.filter(pk=obj.pk).delete()
+        with self.assertRaises(ConcurrentUpdateError):
+            obj.save()
+        self.assertFalse(OptimisticLockingTestModel.objects.filter(pk=obj.pk).exists())
+
+    def test_bulk_update_optimistic_returns_stale_pks(self):
+        objs = list(OptimisticLockingTestModel.objects.order_by("pk"))
+        OptimisticLockingTestModel.objects.filter(pk=objs[1].pk).update(name="other")
+        for obj in objs:
+            obj.name = "new"
+        stale_pks = OptimisticLockingTestModel.objects.bulk_update_optimistic(
+            objs, ["name"]
+        )
+        self.assertEqual(stale_pks, [objs[1].pk])
+        self.assertEqual(
+            list(
+                OptimisticLockingTestModel.objects.order_by("pk").values_list(
+                    "name", flat=True
+                )
+            ),
+            ["new", "other", "new"],
+        )
+        # Updated objects carry their new version.
+        objs[0].name = "newer"
+        objs[0].save()
+
+    def test_bulk_update_optimistic_hooks_skip_stale_objects(self):
+        objs = list(OptimisticLockingTestModel.objects.order_by("pk"))
+        OptimisticLockingTestModel.objects.filter(pk=objs[1].pk).update(name="other")
+        for obj in objs:
+            obj.name = "new"
+        receiver = mock.Mock()
+        post_bulk_update.connect(receiver, sender=OptimisticLockingTestModel)
+        self.addCleanup(
+            post_bulk_update.disconnect, receiver, sender=OptimisticLockingTestModel
+        )
+        with mock.patch.object(OptimisticLockingTestModel, "use_outbox", True):
+            OptimisticLockingTestModel.objects.bulk_update_optimistic(objs, ["name"])
+        fresh_pks = [objs[0].pk, objs[2].pk]
+        receiver.assert_called_once()
+        self.assertEqual(receiver.call_args.kwargs["pks"], fresh_pks)
+        self.assertEqual(
+            list(
+                OutboxEntry.objects.for_model(OptimisticLockingTestModel)
+                .order_by("pk")
+                .values_list("object_id", flat=True)
+            ),
+            [str(pk) for pk in fresh_pks],
+        )
+
+    def test_retry_on_conflict(self):
+        func = mock.Mock(side_effect=[ConcurrentUpdateError("conflict"), "done"])
+        self.assertEqual(retry_on_conflict(func)(), "done")
+        func = mock.Mock(side_effect=ConcurrentUpdateError("conflict"))
+        with self.assertRaises(ConcurrentUpdateError):
+            retry_on_conflict(attempts=2)(func)()
+        self.assertEqual(func.call_count, 2)
+
+
+class TestTouch(TestCase):
+    """Test Cases for touch of CreatedUpdatedTimestampQuerySet and the model"""
+
+    def setUp(self) -> None:
+        self.past = timezone.now() - timedelta(days=1)
+        with mock.patch("django.utils.timezone.now", return_value=self.past):
+            self.publication = Publication.objects.create(name="publication")
+            self.medium = MediumType.objects.create(name="paperback")
+            self.books = Book.objects.bulk_create(
+                [Book(title=str(i), publication=self.publication) for i in range(3)]
+            )
+            self.prices = Price.objects.bulk_create([
+                Price(medium=self.medium, book=book, price=Decimal("1.00"))
+                for book in self.books
+            ])
+        self.now = timezone.now()
+
+    def get_touched(self, model):
+        return list(
+            model.objects.filter(last_updated_at=self.now)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+
+    def test_touch_pks_in_chunks(self):
+        pks = [book.pk for book in self.books]
+        with self.assertNumQueries(2):
+            rows = Book.objects.touch(iter(pks), self.now, batch_size=2)
+        self.assertEqual(rows, 3)
+        self.assertEqual(self.get_touched(Book), pks)
+        self.assertEqual(Book.objects.get(pk=pks[0]).title, "0")
+
+    def test_touch_queryset_with_a_single_update(self):
+        with self.assertNumQueries(1):
+            rows = Book.objects.touch(Book.objects.filter(title="1"), self.now)
+        self.assertEqual(rows, 1)
+        self.assertEqual(self.get_touched(Book), [self.books[1].pk])
+
+    def test_touch_filtered_queryset(self):
+        with mock.patch("django.utils.timezone.now", return_value=self.now):
+            rows = Book.objects.filter(title__in=["0", "2"]).touch()
+        self.assertEqual(rows, 2)
+        self.assertEqual(self.get_touched(Book), [self.books[0].pk, self.books[2].pk])
+
+    def test_touch_related(self):
+        price = self.prices[0]
+        # Parents are touched before the rows filtered on last_updated_at, and
+        # the books of Price.touch_parents are read to be touched on commit.
+        with self.assertNumQueries(4):
+            rows = Price.objects.filter(last_updated_at__lt=self.now).touch(
+                [price.pk], self.now, touch_related=["book", "book__publication"]
+            )
+        self.assertEqual(rows, 1)
+        self.assertEqual(self.get_touched(Price), [price.pk])
+        self.assertEqual(self.get_touched(Book), [price.book_id])
+        self.assertEqual(self.get_touched(Publication), [self.publication.pk])
+        self.assertEqual(self.get_touched(MediumType), [])
+
+    def test_touch_related_must_follow_foreign_keys(self):
+        with self.assertRaisesMessage(ValueError, "Book.mediums is not one"):
+            Book.objects.touch(touch_related=["mediums"])
+        with self.assertRaisesMessage(ValueError, "Price.price is not one"):
+            Price.objects.touch(touch_related=["price"])
+
+    def test_instance_touch(self):
+        book = self.books[0]
+        with self.assertNumQueries(2):
+            book.touch(self.now, touch_related=["publication"])
+        self.assertEqual(book.last_updated_at, self.now)
+        self.assertEqual(self.get_touched(Book), [book.pk])
+        self.assertEqual(self.get_touched(Publication), [self.publication.pk])
+        with self.assertRaisesMessage(ValueError, "primary key is not set"):
+            Book(title="unsaved").touch()
+
+    def test_instance_touch_updates_version(self):
+        obj = OptimisticLockingTestModel.objects.create(name="name")
+        obj.touch()
+        obj.name = "new"
+        obj.save()
+
+    def test_instance_touch_checks_loaded_version(self):
+        obj = OptimisticLockingTestModel.objects.create(name="name")
+        a = OptimisticLockingTestModel.objects.get(pk=obj.pk)
+        b = OptimisticLockingTestModel.objects.get(pk=obj.pk)
+        a.name = "A"
+        a.save()
+        with self.assertRaises(ConcurrentUpdateError) as context:
+            b.touch()
+        self.assertEqual(context.exception.pks, [obj.pk])
+        b.name = "B"
+        with self.assertRaises(ConcurrentUpdateError):
+            b.save()
+        self.assertEqual(OptimisticLockingTestModel.objects.get(pk=obj.pk).name, "A")
+
+    def test_instance_touch_with_database_timestamps(self):
+        obj = DatabaseTimestampTestModel.objects.create()
+        obj.touch()
+        self.assertNotIn("last_updated_at", obj.__dict__)
+        self.assertIsInstance(obj.last_updated_at, datetime)
+
+
+class TestTouchParents(TestCase):
+    """Test Cases for CreatedUpdatedTimestampModel with touch_parents"""
+
+    def setUp(self) -> None:
+        self.past = timezone.now() - timedelta(days=1)
+        with mock.patch("django.utils.timezone.now", return_value=self.past):
+            self.rating = Rating.objects.create(score=1)
+            self.publication = Publication.objects.create(name="publication")
+            self.medium = MediumType.objects.create(name="paperback")
+            self.books = Book.objects.bulk_create(
+                [Book(title=str(i), publication=self.publication) for i in range(3)]
+            )
+            self.author = Author.objects.create(name="author")
+        self.books[0].rating = self.rating
+        Book.objects.bulk_update([self.books[0]], ["rating"], timestamp=self.past)
+
+    def get_touched_books(self):
+        return list(
+            Book.objects.filter(last_updated_at__gt=self.past)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+
+    def test_saves_touch_parent_once_on_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            for _ in range(5):
+                Price.objects.create(
+                    medium=self.medium, book=self.books[0], price=Decimal("1.00")
+                )
+            Price.objects.bulk_create([
+                Price(medium=self.medium, book=book, price=Decimal("1.00"))
+                for book in self.books[:2]
+            ])
+        self.assertEqual(self.get_touched_books(), [])
+        self.assertEqual(len(callbacks), 1)
+        with self.assertNumQueries(1):
+            callbacks[0]()
+        self.assertEqual(self.get_touched_books(), [b.pk for b in self.books[:2]])
+
+    def test_updates_and_deletes_touch_parent(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            prices = Price.objects.bulk_create([
+                Price(medium=self.medium, book=book, price=Decimal("1.00"))
+                for book in self.books
+            ])
+        Book.objects.update(last_updated_at=self.past)
+        with self.captureOnCommitCallbacks(execute=True):
+            Price.objects.filter(book=self.books[0]).update(price=Decimal("2.00"))
+            prices[1].price = Decimal("2.00")
+            Price.objects.bulk_update([prices[1]], ["price"])
+        self.assertEqual(self.get_touched_books(), [b.pk for b in self.books[:2]])
+        with self.captureOnCommitCallbacks(execute=True):
+            prices[2].delete()
+        self.assertEqual(self.get_touched_books(), [b.pk for b in self.books])
+
+    def test_select_for_update_update(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            price = Price.objects.create(
+                medium=self.medium, book=self.books[0], price=Decimal("1.00")
+            )
+        Book.objects.update(last_updated_at=self.past)
+        # SQLite has no FOR UPDATE, it is only compiled.
+        with mock.patch.object(
+            connection.features, "has_select_for_update", True
+        ), CaptureQueriesContext(connection) as queries, mock.patch.object(
+            connection.ops, "for_update_sql", return_value=""
+        ) as for_update_sql:
+            with self.captureOnCommitCallbacks(execute=True):
+                Price.objects.select_for_update().filter(pk=price.pk).update(
+                    price=Decimal("2.00")
+                )
+        for_update_sql.assert_not_called()
+        self.assertNotIn("DISTINCT", queries[-1]["sql"])
+        self.assertEqual(self.get_touched_books(), [self.books[0].pk])
+
+    def test_moving_child_touches_both_parents(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            price = Price.objects.create(
+                medium=self.medium, book=self.books[0], price=Decimal("1.00")
+            )
+        moves = [
+            lambda: Price.objects.filter(pk=price.pk).update(book=self.books[1]),
+            lambda: Price.objects.filter(pk=price.pk).update(book_id=self.books[0].pk),
+        ]
+        for move in moves:
+            Book.objects.update(last_updated_at=self.past)
+            with self.captureOnCommitCallbacks(execute=True):
+                move()
+            self.assertEqual(self.get_touched_books(), [b.pk for b in self.books[:2]])
+
+        price = Price.objects.get(pk=price.pk)
+        for book in (self.books[2], self.books[0]):
+            Book.objects.update(last_updated_at=self.past)
+            old_book = Price.objects.get(pk=price.pk).book
+            with self.captureOnCommitCallbacks(execute=True):
+                price.book = book
+                price.save()
+            self.assertEqual(self.get_touched_books(), sorted([old_book.pk, book.pk]))
+
+        Book.objects.update(last_updated_at=self.past)
+        with self.captureOnCommitCallbacks(execute=True):
+            price.book = self.books[1]
+            Price.objects.bulk_update([price], ["book"])
+        self.assertEqual(self.get_touched_books(), [b.pk for b in self.books[:2]])
+
+    def test_reverse_one_to_one_parent(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.rating.score = 2
+            self.rating.save()
+        self.assertEqual(self.get_touched_books(), [self.books[0].pk])
+
+    def test_m2m_changes_touch_parents(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.author.books.add(self.books[0], self.books[1])
+        self.assertEqual(self.get_touched_books(), [b.pk for b in self.books[:2]])
+        Book.objects.update(last_updated_at=self.past)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.books[2].author_set.add(self.author)
+        self.assertEqual(self.get_touched_books(), [self.books[2].pk])
+        Book.objects.update(last_updated_at=self.past)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.author.books.clear()
+        self.assertEqual(self.get_touched_books(), [b.pk for b in self.books])
+
+    def test_rollback_discards_touches(self):
+        price = Price(medium=self.medium, book=self.books[0], price=Decimal("1.00"))
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    price.save()
+                    raise ValueError
+            except ValueError:
+                pass
+            price = Price.objects.create(
+                medium=self.medium, book=self.books[1], price=Decimal("1.00")
+            )
+        self.assertEqual(self.get_touched_books(), [self.books[1].pk])
+
+    def test_invalid_touch_parents(self):
+        with mock.patch.object(Price, "touch_parents", ["price"]):
+            with self.assertRaisesMessage(
+                ImproperlyConfigured,
+                "Price.touch_parents: Price.price is not a relation",
+            ):
+                Price.objects.update(price=Decimal("1.00"))
+
+
+class TestAsyncMethods(TestCase):
+    """Test Cases for the async methods of CreateUpdateTimestampManager"""
+
+    def setUp(self) -> None:
+        self.mocked_update_time = timezone.now() + timedelta(days=1)
+
+    async def test_aupdate_sets_last_updated_at(self):
+        await CreatedUpdatedTimestampTestModel.objects.abulk_create(
+            [CreatedUpdatedTimestampTestModel() for _ in range(3)]
+        )
+        with mock.patch("django.utils.timezone.now") as mock_now:
+            mock_now.return_value = self.mocked_update_time
+            rows = await CreatedUpdatedTimestampTestModel.objects.aupdate()
+        self.assertEqual(rows, 3)
+        self.assertEqual(
+            await CreatedUpdatedTimestampTestModel.objects.filter(
+                last_updated_at=self.mocked_update_time
+            ).acount(),
+            3,
+        )
+
+    async def test_abulk_create_in_chunks(self):
+        objs = await CreatedUpdatedTimestampTestModel.objects.abulk_create(
+            (CreatedUpdatedTimestampTestModel() for _ in range(5)), batch_size=2
+        )
+        self.assertEqual(len(objs), 5)
+        self.assertEqual(await CreatedUpdatedTimestampTestModel.objects.acount(), 5)
+
+    async def test_abulk_update_sets_shared_last_updated_at(self):
+        await Publication.objects.abulk_create(
+            [Publication(name=str(i)) for i in range(5)]
+        )
+        objs = [obj async for obj in Publication.objects.all()]
+        for obj in objs:
+            obj.name = "updated"
+        with mock.patch("django.utils.timezone.now") as mock_now:
+            mock_now.return_value = self.mocked_update_time
+            rows = await Publication.objects.abulk_update(
+                objs, ["name"], batch_size=2, strategy="values"
+            )
+        self.assertEqual(rows, 5)
+        self.assertEqual(
+            await Publication.objects.filter(
+                name="updated", last_updated_at=self.mocked_update_time
+            ).acount(),
+            5,
+        )
+
+    async def test_achanged_since(self):
+        await CreatedUpdatedTimestampTestModel.objects.abulk_create(
+            [CreatedUpdatedTimestampTestModel() for _ in range(5)]
+        )
+        batches = [
+            batch
+            async for batch in CreatedUpdatedTimestampTestModel.objects.achanged_since(
+                batch_size=2
+            )
+        ]
+        self.assertEqual([len(batch.objects) for batch in batches], [2, 2, 1])
+
+    async def test_chunks_run_concurrently_in_order(self):
+        queryset = CreatedUpdatedTimestampTestModel.objects.all()
+        with mock.patch.object(
+            type(queryset), "_can_write_concurrently", return_value=True
+        ):
+            results = await queryset._arun_chunks(
+                sum, iter(range(10)), chunk_size=3, max_concurrency=2
+            )
+        self.assertEqual(results, [3, 12, 21, 9])
+
+
+class TestParallelBulkWrites(TestCase):
+    """Test Cases for the parallel bulk methods of CreateUpdateTimestampManager"""
+
+    def test_parallel_bulk_create_shares_timestamp(self):
+        created = CreatedUpdatedTimestampTestModel.objects.parallel_bulk_create(
+            (CreatedUpdatedTimestampTestModel() for _ in range(7)), chunk_size=3
+        )
+        self.assertEqual(created, 7)
+        timestamps = set(
+            CreatedUpdatedTimestampTestModel.objects.values_list(
+                "created_at", "last_updated_at"
+            )
+        )
+        self.assertEqual(len(timestamps), 1)
+        created_at, last_updated_at = timestamps.pop()
+        self.assertEqual(created_at, last_updated_at)
+
+    def test_parallel_bulk_update_shares_timestamp(self):
+        Publication.objects.bulk_create([Publication(name=str(i)) for i in range(7)])
+        objs = list(Publication.objects.all())
+        for obj in objs:
+            obj.name = "updated"
+        rows = Publication.objects.parallel_bulk_update(objs, ["name"], chunk_size=3)
+        self.assertEqual(rows, 7)
+        self.assertEqual(
+            Publication.objects.values("last_updated_at").distinct().count(), 1
+        )
+        self.assertEqual(Publication.objects.filter(name="updated").count(), 7)
+
+    @mock.patch("django_model_extensions.models.RETRY_DELAY", 0)
+    def test_chunks_are_retried_on_operational_error(self):
+        func = mock.Mock(side_effect=[OperationalError, 3])
+        queryset = Publication.objects.all()
+        self.assertEqual(queryset._write_chunk(func, [1, 2], retries=1), 3)
+        func = mock.Mock(side_effect=OperationalError)
+        with self.assertRaises(OperationalError):
+            queryset._write_chunk(func, [1, 2], retries=1)
+        self.assertEqual(func.call_count, 2)
+
+    def test_chunks_run_in_thread_pool(self):
+        queryset = Publication.objects.all()
+        with mock.patch.object(
+            type(queryset), "_can_write_concurrently", return_value=True
+        ), mock.patch.object(
+            type(queryset),
+            "_write_chunk",
+            lambda self, func, chunk, retries: func(chunk),
+        ):
+            total = queryset._run_chunks_in_pool(
+                sum, iter(range(10)), chunk_size=3, max_workers=2, retries=0
+            )
+        self.assertEqual(total, 45)
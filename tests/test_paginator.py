@@ -0,0 +1,92 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core.paginator import EmptyPage, PageNotAnInteger
+from django.test import TestCase
+from django.utils import timezone
+
+from django_model_extensions.paginator import KeysetPaginator
+
+from .testapp.models import Publication
+
+
+class TestKeysetPaginator(TestCase):
+    """Test Cases for KeysetPaginator"""
+
+    def setUp(self) -> None:
+        now = timezone.now()
+        with mock.patch("django.utils.timezone.now") as mock_now:
+            # Pairs of objects sharing the same timestamp.
+            for i in range(7):
+                mock_now.return_value = now - timedelta(minutes=i // 2)
+                Publication.objects.create(name=str(i))
+        self.expected = list(
+            Publication.objects.order_by("-last_updated_at", "-pk").values_list(
+                "name", flat=True
+            )
+        )
+        self.paginator = KeysetPaginator(Publication.objects.all(), 3)
+
+    def get_names(self, page):
+        return [obj.name for obj in page]
+
+    def test_pages_forward(self):
+        page = self.paginator.page(None)
+        self.assertFalse(page.has_previous())
+        names = self.get_names(page)
+        while page.has_next():
+            with self.assertNumQueries(1):
+                page = self.paginator.page(page.next_page_number())
+            self.assertTrue(page.has_previous())
+            names.extend(self.get_names(page))
+        self.assertEqual(names, self.expected)
+        with self.assertRaises(EmptyPage):
+            page.next_page_number()
+
+    def test_pages_backward(self):
+        first_page = self.paginator.page(None)
+        second_page = self.paginator.page(first_page.next_page_number())
+        third_page = self.paginator.page(second_page.next_page_number())
+        page = self.paginator.page(third_page.previous_page_number())
+        self.assertEqual(self.get_names(page), self.expected[3:6])
+        self.assertTrue(page.has_next())
+        self.assertTrue(page.has_previous())
+        page = self.paginator.page(page.previous_page_number())
+        self.assertEqual(self.get_names(page), self.expected[:3])
+        self.assertFalse(page.has_previous())
+
+    def test_ascending_order(self):
+        paginator = KeysetPaginator(Publication.objects.all(), 4, descending=False)
+        first_page = paginator.page(None)
+        second_page = paginator.page(first_page.next_page_number())
+        self.assertEqual(
+            self.get_names(first_page) + self.get_names(second_page),
+            self.expected[::-1],
+        )
+
+    def test_invalid_cursor(self):
+        with self.assertRaises(PageNotAnInteger):
+            self.paginator.page("x.invalid")
+        page = self.paginator.get_page("x.invalid")
+        self.assertEqual(self.get_names(page), self.expected[:3])
+
+    def test_count_and_num_pages(self):
+        self.assertEqual(self.paginator.count, 7)
+        self.assertEqual(self.paginator.num_pages, 3)
+
+    def test_indexes_within_page(self):
+        first_page = self.paginator.page(None)
+        last_page = self.paginator.page(
+            self.paginator.page(first_page.next_page_number()).next_page_number()
+        )
+        self.assertEqual((first_page.start_index(), first_page.end_index()), (1, 3))
+        self.assertEqual((last_page.start_index(), last_page.end_index()), (1, 1))
+        Publication.objects.all().delete()
+        page = KeysetPaginator(Publication.objects.all(), 3).page(None)
+        self.assertEqual((page.start_index(), page.end_index()), (0, 0))
+
+    def test_page_range_is_not_supported(self):
+        with self.assertRaisesMessage(TypeError, "have no page numbers"):
+            self.paginator.page_range
+        with self.assertRaisesMessage(TypeError, "have no page numbers"):
+            self.paginator.get_elided_page_range()
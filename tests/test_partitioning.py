@@ -0,0 +1,137 @@
+from datetime import date, datetime, timezone
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.migrations import DeleteModel
+from django.test import SimpleTestCase, TestCase
+
+from django_model_extensions.operations import (
+    AddTimestampPartitions,
+    CreatePartitionedModel,
+)
+from django_model_extensions.partitioning import (
+    get_create_partition_sql,
+    partition_bounds,
+    partition_name,
+    partition_start,
+)
+
+from .testapp.models import PartitionedEvent, Publication
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+class TestPartitionBounds(SimpleTestCase):
+    """Test Cases for the partition helpers"""
+
+    def test_partition_bounds(self):
+        self.assertEqual(
+            partition_bounds(utc(2026, 12, 18, 10, 30), "month"),
+            (utc(2026, 12, 1), utc(2027, 1, 1)),
+        )
+        self.assertEqual(
+            partition_bounds(date(2026, 10, 18), "day"),
+            (utc(2026, 10, 18), utc(2026, 10, 19)),
+        )
+        with self.assertRaises(ValueError):
+            partition_bounds(date(2026, 10, 18), "year")
+
+    def test_partition_start_offsets(self):
+        self.assertEqual(
+            partition_start(utc(2026, 1, 15), "month", -2), utc(2025, 11, 1)
+        )
+        self.assertEqual(partition_start(utc(2026, 1, 15), "month", 1), utc(2026, 2, 1))
+        self.assertEqual(partition_start(utc(2026, 3, 1), "day", -1), utc(2026, 2, 28))
+
+    def test_partition_name(self):
+        self.assertEqual(
+            partition_name("app_event", utc(2026, 10, 1), "month"), "app_event_p202610"
+        )
+        self.assertEqual(
+            partition_name("app_event", utc(2026, 10, 18), "day"), "app_event_p20261018"
+        )
+
+    def test_create_partition_sql(self):
+        sql = get_create_partition_sql(
+            connection, "app_event", utc(2026, 10, 18), "month"
+        )
+        self.assertIn("PARTITION OF", sql)
+        self.assertIn("app_event_p202610", sql)
+        self.assertIn(
+            "FROM ('2026-10-01T00:00:00+00:00') TO ('2026-11-01T00:00:00+00:00')", sql
+        )
+
+
+class TestPartitionOperations(SimpleTestCase):
+    """Test Cases for the partitioning migration operations"""
+
+    def test_create_partitioned_model_deconstruct(self):
+        operation = CreatePartitionedModel("Event", [], partition_interval="day")
+        name, args, kwargs = operation.deconstruct()
+        self.assertEqual(name, "CreatePartitionedModel")
+        self.assertEqual(kwargs["partition_interval"], "day")
+        self.assertEqual(operation.describe(), "Create model Event partitioned by day")
+        with self.assertRaises(ValueError):
+            CreatePartitionedModel("Event", [], partition_interval="week")
+
+    def test_create_partitioned_model_reduce(self):
+        operation = CreatePartitionedModel("Event", [])
+        self.assertEqual(operation.reduce(DeleteModel("Event"), "testapp"), [])
+        self.assertFalse(
+            operation.reduce(AddTimestampPartitions("Event", "2026-10-01"), "testapp")
+        )
+
+    def test_add_timestamp_partitions_deconstruct(self):
+        operation = AddTimestampPartitions("Event", "2026-10-01", count=3)
+        self.assertEqual(
+            operation.deconstruct(),
+            (
+                "AddTimestampPartitions",
+                [],
+                {"model_name": "Event", "start": "2026-10-01", "count": 3},
+            ),
+        )
+        self.assertEqual(
+            operation._get_starts(),
+            [utc(2026, 10, 1), utc(2026, 11, 1), utc(2026, 12, 1)],
+        )
+
+
+class TestPartitionQueries(TestCase):
+    """Test Cases for the partition query helpers"""
+
+    def test_partitioned_model_table_exists(self):
+        # The table is a regular one outside PostgreSQL.
+        self.assertIn(
+            PartitionedEvent._meta.db_table, connection.introspection.table_names()
+        )
+
+    def test_in_partition(self):
+        now = datetime.now(timezone.utc)
+        event = PartitionedEvent.objects.create(name="event")
+        self.assertEqual(list(PartitionedEvent.objects.in_partition(now)), [event])
+        self.assertFalse(
+            PartitionedEvent.objects.in_partition(
+                partition_start(now, "month", -1)
+            ).exists()
+        )
+        with self.assertRaises(ImproperlyConfigured):
+            Publication.objects.in_partition(now)
+
+    def test_created_between(self):
+        event = PartitionedEvent.objects.create(name="event")
+        self.assertEqual(
+            list(PartitionedEvent.objects.created_between(event.created_at)), [event]
+        )
+        self.assertFalse(
+            PartitionedEvent.objects.created_between(
+                utc(2000, 1, 1), event.created_at
+            ).exists()
+        )
+
+    def test_manage_partitions_requires_postgresql(self):
+        with self.assertRaisesMessage(CommandError, "only supported on PostgreSQL"):
+            call_command("manage_partitions")
@@ -0,0 +1,107 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.db.models.signals import pre_delete
+from django.test import TestCase
+from django.utils import timezone
+
+from django_model_extensions.retention import sort_by_dependencies
+
+from .testapp.models import (
+    ArchivedPublication,
+    Book,
+    CreatedUpdatedTimestampTestModel,
+    MediumType,
+    Price,
+    Publication,
+)
+
+
+class TestPurgeStale(TestCase):
+    """Test Cases for purge_stale of CreateUpdateTimestampManager"""
+
+    def setUp(self) -> None:
+        self.past = timezone.now() - timedelta(days=60)
+        with mock.patch("django.utils.timezone.now", return_value=self.past):
+            self.stale = Publication.objects.bulk_create(
+                [Publication(name="stale %s" % i) for i in range(5)]
+            )
+        self.fresh = Publication.objects.create(name="fresh")
+        self.retention = mock.patch.multiple(
+            Publication, retention_period=timedelta(days=30), create=False
+        )
+        self.retention.start()
+        self.addCleanup(self.retention.stop)
+
+    def test_purge_stale_deletes_in_batches(self):
+        with mock.patch("django.utils.timezone.now", return_value=self.past):
+            CreatedUpdatedTimestampTestModel.objects.bulk_create(
+                [CreatedUpdatedTimestampTestModel() for _ in range(5)]
+            )
+        # Without signals or cascades, each batch selects its primary keys and
+        # deletes them with a single DELETE in a transaction.
+        with mock.patch.object(
+            CreatedUpdatedTimestampTestModel, "retention_period", timedelta(days=30)
+        ), self.assertNumQueries(12):
+            total, counts = CreatedUpdatedTimestampTestModel.objects.purge_stale(
+                batch_size=2
+            )
+        self.assertEqual(total, 5)
+        self.assertEqual(counts, {"testapp.CreatedUpdatedTimestampTestModel": 5})
+        self.assertFalse(CreatedUpdatedTimestampTestModel.objects.exists())
+
+    def test_purge_stale_keeps_fresh_rows(self):
+        total, counts = Publication.objects.purge_stale(batch_size=2)
+        self.assertEqual(total, 5)
+        self.assertEqual(counts, {"testapp.Publication": 5})
+        self.assertEqual(list(Publication.objects.all()), [self.fresh])
+
+    def test_purge_stale_cascades(self):
+        medium = MediumType.objects.create(name="paperback")
+        book = Book.objects.create(title="book", publication=self.stale[0])
+        Price.objects.create(medium=medium, book=book, price=Decimal("1.00"))
+        total, counts = Publication.objects.purge_stale()
+        self.assertEqual(total, 7)
+        self.assertEqual(counts["testapp.Book"], 1)
+        self.assertEqual(counts["testapp.Price"], 1)
+        self.assertFalse(Book.objects.exists())
+
+    def test_purge_stale_sends_signals_when_connected(self):
+        receiver = mock.Mock()
+        pre_delete.connect(receiver, sender=Publication)
+        self.addCleanup(pre_delete.disconnect, receiver, sender=Publication)
+        Publication.objects.purge_stale()
+        self.assertEqual(receiver.call_count, 5)
+
+    def test_purge_stale_archives_rows(self):
+        with mock.patch.object(
+            Publication, "retention_archive", "testapp.ArchivedPublication"
+        ):
+            total, _ = Publication.objects.purge_stale(batch_size=2)
+        self.assertEqual(total, 5)
+        archived = ArchivedPublication.objects.order_by("pk")
+        self.assertEqual(
+            [(row.pk, row.name) for row in archived],
+            [(obj.pk, obj.name) for obj in self.stale],
+        )
+        self.assertEqual(archived[0].last_updated_at, self.past)
+
+    def test_sort_by_dependencies(self):
+        self.assertEqual(
+            sort_by_dependencies([Publication, Book, Price, MediumType]),
+            [Price, Book, MediumType, Publication],
+        )
+
+    def test_purge_stale_rows_command(self):
+        out = StringIO()
+        call_command("purge_stale_rows", "testapp.Publication", "--dry-run", stdout=out)
+        self.assertEqual(out.getvalue(), "testapp.Publication: 5 stale row(s).\n")
+        self.assertEqual(Publication.objects.count(), 6)
+        out = StringIO()
+        call_command("purge_stale_rows", stdout=out)
+        self.assertEqual(out.getvalue(), "testapp.Publication: deleted 5 row(s).\n")
+        with self.assertRaisesMessage(CommandError, "has no retention_period"):
+            call_command("purge_stale_rows", "testapp.Book")
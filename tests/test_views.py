@@ -0,0 +1,90 @@
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase
+from django.utils.http import http_date
+from django.views.generic import DetailView, ListView
+
+from django_model_extensions.views import (
+    TimestampConditionMixin,
+    get_timestamp_state,
+    timestamp_condition,
+)
+
+from .testapp.models import Publication
+
+
+@timestamp_condition(lambda request: Publication.objects.all())
+def publication_list(request):
+    return HttpResponse(", ".join(p.name for p in Publication.objects.all()))
+
+
+class PublicationListView(TimestampConditionMixin, ListView):
+    model = Publication
+
+    def render_to_response(self, context, **response_kwargs):
+        return HttpResponse(len(context["object_list"]))
+
+
+class PublicationDetailView(TimestampConditionMixin, DetailView):
+    model = Publication
+
+    def render_to_response(self, context, **response_kwargs):
+        return HttpResponse(context["object"].name)
+
+
+class TestTimestampCondition(TestCase):
+    """Test Cases for conditional HTTP helpers"""
+
+    def setUp(self) -> None:
+        self.factory = RequestFactory()
+        self.publications = [Publication.objects.create(name=str(i)) for i in range(3)]
+
+    def test_decorator_sets_headers_and_answers_not_modified(self):
+        response = publication_list(self.factory.get("/"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response["Last-Modified"],
+            http_date(self.publications[-1].last_updated_at.timestamp()),
+        )
+        with self.assertNumQueries(1):
+            response = publication_list(
+                self.factory.get("/", HTTP_IF_NONE_MATCH=response["ETag"])
+            )
+        self.assertEqual(response.status_code, 304)
+
+    def test_etag_changes_on_update_and_delete(self):
+        etags = {get_timestamp_state(Publication.objects.all()).etag}
+        self.publications[0].save()
+        etags.add(get_timestamp_state(Publication.objects.all()).etag)
+        Publication.objects.filter(pk=self.publications[1].pk).delete()
+        etags.add(get_timestamp_state(Publication.objects.all()).etag)
+        self.assertEqual(len(etags), 3)
+
+    def test_list_view_answers_not_modified(self):
+        view = PublicationListView.as_view()
+        response = view(self.factory.get("/"))
+        self.assertEqual(response.content, b"3")
+        response = view(
+            self.factory.get("/", HTTP_IF_MODIFIED_SINCE=response["Last-Modified"])
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_detail_view_uses_object_timestamp(self):
+        view = PublicationDetailView.as_view()
+        publication = self.publications[0]
+        response = view(self.factory.get("/"), pk=publication.pk)
+        self.assertEqual(response.content, b"0")
+        self.assertEqual(
+            response["Last-Modified"],
+            http_date(publication.last_updated_at.timestamp()),
+        )
+        with self.assertNumQueries(1):
+            response = view(
+                self.factory.get("/", HTTP_IF_NONE_MATCH=response["ETag"]),
+                pk=publication.pk,
+            )
+        self.assertEqual(response.status_code, 304)
+
+    def test_state_of_instance(self):
+        publication = self.publications[0]
+        state = get_timestamp_state(publication)
+        self.assertEqual(state.last_modified, publication.last_updated_at)
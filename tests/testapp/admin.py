@@ -1,10 +1,11 @@
 from django.contrib import admin
 
+from django_model_extensions.admin import TimestampedModelAdmin
 from tests.testapp import models
 
 
 @admin.register(models.Book)
-class BookAdmin(admin.ModelAdmin):
+class BookAdmin(TimestampedModelAdmin):
     list_display = ("pk", "title", "created_at", "last_updated_at", "rating")
 
 
@@ -24,7 +25,7 @@ class MediumTypeAdmin(admin.ModelAdmin):
 
 
 @admin.register(models.Price)
-class PriceAdmin(admin.ModelAdmin):
+class PriceAdmin(TimestampedModelAdmin):
     list_display = ("pk", "book", "medium", "created_at", "last_updated_at")
 
 
@@ -0,0 +1,43 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("testapp", "0002_createdupdatedtimestamptestmodel"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DatabaseTimestampTestModel",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="created timestamp"
+                    ),
+                ),
+                (
+                    "last_updated_at",
+                    models.DateTimeField(
+                        auto_now=True, verbose_name="last update timestamp"
+                    ),
+                ),
+            ],
+            options={
+                "get_latest_by": "last_updated_at",
+                "abstract": False,
+            },
+        ),
+    ]
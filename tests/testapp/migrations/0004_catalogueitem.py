@@ -0,0 +1,49 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("testapp", "0003_databasetimestamptestmodel"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CatalogueItem",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="created timestamp"
+                    ),
+                ),
+                (
+                    "last_updated_at",
+                    models.DateTimeField(
+                        auto_now=True, verbose_name="last update timestamp"
+                    ),
+                ),
+                ("code", models.CharField(max_length=64, unique=True)),
+                ("name", models.CharField(max_length=255)),
+                (
+                    "price",
+                    models.DecimalField(decimal_places=2, max_digits=6, null=True),
+                ),
+            ],
+            options={
+                "get_latest_by": "last_updated_at",
+                "abstract": False,
+            },
+        ),
+    ]
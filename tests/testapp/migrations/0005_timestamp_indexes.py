@@ -0,0 +1,41 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:47
+
+from django.db import migrations, models
+
+import django_model_extensions.indexes
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("testapp", "0004_catalogueitem"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="book",
+            index=models.Index(
+                fields=["created_at"], name="testapp_boo_created_0a3067_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="book",
+            index=models.Index(
+                fields=["last_updated_at", "id"], name="testapp_boo_last_up_50fead_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="catalogueitem",
+            index=django_model_extensions.indexes.TimestampBrinIndex(
+                fields=["created_at"], name="testapp_cat_created_2b3b60_brin"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="catalogueitem",
+            index=models.Index(
+                condition=models.Q(("price__isnull", False)),
+                fields=["last_updated_at"],
+                name="catalogue_priced_updated_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("testapp", "0005_timestamp_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ChangeTrackingTestModel",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="created timestamp"
+                    ),
+                ),
+                (
+                    "last_updated_at",
+                    models.DateTimeField(
+                        auto_now=True, verbose_name="last update timestamp"
+                    ),
+                ),
+                ("name", models.CharField(max_length=255)),
+                (
+                    "publication",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="testapp.publication",
+                    ),
+                ),
+            ],
+            options={
+                "get_latest_by": "last_updated_at",
+                "abstract": False,
+            },
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:58
+
+from django.db import migrations, models
+
+import django_model_extensions.operations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("testapp", "0007_cachedtestmodel"),
+    ]
+
+    operations = [
+        django_model_extensions.operations.CreatePartitionedModel(
+            name="PartitionedEvent",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="created timestamp"
+                    ),
+                ),
+                (
+                    "last_updated_at",
+                    models.DateTimeField(
+                        auto_now=True, verbose_name="last update timestamp"
+                    ),
+                ),
+                ("name", models.CharField(max_length=255)),
+            ],
+            options={
+                "get_latest_by": "last_updated_at",
+                "abstract": False,
+            },
+            partition_interval="month",
+        ),
+    ]
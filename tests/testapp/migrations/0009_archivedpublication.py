@@ -0,0 +1,22 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("testapp", "0008_partitionedevent"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedPublication",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("created_at", models.DateTimeField()),
+                ("last_updated_at", models.DateTimeField()),
+                ("name", models.CharField(max_length=255)),
+            ],
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("testapp", "0012_optimisticlockingtestmodel"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="changetrackingtestmodel",
+            name="data",
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
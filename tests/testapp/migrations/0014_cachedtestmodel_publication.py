@@ -0,0 +1,24 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:36
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("testapp", "0013_changetrackingtestmodel_data"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="cachedtestmodel",
+            name="publication",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="testapp.publication",
+            ),
+        ),
+    ]
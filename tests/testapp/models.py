@@ -1,5 +1,6 @@
 from django.db import models
 
+from django_model_extensions.indexes import TimestampIndex
 from django_model_extensions.models import CreatedUpdatedTimestampModel
 
 
@@ -13,6 +14,8 @@ class Publication(CreatedUpdatedTimestampModel):
 class Rating(CreatedUpdatedTimestampModel):
     score = models.FloatField()
 
+    touch_parents = ["book"]
+
     def __str__(self) -> str:
         return str(self.pk)
 
@@ -32,6 +35,11 @@ class MediumType(CreatedUpdatedTimestampModel):
 
 
 class Book(CreatedUpdatedTimestampModel):
+    timestamp_indexes = [
+        "created_at",
+        TimestampIndex("last_updated_at", with_pk=True),
+    ]
+
     title = models.CharField(max_length=255)
     publication = models.ForeignKey(Publication, on_delete=models.CASCADE)
     rating = models.OneToOneField(
@@ -49,6 +57,8 @@ class Price(CreatedUpdatedTimestampModel):
     book = models.ForeignKey(Book, on_delete=models.CASCADE)
     price = models.DecimalField(max_digits=6, decimal_places=2)
 
+    touch_parents = ["book"]
+
     def __str__(self) -> str:
         return str(self.pk)
 
@@ -57,9 +67,87 @@ class Author(CreatedUpdatedTimestampModel):
     name = models.CharField(max_length=255, blank=True)
     books = models.ManyToManyField(Book)
 
+    touch_parents = ["books"]
+
     def __str__(self) -> str:
         return self.name
 
 
 class CreatedUpdatedTimestampTestModel(CreatedUpdatedTimestampModel):
     pass
+
+
+class DatabaseTimestampTestModel(CreatedUpdatedTimestampModel):
+    use_database_timestamps = True
+
+
+class CatalogueItem(CreatedUpdatedTimestampModel):
+    timestamp_indexes = [
+        TimestampIndex("created_at", brin=True),
+        TimestampIndex(
+            "last_updated_at",
+            condition=models.Q(price__isnull=False),
+            name="catalogue_priced_updated_idx",
+        ),
+    ]
+
+    code = models.CharField(max_length=64, unique=True)
+    name = models.CharField(max_length=255)
+    price = models.DecimalField(max_digits=6, decimal_places=2, null=True)
+
+    def __str__(self) -> str:
+        return self.code
+
+
+class ChangeTrackingTestModel(CreatedUpdatedTimestampModel):
+    name = models.CharField(max_length=255)
+    publication = models.ForeignKey(
+        Publication, on_delete=models.CASCADE, null=True, blank=True
+    )
+    data = models.JSONField(null=True, blank=True)
+
+    track_changes = True
+
+
+class CachedTestModel(CreatedUpdatedTimestampModel):
+    name = models.CharField(max_length=255)
+    publication = models.ForeignKey(
+        Publication, on_delete=models.CASCADE, null=True, blank=True
+    )
+
+    cache_instances = True
+
+
+class PartitionedEvent(CreatedUpdatedTimestampModel):
+    name = models.CharField(max_length=255)
+
+    partition_interval = "month"
+
+
+class ArchivedPublication(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    created_at = models.DateTimeField()
+    last_updated_at = models.DateTimeField()
+    name = models.CharField(max_length=255)
+
+
+class HistoryTestModel(CreatedUpdatedTimestampModel):
+    name = models.CharField(max_length=255)
+    price = models.DecimalField(max_digits=6, decimal_places=2, null=True)
+    publication = models.ForeignKey(
+        Publication, on_delete=models.CASCADE, null=True, blank=True
+    )
+
+    keep_history = True
+
+
+class OutboxTestModel(CreatedUpdatedTimestampModel):
+    name = models.CharField(max_length=255)
+
+    use_outbox = True
+
+
+class OptimisticLockingTestModel(CreatedUpdatedTimestampModel):
+    name = models.CharField(max_length=255)
+
+    optimistic_locking = True